@@ -0,0 +1,88 @@
+#############################################################
+# @file     bench_block_pipeline.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Measures how the block analysis of BlockPipeline scales with the number of worker
+#           processes. The synthetic blocks are served by a local stub server, so the benchmark
+#           runs offline and the download is not the bottleneck.
+#           Run from the repository root:
+#               python benchmarks/bench_block_pipeline.py --blocks 64 --tx-count 3000
+#############################################################
+# Import packages
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'unittests'))
+
+from block_pipeline import BlockPipeline  # noqa: E402
+from btc_api_client import BtcApiClient  # noqa: E402
+from btc_parser import BtcBlockMonitoring  # noqa: E402
+from stub_api_server import StubApiServer  # noqa: E402
+from synthetic_chain import SyntheticChain  # noqa: E402
+
+
+# Returns the default list of worker process counts: 1, 2, 4, ... up to the number of CPU cores
+def get_default_process_counts():
+    process_counts = [1]
+    while process_counts[-1] * 2 <= (os.cpu_count() or 1):
+        process_counts.append(process_counts[-1] * 2)
+    if process_counts[-1] != (os.cpu_count() or 1):
+        process_counts.append(os.cpu_count())
+    return process_counts
+
+
+def create_argument_parser():
+    parser = argparse.ArgumentParser(description='Scaling benchmark of the multi-process block pipeline')
+    parser.add_argument('--blocks', type=int, default=32, help='Blocks of the backfill')
+    parser.add_argument('--tx-count', type=int, default=2000, help='Transactions per block')
+    parser.add_argument('--inputs-per-tx', type=int, default=3, help='Inputs per transaction')
+    parser.add_argument('--outputs-per-tx', type=int, default=3, help='Outputs per transaction')
+    parser.add_argument('--fetch-workers', type=int, default=8, help='Concurrent downloads')
+    parser.add_argument('--processes', type=int, action='append', help='Worker processes, default 1, 2, 4, ... cores')
+    parser.add_argument('--json-backend', choices=('orjson', 'json', 'selective'), help='JSON backend of the workers')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the synthetic data')
+    return parser
+
+
+def main():
+    args = create_argument_parser().parse_args()
+
+    # The blocks are generated once and served as bytes, so the server does not encode during the runs
+    chain = SyntheticChain(seed=args.seed)
+    routes = {f"/rawblock/{height}": json.dumps(chain.create_block(height, args.tx_count, args.inputs_per_tx,
+                                                                   args.outputs_per_tx)).encode()
+              for height in range(args.blocks)}
+    tx_total = args.blocks * args.tx_count
+
+    with StubApiServer(routes) as server:
+        api_client = BtcApiClient(base_url=server.base_url, max_in_flight=args.fetch_workers,
+                                  json_backend=args.json_backend)
+
+        # Baseline: the single-interpreter block scan
+        start_time = time.perf_counter()
+        block_monitor = BtcBlockMonitoring(0, args.blocks - 1, api_client=api_client, max_workers=args.fetch_workers)
+        for _ in block_monitor.iter_coinjoin_records_from_btc_blocks():
+            pass
+        baseline = time.perf_counter() - start_time
+        print(f"{'single process scan':<22} {tx_total / baseline:>12.1f} tx/s  {baseline:>8.2f} s")
+
+        for process_count in args.processes or get_default_process_counts():
+            pipeline = BlockPipeline(api_client, fetch_workers=args.fetch_workers, process_workers=process_count,
+                                     json_backend=args.json_backend)
+            start_time = time.perf_counter()
+            for _ in pipeline.iter_block_analyses(range(args.blocks)):
+                pass
+            duration = time.perf_counter() - start_time
+            print(f"{f'pipeline {process_count} processes':<22} {tx_total / duration:>12.1f} tx/s  "
+                  f"{duration:>8.2f} s  speedup {baseline / duration:>5.2f}x")
+
+        api_client.close()
+
+
+if __name__ == '__main__':
+    main()
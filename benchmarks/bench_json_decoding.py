@@ -0,0 +1,74 @@
+#############################################################
+# @file     bench_json_decoding.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Compares parse time and peak memory of the JSON backends on a multi-megabyte
+#           rawblock payload. Run from the repository root:
+#               python benchmarks/bench_json_decoding.py --tx-count 4000
+#############################################################
+# Import packages
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from json_decoding import get_json_decoder, orjson  # noqa: E402
+from synthetic_chain import SyntheticChain  # noqa: E402
+
+
+#############################################################
+# @brief    This function measures the best parse time and the peak memory of a decoder.
+#
+# @para     decoder - Function bytes -> decoded JSON
+# @para     payload - JSON document as bytes
+# @para     repeat - Number of timed runs
+# @return   dict - Best parse time in milliseconds and peak traced memory in MiB
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def measure_decoder(decoder, payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        decoder(payload)
+        timings.append(time.perf_counter() - start_time)
+
+    # The memory is measured in a separate run, tracing slows down the parsing
+    tracemalloc.start()
+    decoded = decoder(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+
+    return {'parse_ms': round(min(timings) * 1000, 2), 'peak_mib': round(peak / 1024 ** 2, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the JSON backends on a rawblock payload')
+    parser.add_argument('--tx-count', type=int, default=4000, help='Transactions of the synthetic block')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per backend')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    payload = json.dumps(SyntheticChain().create_block(800000, args.tx_count)).encode()
+
+    backends = ['json', 'selective'] + (['orjson'] if orjson is not None else [])
+    results = {'payload_mib': round(len(payload) / 1024 ** 2, 2), 'backends': {}}
+    for backend in backends:
+        results['backends'][backend] = measure_decoder(get_json_decoder(backend), payload, args.repeat)
+
+    print(f"rawblock payload: {results['payload_mib']} MiB")
+    for backend, result in results['backends'].items():
+        print(f"{backend:>10}: {result['parse_ms']:>9.2f} ms  peak {result['peak_mib']:>8.2f} MiB")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#############################################################
+# @file     bench_parser.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Benchmarks the hot paths of btc_parser.py against synthetic memory pool, address and
+#           block payloads served by a local stub server, so the benchmark runs offline.
+#           Every method is measured in its own process to get a clean peak RSS. On Windows,
+#           which has no resource module, the peak of the Python allocations (tracemalloc) is
+#           reported instead.
+#           Run from the repository root:
+#               python benchmarks/bench_parser.py --tx-count 5000 --output bench_results.json
+#############################################################
+# Import packages
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# resource is only available on Unix, tracemalloc measures the memory on Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'unittests'))
+
+from btc_api_client import BtcApiClient  # noqa: E402
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring  # noqa: E402
+from stub_api_server import StubApiServer  # noqa: E402
+from synthetic_chain import SyntheticChain  # noqa: E402
+
+# Define Constants
+METHODS = (
+    'is_tx_transaction_from_btc_address',
+    'is_rx_transaction_to_btc_address',
+    'get_transactions_from_btc_address',
+    'get_mixed_btc_transactions_from_btc_blocks'
+)
+WATCH_ADDRESS = 'bc1qbenchmarkwatchaddress'
+
+
+# Returns the peak RSS of the process in bytes, ru_maxrss is in KiB on Linux and in bytes on macOS.
+# Without resource the peak of the Python allocations since tracemalloc was started is returned.
+def get_peak_rss():
+    if resource is None:
+        return tracemalloc.get_traced_memory()[1]
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+# Returns the percentile of a sorted list of values
+def get_percentile(sorted_values, percentile):
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+#############################################################
+# @brief    This function generates the payloads of a method and the callable that runs it once.
+#
+# @para     method - Name of the benchmarked method
+# @para     args - Parsed command line arguments
+# @return   tuple - (routes of the stub server, function base_url -> run function, transactions per run)
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def prepare_method(method, args):
+    chain = SyntheticChain(address_count=args.address_count, seed=args.seed)
+
+    if method in ('is_tx_transaction_from_btc_address', 'is_rx_transaction_to_btc_address'):
+        # The watched address is not in the memory pool, so the whole snapshot is scanned
+        mempool = chain.create_mempool(args.tx_count, args.inputs_per_tx, args.outputs_per_tx)
+        routes = {'/unconfirmed-transactions?format=json': json.dumps(mempool).encode()}
+
+        def create_run(api_client):
+            monitor = BtcAddressMonitoring(WATCH_ADDRESS, api_client=api_client)
+            return getattr(monitor, method)
+        return routes, create_run, args.tx_count
+
+    if method == 'get_transactions_from_btc_address':
+        history = chain.create_address_history(WATCH_ADDRESS, args.tx_count, args.inputs_per_tx, args.outputs_per_tx)
+        routes = {f"/rawaddr/{WATCH_ADDRESS}?limit=500": json.dumps(history).encode()}
+
+        def create_run(api_client):
+            monitor = BtcAddressMonitoring(WATCH_ADDRESS, api_client=api_client)
+
+            def run():
+                monitor.transaction_list = []
+                return monitor.get_transactions_from_btc_address()
+            return run
+        return routes, create_run, args.tx_count
+
+    if method == 'get_mixed_btc_transactions_from_btc_blocks':
+        routes = {}
+        for height in range(1, args.blocks + 1):
+            block = chain.create_block(height, args.tx_count, args.inputs_per_tx, args.outputs_per_tx)
+            routes[f"/rawblock/{height}"] = json.dumps(block).encode()
+
+        def create_run(api_client):
+            monitor = BtcBlockMonitoring(1, args.blocks, api_client=api_client)
+
+            def run():
+                monitor.matrix = []
+                return monitor.get_mixed_btc_transactions_from_btc_blocks()
+            return run
+        return routes, create_run, args.tx_count * args.blocks
+
+    raise ValueError(f"Unknown method '{method}'")
+
+
+#############################################################
+# @brief    This function benchmarks one method in the current process.
+#
+# @para     method - Name of the benchmarked method
+# @para     args - Parsed command line arguments
+# @return   dict - Latency percentiles, throughput and peak RSS of the method
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def run_method(method, args):
+    routes, create_run, tx_per_run = prepare_method(method, args)
+    if resource is None:
+        tracemalloc.start()
+
+    with StubApiServer(routes) as server:
+        api_client = BtcApiClient(base_url=server.base_url, json_backend=args.json_backend)
+        run = create_run(api_client)
+
+        # Warm up the connection pool and the caches, then take the baseline of the memory
+        run()
+        rss_before = get_peak_rss()
+
+        latencies = []
+        for _ in range(args.iterations):
+            start_time = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - start_time)
+        api_client.close()
+
+    latencies.sort()
+    mean_latency = sum(latencies) / len(latencies)
+    return {
+        'iterations': args.iterations,
+        'transactions_per_run': tx_per_run,
+        'throughput_tx_per_s': round(tx_per_run / mean_latency, 1),
+        'latency_ms': {
+            'mean': round(mean_latency * 1000, 3),
+            'p50': round(get_percentile(latencies, 50) * 1000, 3),
+            'p90': round(get_percentile(latencies, 90) * 1000, 3),
+            'p99': round(get_percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3)
+        },
+        'peak_rss_bytes': get_peak_rss(),
+        'peak_rss_growth_bytes': get_peak_rss() - rss_before,
+        'memory_measure': 'ru_maxrss' if resource is not None else 'tracemalloc'
+    }
+
+
+# Runs one method in a child process and returns its result
+def run_method_in_subprocess(method, args):
+    argv = [sys.executable, os.path.abspath(__file__), '--run-single', method]
+    for key, value in get_workload_parameters(args).items():
+        if value is not None:
+            argv += [f"--{key.replace('_', '-')}", str(value)]
+
+    output = subprocess.run(argv, check=True, capture_output=True, text=True).stdout
+
+    # The result is the only JSON line of the output
+    return json.loads(next(line for line in reversed(output.splitlines()) if line.startswith('{')))
+
+
+# Returns the arguments that define the workload
+def get_workload_parameters(args):
+    return {key: value for key, value in vars(args).items() if key not in ('method', 'output', 'run_single')}
+
+
+def create_argument_parser():
+    parser = argparse.ArgumentParser(description='Benchmark of the btc_parser.py hot paths')
+    parser.add_argument('--method', choices=METHODS, action='append', help='Method to benchmark, default all')
+    parser.add_argument('--tx-count', type=int, default=2000, help='Transactions per snapshot, history or block')
+    parser.add_argument('--inputs-per-tx', type=int, default=2, help='Inputs per transaction')
+    parser.add_argument('--outputs-per-tx', type=int, default=2, help='Outputs per transaction')
+    parser.add_argument('--address-count', type=int, default=10000, help='Distinct addresses (address reuse)')
+    parser.add_argument('--blocks', type=int, default=4, help='Blocks of the block range scan')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed runs per method')
+    parser.add_argument('--json-backend', choices=('orjson', 'json', 'selective'), help='JSON backend of the client')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the synthetic data')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--run-single', choices=METHODS, help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    parser = create_argument_parser()
+    args = parser.parse_args()
+
+    # Child process: benchmark a single method and print its result as JSON
+    if args.run_single:
+        print(json.dumps(run_method(args.run_single, args)))
+        return
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': get_workload_parameters(args),
+        'methods': {}
+    }
+    for method in args.method or METHODS:
+        result = run_method_in_subprocess(method, args)
+        results['methods'][method] = result
+        print(f"{method:<45} {result['throughput_tx_per_s']:>12.1f} tx/s  "
+              f"p50 {result['latency_ms']['p50']:>9.3f} ms  p99 {result['latency_ms']['p99']:>9.3f} ms  "
+              f"peak RSS {result['peak_rss_bytes'] / 1024 ** 2:>7.1f} MiB")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#############################################################
+# @file     bench_transaction_graph.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Measures the build time of a TransactionGraph and the time of k-hop traces over a
+#           synthetic graph with random edges between integer-named addresses.
+#           Run from the repository root:
+#               python benchmarks/bench_transaction_graph.py --addresses 1000000 --edges 5000000
+#############################################################
+# Import packages
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from transaction_graph import BACKWARD_DIRECTION, FORWARD_DIRECTION, TransactionGraph  # noqa: E402
+from transaction_table import AddressCodes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the transaction graph traces")
+    parser.add_argument('--addresses', type=int, default=1000000)
+    parser.add_argument('--edges', type=int, default=5000000)
+    parser.add_argument('--hops', type=int, default=5)
+    parser.add_argument('--min-amount', type=int, default=50000)
+    parser.add_argument('--traces', type=int, default=5)
+    args = parser.parse_args()
+
+    address_codes = AddressCodes()
+    for index in range(args.addresses):
+        address_codes.encode(f"address_{index}")
+
+    # Random edges with log-uniform amounts between 1 satoshi and 1 btc
+    rng = np.random.default_rng(1)
+    sources = rng.integers(0, args.addresses, args.edges, dtype=np.int32)
+    targets = rng.integers(0, args.addresses, args.edges, dtype=np.int32)
+    amounts = (10 ** rng.uniform(0, 8, args.edges)).astype(np.int64)
+
+    start_time = time.perf_counter()
+    graph = TransactionGraph.from_edges(address_codes, sources, targets, amounts)
+    print(f"Build of {graph.get_edge_count()} edges: {time.perf_counter() - start_time:.2f} s")
+
+    for direction in (FORWARD_DIRECTION, BACKWARD_DIRECTION):
+        for min_amount in (0, args.min_amount):
+            durations = []
+            reached_count = 0
+            for trace_index in range(args.traces):
+                start_time = time.perf_counter()
+                reached_count = len(graph.trace_ids(trace_index, args.hops, direction, min_amount)[0])
+                durations.append(time.perf_counter() - start_time)
+            print(f"{args.hops}-hop {direction} trace, min amount {min_amount}: "
+                  f"{sum(durations) / len(durations) * 1000:.1f} ms, {reached_count} addresses reached")
+
+    # A repeated trace is answered from the cached layers
+    start_time = time.perf_counter()
+    graph.trace_ids(0, args.hops)
+    print(f"Repeated trace: {(time.perf_counter() - start_time) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
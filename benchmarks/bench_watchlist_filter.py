@@ -0,0 +1,114 @@
+#############################################################
+# @file     bench_watchlist_filter.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Measures the memory per watched address and the lookup rate of a set of strings,
+#           an in-memory CompactWatchlist and a memory-mapped CompactWatchlist file.
+#           The memory of the set and the in-memory watchlist is measured with tracemalloc, the
+#           memory-mapped watchlist is measured as the size of its file (the upper bound of the
+#           page cache it can occupy) and the growth of the RSS after the lookups.
+#           Run from the repository root:
+#               python benchmarks/bench_watchlist_filter.py --addresses 500000
+#############################################################
+# Import packages
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from watchlist_filter import CompactWatchlist  # noqa: E402
+
+
+# Returns deterministic addresses of the mainnet formats: P2PKH, P2SH, P2WPKH and P2TR
+def create_addresses(count, offset=0):
+    prefixes = (('1', 33), ('3', 33), ('bc1q', 38), ('bc1p', 58))
+    addresses = []
+    for index in range(offset, offset + count):
+        prefix, length = prefixes[index % len(prefixes)]
+        addresses.append(prefix + f"{index:x}".rjust(length, 'a'))
+    return addresses
+
+
+# Returns the current RSS of the process in bytes, 0 if it cannot be read
+def get_rss():
+    try:
+        with open('/proc/self/statm') as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+# Returns the bytes allocated by the creation of an object
+def measure_allocation(create):
+    gc.collect()
+    tracemalloc.start()
+    result = create()
+    allocated_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated_bytes
+
+
+# Returns the lookups per second of the watched and the unwatched addresses
+def measure_lookups(watch_addresses, watched, unwatched):
+    rates = []
+    for addresses in (watched, unwatched):
+        start_time = time.perf_counter()
+        for address in addresses:
+            address in watch_addresses  # noqa: B015
+        rates.append(len(addresses) / (time.perf_counter() - start_time))
+    return rates
+
+
+def create_argument_parser():
+    parser = argparse.ArgumentParser(description='Memory and lookup benchmark of the compact watchlist')
+    parser.add_argument('--addresses', type=int, default=200000, help='Watched addresses')
+    parser.add_argument('--lookups', type=int, default=100000, help='Lookups per kind (watched, unwatched)')
+    parser.add_argument('--false-positive-rate', type=float, default=0.01, help='False positive rate of the filter')
+    return parser
+
+
+def main():
+    args = create_argument_parser().parse_args()
+    addresses = create_addresses(args.addresses)
+    watched = addresses[::max(1, len(addresses) // args.lookups)][:args.lookups]
+    unwatched = create_addresses(args.lookups, offset=args.addresses)
+
+    print(f"{'watchlist':<26} {'bytes/address':>14} {'watched/s':>12} {'unwatched/s':>12}")
+
+    # Baseline: a set of strings, the strings are copied so that their memory is counted as well
+    watch_set, set_bytes = measure_allocation(lambda: {''.join(address) for address in addresses})
+    watched_rate, unwatched_rate = measure_lookups(watch_set, watched, unwatched)
+    print(f"{'set of str':<26} {set_bytes / args.addresses:>14.1f} {watched_rate:>12.0f} {unwatched_rate:>12.0f}")
+    del watch_set
+
+    compact_watchlist, _ = measure_allocation(
+        lambda: CompactWatchlist.from_addresses(addresses, args.false_positive_rate))
+    compact_bytes = compact_watchlist.get_size()
+    watched_rate, unwatched_rate = measure_lookups(compact_watchlist, watched, unwatched)
+    print(f"{'CompactWatchlist (memory)':<26} {compact_bytes / args.addresses:>14.1f} "
+          f"{watched_rate:>12.0f} {unwatched_rate:>12.0f}")
+    print(f"{'':<26} Bloom filter rejected {compact_watchlist.filtered_lookups} lookups, "
+          f"{compact_watchlist.false_positive_lookups} false positives")
+    del compact_watchlist
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        watchlist_path = os.path.join(temp_dir, 'watchlist.bwl')
+        CompactWatchlist.build(addresses, watchlist_path, args.false_positive_rate).close()
+
+        rss_before = get_rss()
+        with CompactWatchlist.open(watchlist_path) as mapped_watchlist:
+            watched_rate, unwatched_rate = measure_lookups(mapped_watchlist, watched, unwatched)
+            rss_growth = get_rss() - rss_before
+            print(f"{'CompactWatchlist (mmap)':<26} {mapped_watchlist.get_size() / args.addresses:>14.1f} "
+                  f"{watched_rate:>12.0f} {unwatched_rate:>12.0f}")
+            print(f"{'':<26} RSS growth after the lookups {rss_growth / args.addresses:.1f} bytes/address")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+#############################################################
+# @file     synthetic_chain.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Generates synthetic blocks in the format of the Blockchain.info rawblock API,
+#           including the fields the parser does not need (scripts, witnesses, ...), so that
+#           payload sizes and parse costs are realistic.
+#############################################################
+# Import packages
+import hashlib
+import random
+
+
+class SyntheticChain:
+    # Constructor
+    # address_count - Number of distinct addresses, a small number means a high address reuse
+    # seed          - Seed of the random generator, the same seed always generates the same data
+    def __init__(self, address_count=10000, seed=1):
+        self.random = random.Random(seed)
+        self.addresses = [self._create_address(index) for index in range(address_count)]
+        self.next_tx_index = 1
+
+    #############################################################
+    # @brief    This function generates a transaction in the format of the rawblock API.
+    #
+    # @para     inputs_per_tx - Number of inputs
+    # @para     outputs_per_tx - Number of outputs
+    # @para     block_height - Height of the block, None for an unconfirmed transaction
+    # @return   dict - Transaction
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def create_transaction(self, inputs_per_tx=2, outputs_per_tx=2, block_height=None):
+        tx_index = self.next_tx_index
+        self.next_tx_index += 1
+
+        inputs = []
+        for index in range(inputs_per_tx):
+            inputs.append({
+                'sequence': 4294967295,
+                'witness': self._random_hex(107),
+                'script': '',
+                'index': index,
+                'prev_out': {
+                    'type': 0,
+                    'spent': True,
+                    'value': self.random.randint(546, 10 ** 9),
+                    'spending_outpoints': [{'tx_index': tx_index, 'n': index}],
+                    'n': self.random.randint(0, 3),
+                    'tx_index': self.random.randint(1, 10 ** 15),
+                    'script': self._random_hex(22),
+                    'addr': self.random.choice(self.addresses)
+                }
+            })
+
+        outputs = []
+        for index in range(outputs_per_tx):
+            outputs.append({
+                'type': 0,
+                'spent': False,
+                'value': self.random.randint(546, 10 ** 9),
+                'spending_outpoints': [],
+                'n': index,
+                'tx_index': tx_index,
+                'script': self._random_hex(22),
+                'addr': self.random.choice(self.addresses)
+            })
+
+        return {
+            'hash': self._random_hex(32),
+            'ver': 2,
+            'vin_sz': inputs_per_tx,
+            'vout_sz': outputs_per_tx,
+            'size': 100 + 148 * inputs_per_tx + 34 * outputs_per_tx,
+            'weight': 4 * (100 + 148 * inputs_per_tx + 34 * outputs_per_tx),
+            'fee': self.random.randint(200, 50000),
+            'relayed_by': '0.0.0.0',
+            'lock_time': 0,
+            'tx_index': tx_index,
+            'double_spend': False,
+            'time': 1700000000 + tx_index,
+            'block_index': block_height,
+            'block_height': block_height,
+            'inputs': inputs,
+            'out': outputs
+        }
+
+    #############################################################
+    # @brief    This function generates a block in the format of the rawblock API.
+    #
+    # @para     height - Height of the block
+    # @para     tx_count - Number of transactions
+    # @para     inputs_per_tx - Number of inputs per transaction
+    # @para     outputs_per_tx - Number of outputs per transaction
+    # @return   dict - Block
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def create_block(self, height, tx_count=2000, inputs_per_tx=2, outputs_per_tx=2):
+        return {
+            'hash': self._random_hex(32),
+            'ver': 536870912,
+            'prev_block': self._random_hex(32),
+            'mrkl_root': self._random_hex(32),
+            'time': 1700000000 + height * 600,
+            'bits': 386089497,
+            'fee': 0,
+            'nonce': self.random.randint(0, 2 ** 32),
+            'n_tx': tx_count,
+            'size': 0,
+            'block_index': height,
+            'main_chain': True,
+            'height': height,
+            'weight': 0,
+            'tx': [self.create_transaction(inputs_per_tx, outputs_per_tx, height) for _ in range(tx_count)]
+        }
+
+    #############################################################
+    # @brief    This function generates a memory pool snapshot in the format of the
+    #           unconfirmed-transactions API.
+    #
+    # @para     tx_count - Number of unconfirmed transactions
+    # @para     inputs_per_tx - Number of inputs per transaction
+    # @para     outputs_per_tx - Number of outputs per transaction
+    # @return   dict - Memory pool snapshot with the transactions in 'txs'
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def create_mempool(self, tx_count=2000, inputs_per_tx=2, outputs_per_tx=2):
+        return {'txs': [self.create_transaction(inputs_per_tx, outputs_per_tx) for _ in range(tx_count)]}
+
+    #############################################################
+    # @brief    This function generates the history of an address in the format of the rawaddr API.
+    #           The address is the first input of every second transaction and the first output
+    #           of the others.
+    #
+    # @para     address - Address of the history
+    # @para     tx_count - Number of transactions
+    # @para     inputs_per_tx - Number of inputs per transaction
+    # @para     outputs_per_tx - Number of outputs per transaction
+    # @return   dict - Address history with the transactions in 'txs'
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def create_address_history(self, address, tx_count=500, inputs_per_tx=2, outputs_per_tx=2):
+        transactions = []
+        for index in range(tx_count):
+            transaction = self.create_transaction(inputs_per_tx, outputs_per_tx, 800000 - index)
+            if index % 2:
+                transaction['inputs'][0]['prev_out']['addr'] = address
+            else:
+                transaction['out'][0]['addr'] = address
+            transactions.append(transaction)
+
+        return {'address': address, 'n_tx': tx_count, 'txs': transactions}
+
+    # Returns a deterministic bech32-like address
+    @staticmethod
+    def _create_address(index):
+        return 'bc1q' + hashlib.sha256(str(index).encode()).hexdigest()[:38]
+
+    # Returns a random hex string of the given number of bytes
+    def _random_hex(self, length):
+        return self.random.getrandbits(8 * length).to_bytes(length, 'big').hex()
@@ -0,0 +1,251 @@
+#############################################################
+# @file     address_clustering.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://en.bitcoin.it/wiki/Privacy#Common-input-ownership_heuristic
+#           https://en.wikipedia.org/wiki/Disjoint-set_data_structure
+# Hint:     Clusters of addresses that probably belong to the same wallet. The common-input-
+#           ownership heuristic assumes that all inputs of a transaction are signed by one
+#           owner, so the input addresses of a transaction are merged into one cluster.
+#           CoinJoins break this assumption and are skipped.
+#           The clusters are a union-find over integer-coded addresses, held in flat arrays
+#           (4 bytes parent + 1 byte rank per address) with path compression and union by rank,
+#           so millions of inputs are merged in memory in nearly linear time.
+#           File layout: header | cluster root per address | addresses separated by '\n'
+#############################################################
+# Import packages
+import os
+import struct
+import sys
+from array import array
+
+from coinjoin_analysis import CoinJoinAnalyzer
+
+# Header of the cluster file: magic, address count
+CLUSTERS_MAGIC = b'BTCCL\x00\x01\x00'
+CLUSTERS_HEADER = struct.Struct('<8sQ')
+
+# Type code of the parent array, 4 bytes on all supported platforms
+ADDRESS_ID_TYPE = 'I'
+
+
+class AddressClusters:
+    # Constructor
+    # coinjoin_analyzer - CoinJoinAnalyzer of the suspected mixes, which are not merged, a default analyzer if None
+    # skip_coinjoins    - False to merge the inputs of every transaction
+    def __init__(self, coinjoin_analyzer=None, skip_coinjoins=True):
+        if skip_coinjoins:
+            self.coinjoin_analyzer = coinjoin_analyzer if coinjoin_analyzer is not None else CoinJoinAnalyzer()
+        else:
+            self.coinjoin_analyzer = None
+
+        # Address <-> integer id, only addresses that were merged with another address are coded
+        self.address_ids = {}
+        self.addresses = []
+
+        # Union-find: parent id and rank (upper bound of the tree height) per id
+        self.parents = array(ADDRESS_ID_TYPE)
+        self.ranks = bytearray()
+
+        # Root id -> ids of the cluster, built on the first cluster lookup after a merge
+        self._members = None
+
+        self.cluster_count = 0
+        self.skipped_coinjoins = 0
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __contains__(self, address):
+        return address in self.address_ids
+
+    #############################################################
+    # @brief    This function merges the input addresses of a transaction into one cluster
+    #           (common-input-ownership heuristic). Transactions with less than two input
+    #           addresses give no link, suspected CoinJoins are skipped.
+    #
+    # @para     tx - Transaction in the format of the Blockchain.info API
+    # @return   bool - True if the input addresses were merged
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transaction(self, tx):
+        input_addresses = []
+        for input_data in tx.get("inputs", ()):
+            # Coinbase inputs have no previous output
+            prev_out = input_data.get("prev_out")
+            if prev_out and prev_out.get("addr") is not None:
+                input_addresses.append(prev_out["addr"])
+        if len(input_addresses) < 2 or len(set(input_addresses)) < 2:
+            return False
+
+        # The CoinJoin analysis is the expensive part and only needed for transactions that link addresses
+        if self.coinjoin_analyzer is not None:
+            # Only the input addresses are used by the analysis, their amounts are not needed
+            inputs = [(address, 0) for address in input_addresses]
+            outputs = [(output_data.get("addr"), output_data.get("value", 0)) for output_data in tx.get("out", ())]
+            if self.coinjoin_analyzer.analyze(None, tx.get("hash"), inputs, outputs) is not None:
+                self.skipped_coinjoins += 1
+                return False
+
+        self.add_inputs(input_addresses)
+        return True
+
+    # Merges the input addresses of all transactions of a block, returns the number of merged transactions
+    def add_block(self, block_data):
+        return sum(self.add_transaction(tx) for tx in block_data.get("tx", ()))
+
+    # Merges addresses into one cluster without any check, e.g. for addresses that are known to share a wallet
+    def add_inputs(self, addresses):
+        address_iter = iter(addresses)
+        first_root = self._find(self._get_id(next(address_iter)))
+        for address in address_iter:
+            first_root = self._union(first_root, self._find(self._get_id(address)))
+
+    # Returns the id of the cluster of an address, None if the address was never merged
+    def get_cluster_id(self, address):
+        address_id = self.address_ids.get(address)
+        return None if address_id is None else self._find(address_id)
+
+    # Returns True if both addresses are in the same cluster
+    def is_same_cluster(self, first_address, second_address):
+        first_cluster_id = self.get_cluster_id(first_address)
+        return first_cluster_id is not None and first_cluster_id == self.get_cluster_id(second_address)
+
+    #############################################################
+    # @brief    This function returns all addresses of the cluster of an address. The first
+    #           lookup after a merge builds the member index in one pass, every further lookup
+    #           is one find and one dictionary access.
+    #
+    # @para     address - Bitcoin address
+    # @return   set - Addresses of the cluster, only the address itself if it was never merged
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_cluster(self, address):
+        cluster_id = self.get_cluster_id(address)
+        if cluster_id is None:
+            return {address}
+
+        addresses = self.addresses
+        return {addresses[member_id] for member_id in self._get_members()[cluster_id]}
+
+    # Returns the addresses together with the addresses of their clusters
+    def expand(self, addresses):
+        expanded_addresses = set()
+        for address in addresses:
+            if address not in expanded_addresses:
+                expanded_addresses.update(self.get_cluster(address))
+        return expanded_addresses
+
+    # Returns the number of addresses per cluster, largest first
+    def get_cluster_sizes(self):
+        return sorted((len(member_ids) for member_ids in self._get_members().values()), reverse=True)
+
+    #############################################################
+    # @brief    This function writes the clusters to a file, which is replaced atomically.
+    #           The paths are compressed first, so the file holds the cluster root of every
+    #           address and loading needs no find.
+    #
+    # @para     clusters_path - Path of the cluster file
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def save(self, clusters_path):
+        roots = array(ADDRESS_ID_TYPE, (self._find(address_id) for address_id in range(len(self.parents))))
+        if sys.byteorder == 'big':
+            roots.byteswap()
+
+        temp_path = f"{clusters_path}.tmp"
+        with open(temp_path, 'wb') as clusters_file:
+            clusters_file.write(CLUSTERS_HEADER.pack(CLUSTERS_MAGIC, len(self.addresses)))
+            clusters_file.write(roots.tobytes())
+            clusters_file.write('\n'.join(self.addresses).encode())
+        os.replace(temp_path, clusters_path)
+
+    #############################################################
+    # @brief    This function reads the clusters of a file of save().
+    #
+    # @para     clusters_path - Path of the cluster file
+    # @para     coinjoin_analyzer - CoinJoinAnalyzer of further merges, a default analyzer if None
+    # @para     skip_coinjoins - False to merge the inputs of every further transaction
+    # @return   AddressClusters - Clusters of the file
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def load(cls, clusters_path, coinjoin_analyzer=None, skip_coinjoins=True):
+        with open(clusters_path, 'rb') as clusters_file:
+            content = clusters_file.read()
+        if len(content) < CLUSTERS_HEADER.size:
+            raise ValueError("No address cluster file")
+        magic, address_count = CLUSTERS_HEADER.unpack_from(content)
+        if magic != CLUSTERS_MAGIC:
+            raise ValueError("No address cluster file")
+
+        address_clusters = cls(coinjoin_analyzer, skip_coinjoins)
+        roots_end = CLUSTERS_HEADER.size + address_count * array(ADDRESS_ID_TYPE).itemsize
+        address_clusters.parents.frombytes(content[CLUSTERS_HEADER.size:roots_end])
+        if sys.byteorder == 'big':
+            address_clusters.parents.byteswap()
+        address_clusters.addresses = content[roots_end:].decode().split('\n') if address_count else []
+        if len(address_clusters.parents) != address_count or len(address_clusters.addresses) != address_count:
+            raise ValueError("Truncated address cluster file")
+        address_clusters.address_ids = {address: address_id for address_id, address in
+                                        enumerate(address_clusters.addresses)}
+
+        # Every address points to its root, so the trees have a height of at most 1
+        address_clusters.ranks = bytearray(address_count)
+        for address_id, root in enumerate(address_clusters.parents):
+            if root != address_id:
+                address_clusters.ranks[root] = 1
+        address_clusters.cluster_count = sum(1 for address_id, root in enumerate(address_clusters.parents)
+                                             if root == address_id)
+        return address_clusters
+
+    # Returns the id of an address, a new address becomes a cluster of its own
+    def _get_id(self, address):
+        address_id = self.address_ids.get(address)
+        if address_id is None:
+            address_id = self.address_ids[address] = len(self.addresses)
+            self.addresses.append(address)
+            self.parents.append(address_id)
+            self.ranks.append(0)
+            self.cluster_count += 1
+            self._members = None
+        return address_id
+
+    # Returns the root of an id and points every id on the path directly to the root (path compression)
+    def _find(self, address_id):
+        parents = self.parents
+        root = address_id
+        while parents[root] != root:
+            root = parents[root]
+        while parents[address_id] != root:
+            parents[address_id], address_id = root, parents[address_id]
+        return root
+
+    # Merges two clusters by their roots, the lower tree is attached to the higher one (union by rank)
+    def _union(self, first_root, second_root):
+        if first_root == second_root:
+            return first_root
+
+        ranks = self.ranks
+        if ranks[first_root] < ranks[second_root]:
+            first_root, second_root = second_root, first_root
+        self.parents[second_root] = first_root
+        if ranks[first_root] == ranks[second_root]:
+            ranks[first_root] += 1
+
+        self.cluster_count -= 1
+        self._members = None
+        return first_root
+
+    # Returns the index root id -> member ids, rebuilt after a merge
+    def _get_members(self):
+        if self._members is None:
+            members = {}
+            for address_id in range(len(self.parents)):
+                members.setdefault(self._find(address_id), []).append(address_id)
+            self._members = members
+        return self._members
@@ -0,0 +1,96 @@
+#############################################################
+# @file     address_history.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     The Blockchain.info API returns the history of an address newest first, so the offset
+#           of a transaction changes with every new transaction. The checkpoint therefore stores the
+#           synced history as position ranges counted from the oldest transaction, which stay valid.
+#############################################################
+# Import packages
+import json
+import os
+
+
+class AddressHistoryCheckpoint:
+    # Constructor
+    # checkpoint_path - JSON file of the checkpoint, None to keep the checkpoint in memory only
+    def __init__(self, checkpoint_path=None):
+        self.checkpoint_path = checkpoint_path
+
+        # Address -> sorted list of [start, end) position ranges of the synced transactions
+        self.synced_ranges = {}
+
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                self.synced_ranges = json.load(checkpoint_file)
+
+    # Returns the synced position ranges of an address
+    def get_synced_ranges(self, address):
+        return [tuple(synced_range) for synced_range in self.synced_ranges.get(address, [])]
+
+    #############################################################
+    # @brief    This function marks a range of transaction positions of an address as synced.
+    #           Overlapping and adjacent ranges are merged.
+    #
+    # @para     address - Bitcoin address
+    # @para     start - Position of the oldest transaction of the range, the oldest transaction has position 0
+    # @para     end - Position after the newest transaction of the range
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_synced_range(self, address, start, end):
+        if end <= start:
+            return
+
+        merged_ranges = []
+        for synced_start, synced_end in sorted(self.get_synced_ranges(address) + [(start, end)]):
+            if merged_ranges and synced_start <= merged_ranges[-1][1]:
+                merged_ranges[-1][1] = max(merged_ranges[-1][1], synced_end)
+            else:
+                merged_ranges.append([synced_start, synced_end])
+        self.synced_ranges[address] = merged_ranges
+
+    # Returns the number of synced transactions of an address
+    def get_synced_count(self, address):
+        return sum(end - start for start, end in self.get_synced_ranges(address))
+
+    # Writes the checkpoint to disk, the old file is only replaced after the new one was written completely
+    def save(self):
+        if self.checkpoint_path is None:
+            return
+
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(self.synced_ranges, checkpoint_file)
+        os.replace(temp_path, self.checkpoint_path)
+
+
+#############################################################
+# @brief    This function computes the pages that still have to be requested to complete
+#           the history of an address, newest first.
+#
+# @para     n_tx - Current number of transactions of the address
+# @para     synced_ranges - Synced position ranges of the address
+# @para     page_size - Maximum number of transactions per page
+# @return   iterator - (offset, limit) tuples of the missing pages
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def iter_missing_pages(n_tx, synced_ranges, page_size):
+    # Collect the gaps between the synced ranges
+    gaps = []
+    position = n_tx
+    for synced_start, synced_end in sorted(synced_ranges, reverse=True):
+        if synced_end < position:
+            gaps.append((max(synced_end, 0), position))
+        position = min(position, synced_start)
+    if position > 0:
+        gaps.append((0, position))
+
+    # Split the gaps into pages, the offset counts from the newest transaction
+    for gap_start, gap_end in gaps:
+        position = gap_end
+        while position > gap_start:
+            limit = min(page_size, position - gap_start)
+            yield n_tx - position, limit
+            position -= limit
@@ -0,0 +1,244 @@
+#############################################################
+# @file     address_index.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.sqlite.org/wal.html
+# Hint:     The index only knows the blocks that were ingested, balances and histories are
+#           therefore the balances and histories within the scanned block range.
+#           Outputs are keyed by (tx_hash, n), spends are kept in their own table and joined
+#           at query time, so the blocks can be ingested in any order. A spend references its
+#           output by tx_index (Blockchain.info) or by tx_hash (bitcoind).
+#############################################################
+# Import packages
+import sqlite3
+
+# Define Constants
+INGEST_BATCH_BLOCKS = 20
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS indexed_blocks (
+    height INTEGER PRIMARY KEY,
+    hash TEXT
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_hash TEXT PRIMARY KEY,
+    tx_index INTEGER,
+    block_height INTEGER,
+    first_sender TEXT,
+    first_recipient TEXT,
+    first_amount INTEGER
+);
+CREATE TABLE IF NOT EXISTS address_transactions (
+    address TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    block_height INTEGER,
+    tx_index INTEGER,
+    received INTEGER NOT NULL,
+    sent INTEGER NOT NULL,
+    PRIMARY KEY (address, tx_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS outputs (
+    tx_hash TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    tx_index INTEGER,
+    address TEXT,
+    value INTEGER NOT NULL,
+    block_height INTEGER,
+    PRIMARY KEY (tx_hash, n)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS outputs_by_address ON outputs (address);
+CREATE TABLE IF NOT EXISTS spends (
+    spent_tx_hash TEXT,
+    spent_tx_index INTEGER,
+    n INTEGER NOT NULL,
+    spending_tx_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS spends_by_tx_hash ON spends (spent_tx_hash, n);
+CREATE INDEX IF NOT EXISTS spends_by_tx_index ON spends (spent_tx_index, n);
+'''
+
+# Condition on an output o that no spend references it, a spend is joined by whichever reference its source provided
+UNSPENT_CONDITION = ('NOT EXISTS (SELECT 1 FROM spends s WHERE s.spent_tx_hash = o.tx_hash AND s.n = o.n) '
+                     'AND NOT EXISTS (SELECT 1 FROM spends s WHERE s.spent_tx_index = o.tx_index AND s.n = o.n)')
+
+
+class AddressIndex:
+    # Constructor
+    # index_path - SQLite database file, ':memory:' for an index that only lives as long as the object
+    def __init__(self, index_path=':memory:'):
+        self.index_path = index_path
+
+        self.connection = sqlite3.connect(index_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    # Closes the database
+    def close(self):
+        self.connection.close()
+
+    #############################################################
+    # @brief    This function ingests the blocks of a block scan into the index.
+    #           The rows of INGEST_BATCH_BLOCKS blocks are inserted in one transaction.
+    #           Blocks that are already indexed are skipped.
+    #
+    # @para     blocks - Iterable of (block_num, block_data) tuples, e.g. BtcBlockMonitoring.iter_btc_blocks()
+    # @return   int - Number of newly indexed blocks
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def ingest_blocks(self, blocks, batch_blocks=INGEST_BATCH_BLOCKS):
+        indexed_count = 0
+        pending_count = 0
+
+        for block_num, block_data in blocks:
+            if block_data is None or self.is_block_indexed(block_num):
+                continue
+
+            self._insert_block(block_num, block_data)
+            indexed_count += 1
+            pending_count += 1
+
+            if pending_count >= batch_blocks:
+                self.connection.commit()
+                pending_count = 0
+
+        self.connection.commit()
+        return indexed_count
+
+    # Ingests a single block
+    def ingest_block(self, block_num, block_data):
+        return self.ingest_blocks([(block_num, block_data)])
+
+    # Returns True if the block was ingested
+    def is_block_indexed(self, block_num):
+        query = 'SELECT 1 FROM indexed_blocks WHERE height = ?'
+        return self.connection.execute(query, (block_num,)).fetchone() is not None
+
+    # Returns (lowest, highest) indexed block height or (None, None) for an empty index
+    def get_indexed_block_range(self):
+        return self.connection.execute('SELECT MIN(height), MAX(height) FROM indexed_blocks').fetchone()
+
+    # Returns True if the indexed blocks are contiguous from the genesis block, i.e. the index knows the
+    # complete history of every address up to its highest block
+    def is_complete(self):
+        lowest_height, highest_height, block_count = self.connection.execute(
+            'SELECT MIN(height), MAX(height), COUNT(*) FROM indexed_blocks').fetchone()
+        return lowest_height == 0 and block_count == highest_height + 1
+
+    # Returns True if the address occurs in an indexed block
+    def has_address(self, address):
+        query = 'SELECT 1 FROM address_transactions WHERE address = ? LIMIT 1'
+        return self.connection.execute(query, (address,)).fetchone() is not None
+
+    #############################################################
+    # @brief    This function returns the balance of an address within the indexed blocks.
+    #           The balance is the value of the outputs to the address minus the outputs that
+    #           are spent, so it does not depend on the inputs carrying the address and value
+    #           of their previous output (bitcoind only adds them with the prevout verbosity).
+    #
+    # @para     address - Bitcoin address
+    # @return   int - Value of the unspent outputs in *10^-8 btc
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_balance(self, address):
+        query = 'SELECT COALESCE(SUM(o.value), 0) FROM outputs o WHERE o.address = ? AND ' + UNSPENT_CONDITION
+        return self.connection.execute(query, (address,)).fetchone()[0]
+
+    # Returns (first, last) block height in which the address occurs or (None, None)
+    def get_first_last_seen(self, address):
+        query = 'SELECT MIN(block_height), MAX(block_height) FROM address_transactions WHERE address = ?'
+        return self.connection.execute(query, (address,)).fetchone()
+
+    #############################################################
+    # @brief    This function returns the transaction history of an address within the indexed blocks.
+    #
+    # @para     address - Bitcoin address
+    # @return   list - (tx_hash, block_height, received, sent) tuples, oldest first
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_history(self, address):
+        query = ('SELECT tx_hash, block_height, received, sent FROM address_transactions '
+                 'WHERE address = ? ORDER BY block_height, tx_index')
+        return self.connection.execute(query, (address,)).fetchall()
+
+    #############################################################
+    # @brief    This function returns the transactions of an address in the format of
+    #           BtcAddressMonitoring.get_transactions_from_btc_address(), newest first.
+    #
+    # @para     address - Bitcoin address
+    # @return   list - (transmitter address, receiver address, amount in *10^-8 btc) tuples
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_transactions(self, address):
+        # One row per output: all outputs if the address paid, otherwise the outputs to the address.
+        # Transactions without indexed outputs fall back to their first output.
+        query = ('SELECT from_address, to_address, amount FROM ('
+                 'SELECT CASE WHEN a.sent > 0 THEN a.address ELSE t.first_sender END AS from_address, '
+                 'COALESCE(o.address, t.first_recipient) AS to_address, COALESCE(o.value, t.first_amount) AS amount, '
+                 'a.block_height, a.tx_index, o.n FROM address_transactions a '
+                 'JOIN transactions t ON t.tx_hash = a.tx_hash '
+                 'LEFT JOIN outputs o ON o.tx_hash = t.tx_hash AND (a.sent > 0 OR o.address = a.address) '
+                 'WHERE a.address = ?) '
+                 'WHERE from_address IS NOT NULL AND to_address IS NOT NULL AND amount '
+                 'ORDER BY block_height DESC, tx_index DESC, n')
+        return self.connection.execute(query, (address,)).fetchall()
+
+    # Returns the unspent outputs of an address as (tx_hash, n, value, block_height) tuples
+    def get_unspent_outputs(self, address):
+        query = ('SELECT o.tx_hash, o.n, o.value, o.block_height FROM outputs o WHERE o.address = ? '
+                 f"AND {UNSPENT_CONDITION} ORDER BY o.block_height")
+        return self.connection.execute(query, (address,)).fetchall()
+
+    # Collects the rows of a block and inserts them with executemany
+    def _insert_block(self, block_num, block_data):
+        transaction_rows = []
+        address_rows = []
+        output_rows = []
+        spend_rows = []
+
+        for tx in block_data.get("tx", []):
+            tx_hash = tx.get("hash")
+            tx_index = tx.get("tx_index")
+
+            # Sum the received and sent amounts per address in one pass over the transaction
+            flows = {}
+            first_sender = None
+            for input_data in tx.get("inputs", []):
+                prev_out = input_data.get("prev_out")
+                if not prev_out:
+                    # Coinbase input
+                    continue
+                if prev_out.get("addr") is not None:
+                    flow = flows.setdefault(prev_out["addr"], [0, 0])
+                    flow[1] += prev_out.get("value", 0)
+                    if first_sender is None:
+                        first_sender = prev_out["addr"]
+                if prev_out.get("n") is not None and (prev_out.get("tx_hash") is not None
+                                                      or prev_out.get("tx_index") is not None):
+                    spend_rows.append((prev_out.get("tx_hash"), prev_out.get("tx_index"), prev_out["n"], tx_hash))
+
+            for output_data in tx.get("out", []):
+                if output_data.get("addr") is not None:
+                    flow = flows.setdefault(output_data["addr"], [0, 0])
+                    flow[0] += output_data.get("value", 0)
+                if output_data.get("n") is not None:
+                    output_rows.append((tx_hash, output_data["n"], tx_index, output_data.get("addr"),
+                                        output_data.get("value", 0), block_num))
+
+            # The first known input address and the first output are kept for get_transactions()
+            outputs = tx.get("out") or [{}]
+            transaction_rows.append((tx_hash, tx_index, block_num, first_sender,
+                                     outputs[0].get("addr"), outputs[0].get("value")))
+            address_rows.extend((address, tx_hash, block_num, tx_index, received, sent)
+                                for address, (received, sent) in flows.items())
+
+        self.connection.executemany('INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?)', transaction_rows)
+        self.connection.executemany('INSERT OR IGNORE INTO address_transactions VALUES (?, ?, ?, ?, ?, ?)',
+                                    address_rows)
+        self.connection.executemany('INSERT OR IGNORE INTO outputs VALUES (?, ?, ?, ?, ?, ?)', output_rows)
+        self.connection.executemany('INSERT INTO spends VALUES (?, ?, ?, ?)', spend_rows)
+        self.connection.execute('INSERT INTO indexed_blocks VALUES (?, ?)', (block_num, block_data.get("hash")))
@@ -0,0 +1,346 @@
+#############################################################
+# @file     alert_dispatcher.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://developer.vonage.com/messaging/sms/overview
+#           https://en.wikipedia.org/wiki/Token_bucket
+# Hint:     Alerts are submitted to a queue and sent by a background thread:
+#           -> deduplication: an alert with the same key is dropped within the deduplication window
+#           -> coalescing: the alerts of a recipient that arrive within the coalescing window are
+#              sent as one message
+#           -> rate limit: the messages are sent at the rate of a token bucket
+#           -> retries: a failed message is sent again after the retry delay, at most max_retries
+#              times, then its deduplication keys are forgotten so a new alert is not dropped
+#           The backend only needs a send_message(from_number, to_number, message_text) method,
+#           so a local fake backend can be used in tests. A response in the format of the Nexmo
+#           API is checked, the API answers rejected messages (e.g. throttled) with HTTP 200.
+#           With a WatcherStateStore the keys of the sent alerts and the hashes of their
+#           transactions are recorded once the message was delivered, so a restarted watcher
+#           does not alert again but repeats undelivered alerts.
+#############################################################
+# Import packages
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Define Constants
+MESSAGES_PER_SECOND = 1.0
+MESSAGE_BURST = 5
+COALESCE_SECONDS = 2.0
+DEDUPLICATION_SECONDS = 3600
+MAX_ALERTS_PER_MESSAGE = 10
+MAX_SEND_RETRIES = 3
+RETRY_SECONDS = 30.0
+
+# Status of a message in a Nexmo API response that was accepted
+SMS_STATUS_OK = '0'
+
+# Marker in the queue that ends the dispatcher thread
+_STOP = object()
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+class SmsRejectedError(Exception):
+    # Constructor
+    # Message of a Nexmo API response that was rejected, e.g. status '1' (throttled)
+    def __init__(self, to_number, status, error_text):
+        super().__init__(f"The SMS to {to_number} was rejected with status {status}: {error_text}")
+        self.to_number = to_number
+        self.status = status
+
+
+#############################################################
+# @brief    This function checks the status of every message of a Nexmo API response.
+#           Responses of other backends without 'messages' are accepted.
+#
+# @para     response - Response of the send_message() call of a backend
+# @return   response - The checked response
+# @raise    SmsRejectedError - A message was not accepted
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def check_sms_response(response):
+    if not isinstance(response, dict):
+        return response
+    for message in response.get('messages', ()):
+        status = str(message.get('status'))
+        if status != SMS_STATUS_OK:
+            raise SmsRejectedError(message.get('to'), status, message.get('error-text'))
+    return response
+
+
+class TokenBucket:
+    # Constructor
+    # rate     - Tokens that are added per second
+    # capacity - Maximum number of tokens, i.e. the size of a burst
+    # clock    - Monotonic clock in seconds, can be replaced in tests together with sleep
+    def __init__(self, rate=MESSAGES_PER_SECOND, capacity=MESSAGE_BURST, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = capacity
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    # Takes a token if one is available and returns True, otherwise returns False
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    # Returns the seconds until the next token is available
+    def get_wait_time(self):
+        with self._lock:
+            self._refill()
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    # Blocks until a token was taken
+    def acquire(self):
+        while not self.try_acquire():
+            self.sleep(self.get_wait_time())
+
+    # Adds the tokens of the time since the last refill
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+
+class AlertDispatcher:
+    # Constructor
+    # from_number            - Cell phone number from which the messages are sent
+    # backend                - Object with send_message(from_number, to_number, message_text),
+    #                          a NexmoSmsBackend with the credentials of the environment if None
+    # rate_limiter           - TokenBucket of the messages, MESSAGES_PER_SECOND with bursts of MESSAGE_BURST if None
+    # coalesce_seconds       - Alerts of a recipient within this time after its first pending alert are sent together
+    # dedup_seconds          - Alerts with the same key within this time are sent only once
+    # max_alerts_per_message - Alerts listed in a coalesced message, the rest is only counted
+    # clock                  - Monotonic clock in seconds of the windows, can be replaced in tests
+    # state_store            - WatcherStateStore of the sent alerts, the deduplication is in memory only if None
+    # max_retries            - Retries of a failed message before its alerts are dropped
+    # retry_seconds          - Delay of a retry, a flush retries immediately
+    def __init__(self, from_number, backend=None, rate_limiter=None, coalesce_seconds=COALESCE_SECONDS,
+                 dedup_seconds=DEDUPLICATION_SECONDS, max_alerts_per_message=MAX_ALERTS_PER_MESSAGE,
+                 clock=time.monotonic, state_store=None, max_retries=MAX_SEND_RETRIES, retry_seconds=RETRY_SECONDS):
+        if backend is None:
+            # nexmo is only needed if the real SMS backend is used
+            from sms_interface import NexmoSmsBackend
+            backend = NexmoSmsBackend()
+
+        self.from_number = from_number
+        self.backend = backend
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket()
+        self.coalesce_seconds = coalesce_seconds
+        self.dedup_seconds = dedup_seconds
+        self.max_alerts_per_message = max_alerts_per_message
+        self.clock = clock
+        self.state_store = state_store
+        self.max_retries = max_retries
+        self.retry_seconds = retry_seconds
+
+        # Counters for monitoring
+        self.submitted_alerts = 0
+        self.deduplicated_alerts = 0
+        self.sent_messages = 0
+        self.retried_messages = 0
+        self.failed_messages = 0
+
+        # Deduplication key -> time of the last accepted alert, ordered from the oldest to the newest
+        self._recent_keys = OrderedDict()
+        self._dedup_lock = threading.Lock()
+
+        # Recipient -> [time at which the message is due, list of alert texts, list of deduplication keys,
+        # list of transaction hashes, number of failed attempts], only used by the dispatcher thread
+        self._pending = OrderedDict()
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+    #############################################################
+    # @brief    This function submits an alert for a recipient. The alert is sent by the
+    #           dispatcher thread, the function returns immediately.
+    #
+    # @para     recipient - Cell phone number to which the alert should be sent
+    # @para     text - Text of the alert
+    # @para     dedup_key - Key of the deduplication, (recipient, text) if None
+    # @para     tx_hash - Hash of the transaction of the alert, recorded as seen in the state store once
+    #                     the alert was delivered
+    # @return   boolean - False if the alert was dropped as duplicate
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def submit(self, recipient, text, dedup_key=None, tx_hash=None):
+        key = (recipient, text) if dedup_key is None else (recipient, dedup_key)
+        now = self.clock()
+
+        with self._dedup_lock:
+            self.submitted_alerts += 1
+
+            # Forget the keys that have left the deduplication window
+            while self._recent_keys and next(iter(self._recent_keys.values())) <= now - self.dedup_seconds:
+                self._recent_keys.popitem(last=False)
+
+            # Alerts that were sent before a restart are only known to the state store
+            if key in self._recent_keys or (self.state_store is not None
+                                            and self.state_store.is_alert_sent(key, self.dedup_seconds)):
+                self.deduplicated_alerts += 1
+                return False
+            self._recent_keys[key] = now
+
+        self._queue.put((recipient, text, key, tx_hash))
+        return True
+
+    # Starts the dispatcher thread
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert_dispatcher', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    # Sends the pending alerts and stops the dispatcher thread
+    def stop(self, timeout=None):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    #############################################################
+    # @brief    This function sends all submitted alerts immediately, without waiting for the
+    #           coalescing window. It is used if no dispatcher thread is running.
+    #
+    # @return   int - Number of sent messages
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def flush(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self._add_pending(*item)
+        return self._send_pending(force=True)
+
+    # Returns the counters of the dispatcher for monitoring
+    def get_statistics(self):
+        return {
+            'submitted_alerts': self.submitted_alerts,
+            'deduplicated_alerts': self.deduplicated_alerts,
+            'sent_messages': self.sent_messages,
+            'retried_messages': self.retried_messages,
+            'failed_messages': self.failed_messages
+        }
+
+    # Main loop of the dispatcher thread
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self._get_next_deadline())
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._send_pending(force=True)
+                return
+            if item is not None:
+                self._add_pending(*item)
+
+            self._send_pending()
+
+    # Returns the seconds until the next pending message is due, None if nothing is pending
+    def _get_next_deadline(self):
+        if not self._pending:
+            return None
+        due_time = min(pending[0] for pending in self._pending.values())
+        return max(0.0, due_time - self.clock())
+
+    # Adds an alert to the pending message of its recipient
+    def _add_pending(self, recipient, text, key, tx_hash):
+        if recipient not in self._pending:
+            self._pending[recipient] = [self.clock() + self.coalesce_seconds, [], [], [], 0]
+        self._pending[recipient][1].append(text)
+        self._pending[recipient][2].append(key)
+        if tx_hash is not None:
+            self._pending[recipient][3].append(tx_hash)
+
+    # Sends the due messages in the order of their first alert, all messages if force is set
+    def _send_pending(self, force=False):
+        sent_count = 0
+        while True:
+            now = self.clock()
+            due_recipients = [recipient for recipient, pending in self._pending.items() if force or pending[0] <= now]
+            if not due_recipients:
+                return sent_count
+
+            for recipient in due_recipients:
+                due_time, texts, keys, tx_hashes, failed_attempts = self._pending.pop(recipient)
+                self.rate_limiter.acquire()
+                if self._send_message(recipient, self._format_message(texts)):
+                    sent_count += 1
+                    self._record_sent_alerts(recipient, keys, tx_hashes)
+                elif failed_attempts < self.max_retries:
+                    # The retry is merged with the alerts that arrived in the meantime
+                    self.retried_messages += 1
+                    self._add_pending_retry(recipient, texts, keys, tx_hashes, failed_attempts + 1)
+                else:
+                    logger.error("The alert to %s was dropped after %d retries", recipient, self.max_retries)
+                    self.failed_messages += 1
+                    self._forget_keys(keys)
+
+    # Puts the alerts of a failed message back in front of the pending alerts of the recipient
+    def _add_pending_retry(self, recipient, texts, keys, tx_hashes, failed_attempts):
+        retry = [self.clock() + self.retry_seconds, texts, keys, tx_hashes, failed_attempts]
+        if recipient in self._pending:
+            pending = self._pending[recipient]
+            retry = [retry[0], texts + pending[1], keys + pending[2], tx_hashes + pending[3], failed_attempts]
+        self._pending[recipient] = retry
+
+    # Removes the keys of dropped alerts from the deduplication, so the alerts can be submitted again
+    def _forget_keys(self, keys):
+        with self._dedup_lock:
+            for key in keys:
+                self._recent_keys.pop(key, None)
+
+    # Joins the alerts of a recipient into one message
+    def _format_message(self, texts):
+        if len(texts) == 1:
+            return texts[0]
+
+        lines = [f"{len(texts)} alerts:"] + texts[:self.max_alerts_per_message]
+        if len(texts) > self.max_alerts_per_message:
+            lines.append(f"... and {len(texts) - self.max_alerts_per_message} more")
+        return '\n'.join(lines)
+
+    # Records the keys and transactions of sent alerts in the state store, a failing store does not stop the alerting
+    def _record_sent_alerts(self, recipient, keys, tx_hashes):
+        if self.state_store is None:
+            return
+        try:
+            self.state_store.add_alerts(recipient, keys)
+            if tx_hashes:
+                self.state_store.add_seen_transactions(tx_hashes)
+        except sqlite3.Error as err:
+            logger.error("An error occurred while recording the alerts to %s: %s", recipient, err)
+
+    # Sends a message with the backend, a failed message is reported
+    def _send_message(self, recipient, message_text):
+        try:
+            check_sms_response(self.backend.send_message(self.from_number, recipient, message_text))
+        except Exception as err:
+            logger.error("An error occurred while sending the alert to %s: %s", recipient, err)
+            return False
+
+        self.sent_messages += 1
+        return True
@@ -0,0 +1,252 @@
+#############################################################
+# @file     block_cache.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Confirmed blocks never change, so a downloaded block can be kept on disk and
+#           re-used by every later scan. Blocks close to the chain tip can still be replaced by
+#           a reorganisation and are only cached once they have min_confirmations confirmations.
+#           The tip is passed with set_tip_height() or update_tip_height(), without it the highest
+#           stored block is the best known tip, so blocks are only cached below it.
+#############################################################
+# Import packages
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from chain_data_source import DATA_SOURCE_ERRORS
+
+# Define Constants
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+CACHE_FILE_SUFFIX = '.json.gz'
+
+# Confirmations of a block before it is cached, i.e. the tip and the 5 blocks below it are never cached
+MIN_CONFIRMATIONS = 6
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+class BlockCache:
+    # Constructor
+    # cache_dir         - Directory of the cache, created if it does not exist
+    # max_bytes         - Maximum size of the compressed blocks on disk, least recently used blocks are evicted
+    # min_confirmations - Confirmations of a block before it is stored, 0 to store every block
+    def __init__(self, cache_dir, max_bytes=MAX_CACHE_BYTES, min_confirmations=MIN_CONFIRMATIONS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.min_confirmations = min_confirmations
+
+        # Height of the chain tip, None until it is set or a block is stored
+        self.tip_height = None
+
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+
+        # File name -> size in bytes, ordered from the least to the most recently used block
+        self._entries = OrderedDict()
+
+        # Block height and block hash -> file name
+        self._heights = {}
+        self._hashes = {}
+
+        # The cache is used from the worker threads of the concurrent block scan
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_entries()
+
+    #############################################################
+    # @brief    This function returns a cached block by its height or hash.
+    #
+    # @para     block_id - Height (int) or hash (str) of the block
+    # @para     expected_hash - Hash the block at the height must have, a block of another hash
+    #                           (replaced by a reorganisation) is removed and reported as a miss
+    # @return   dict - Block data or None if the block is not cached
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get(self, block_id, expected_hash=None):
+        payload = self.get_raw(block_id, expected_hash)
+        if payload is None:
+            return None
+
+        try:
+            return json.loads(payload)
+        except ValueError as err:
+            self._discard(block_id, err)
+            return None
+
+    # Returns the uncompressed JSON document of a cached block or None, e.g. to decode it in another process
+    def get_raw(self, block_id, expected_hash=None):
+        with self._lock:
+            file_name = self._lookup(block_id)
+            if file_name is not None and expected_hash is not None and _get_block_hash(file_name) != expected_hash:
+                logger.info("Block %s was replaced by block %s and is removed from the cache", block_id,
+                            expected_hash)
+                self._remove(file_name)
+                file_name = None
+            if file_name is None:
+                self.misses += 1
+                return None
+
+            # Mark the block as most recently used, also on disk for the next start
+            self._entries.move_to_end(file_name)
+            self.hits += 1
+
+        file_path = os.path.join(self.cache_dir, file_name)
+        try:
+            os.utime(file_path)
+            with gzip.open(file_path, 'rb') as cache_file:
+                return cache_file.read()
+        except OSError as err:
+            self._discard(block_id, err)
+            return None
+
+    #############################################################
+    # @brief    This function stores a block compressed in the cache and evicts the least
+    #           recently used blocks if the cache exceeds its size limit. A block with less
+    #           than min_confirmations confirmations is not stored.
+    #
+    # @para     block_num - Height of the block
+    # @para     block_data - Block data as returned by the rawblock API
+    # @return   bool - True if the block was stored
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def put(self, block_num, block_data):
+        if not self._accept(block_num):
+            return False
+        return self.put_raw(block_num, block_data.get('hash', ''),
+                            json.dumps(block_data, separators=(',', ':')).encode())
+
+    # Stores the JSON document of a block as it was received from the API, returns True if it was stored
+    def put_raw(self, block_num, block_hash, payload):
+        if not self._accept(block_num):
+            return False
+
+        file_name = f"{int(block_num)}_{block_hash or ''}{CACHE_FILE_SUFFIX}"
+        file_path = os.path.join(self.cache_dir, file_name)
+
+        # Write to a temporary file first so that a crash never leaves a truncated block behind
+        temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, 'wb', compresslevel=6) as cache_file:
+            cache_file.write(payload)
+        os.replace(temp_path, file_path)
+
+        with self._lock:
+            if file_name in self._entries:
+                self._remove(file_name)
+            self._add(file_name, os.path.getsize(file_path))
+            self._evict()
+        return True
+
+    # Sets the height of the chain tip, a lower height than the known tip is ignored
+    def set_tip_height(self, tip_height):
+        if tip_height is None:
+            return
+        with self._lock:
+            if self.tip_height is None or tip_height > self.tip_height:
+                self.tip_height = tip_height
+
+    # Requests the height of the chain tip from a ChainDataSource, a failed request keeps the known tip
+    def update_tip_height(self, data_source):
+        try:
+            self.set_tip_height(data_source.get_tip_height())
+        except DATA_SOURCE_ERRORS as err:
+            logger.warning("The chain tip could not be requested, only blocks below the highest stored block "
+                           "are cached: %s", err)
+
+    # Returns True if the block has enough confirmations to be cached
+    def is_confirmed(self, block_num):
+        return self.tip_height is not None and self.tip_height - block_num + 1 >= self.min_confirmations
+
+    #############################################################
+    # @brief    This function returns the counters of the cache for monitoring.
+    #
+    # @return   dict - hits, misses, number of cached blocks and size in bytes
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_statistics(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'blocks': len(self._entries),
+                'size_bytes': self.size_bytes
+            }
+
+    # Counts a stored block as seen tip and returns True if it has enough confirmations to be cached
+    def _accept(self, block_num):
+        self.set_tip_height(block_num)
+        return self.is_confirmed(block_num)
+
+    # Treats a damaged or concurrently evicted block as a miss and removes it from the cache
+    def _discard(self, block_id, err):
+        logger.warning("An error occurred while reading block %s from the cache: %s", block_id, err)
+        with self._lock:
+            self.hits -= 1
+            self.misses += 1
+            file_name = self._lookup(block_id)
+            if file_name is not None:
+                self._remove(file_name)
+
+    # Builds the index of the cached blocks from the cache directory, ordered by the last access
+    def _load_entries(self):
+        cached_files = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, file_name))
+            cached_files.append((stat.st_mtime, file_name, stat.st_size))
+
+        for _, file_name, size in sorted(cached_files):
+            self._add(file_name, size)
+        self._evict()
+
+    # Returns the file name of a block height or hash
+    def _lookup(self, block_id):
+        if isinstance(block_id, int):
+            return self._heights.get(block_id)
+        return self._hashes.get(block_id)
+
+    # Adds a file to the index, the file name is '<height>_<hash>.json.gz'
+    def _add(self, file_name, size):
+        height, _, block_hash = file_name[:-len(CACHE_FILE_SUFFIX)].partition('_')
+        self._entries[file_name] = size
+        self._heights[int(height)] = file_name
+        if block_hash:
+            self._hashes[block_hash] = file_name
+        self.size_bytes += size
+
+    # Removes a file from the index and from the disk
+    def _remove(self, file_name):
+        size = self._entries.pop(file_name, None)
+        if size is None:
+            return
+        self.size_bytes -= size
+
+        height, _, block_hash = file_name[:-len(CACHE_FILE_SUFFIX)].partition('_')
+        if self._heights.get(int(height)) == file_name:
+            del self._heights[int(height)]
+        if self._hashes.get(block_hash) == file_name:
+            del self._hashes[block_hash]
+
+        try:
+            os.remove(os.path.join(self.cache_dir, file_name))
+        except FileNotFoundError:
+            pass
+
+    # Evicts the least recently used blocks until the cache is within its size limit
+    def _evict(self):
+        while self.size_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+
+# Returns the block hash of a file name '<height>_<hash>.json.gz'
+def _get_block_hash(file_name):
+    return file_name[:-len(CACHE_FILE_SUFFIX)].partition('_')[2]
@@ -0,0 +1,169 @@
+#############################################################
+# @file     block_pipeline.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+# Hint:     The block scan runs in three stages:
+#           -> fetch: threads download the undecoded blocks (or read them from the block cache)
+#           -> analyze: worker processes decode the JSON and extract the CoinJoin candidates
+#              and mixes, so the CPU work is spread over all cores instead of one interpreter
+#           -> merge: the results are yielded in block order
+#           Only the raw payload goes to a worker and only the compact results come back,
+#           the decoded block never has to be pickled.
+#############################################################
+# Import packages
+import logging
+import os
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from chain_data_source import BlockchainInfoDataSource, DATA_SOURCE_ERRORS
+from coinjoin_analysis import CoinJoinAnalyzer, iter_coinjoin_candidates
+from json_decoding import get_json_decoder
+from metrics import TRANSACTIONS_SCANNED
+
+# Define Constants
+MAX_FETCH_WORKERS = 4
+
+# Blocks per worker process that are analyzed or waiting to be analyzed, bounds the memory of the pipeline
+BLOCKS_PER_PROCESS = 2
+
+# Analysis result of a block
+#   -> block_num - Height of the block
+#   -> block_hash - Hash of the block
+#   -> tx_count - Number of transactions in the block
+#   -> candidates - List of CoinJoinCandidate
+#   -> mix_records - List of MixRecord of the candidates that were scored as a mix
+BlockAnalysis = namedtuple('BlockAnalysis', ['block_num', 'block_hash', 'tx_count', 'candidates', 'mix_records'])
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+#############################################################
+# @brief    This function decodes and analyzes a block, it runs in a worker process.
+#
+# @para     block_num - Height of the block
+# @para     payload - JSON document of the block as returned by the rawblock API
+# @para     json_backend - JSON backend of json_decoding.get_json_decoder()
+# @para     analyzer - CoinJoinAnalyzer that scores the candidates
+# @return   BlockAnalysis - Analysis result of the block
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def analyze_block_payload(block_num, payload, json_backend, analyzer):
+    block_data = get_json_decoder(json_backend)(payload)
+
+    candidates = list(iter_coinjoin_candidates(block_num, block_data))
+    mix_records = [record for record in map(analyzer.analyze_candidate, candidates) if record is not None]
+    return BlockAnalysis(block_num, block_data.get("hash"), len(block_data["tx"]), candidates, mix_records)
+
+
+class BlockPipeline:
+    # Constructor
+    # api_client      - BtcApiClient of the Blockchain.info API, the shared default client if None
+    # fetch_workers   - Number of blocks that are downloaded concurrently
+    # process_workers - Number of worker processes, the number of CPU cores if None
+    # block_cache     - BlockCache that is consulted before and filled after a download (confirmed blocks only)
+    # json_backend    - JSON backend of the worker processes, None for the fastest available backend
+    # analyzer        - CoinJoinAnalyzer, a default analyzer if None
+    # data_source     - ChainDataSource of the blocks, the Blockchain.info API of the api_client if None
+    def __init__(self, api_client=None, fetch_workers=MAX_FETCH_WORKERS, process_workers=None, block_cache=None,
+                 json_backend=None, analyzer=None, data_source=None):
+        self.data_source = data_source if data_source is not None else BlockchainInfoDataSource(api_client)
+        self.fetch_workers = max(1, fetch_workers)
+        self.process_workers = max(1, process_workers or os.cpu_count() or 1)
+        self.block_cache = block_cache
+        self.json_backend = json_backend
+        self.analyzer = analyzer if analyzer is not None else CoinJoinAnalyzer()
+
+        # Fail early on an unknown backend instead of in every worker process
+        get_json_decoder(json_backend)
+
+    #############################################################
+    # @brief    This function runs the pipeline over a list of blocks.
+    #           At most 2 * fetch_workers downloads and BLOCKS_PER_PROCESS blocks per worker
+    #           process are pending at any time, so the memory usage does not grow with the
+    #           number of blocks.
+    #
+    # @para     block_nums - Iterable of block heights
+    # @return   iterator - (block_num, BlockAnalysis) tuples in the order of block_nums,
+    #                      the analysis is None if the block could not be retrieved
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_block_analyses(self, block_nums):
+        # Blocks near the chain tip are not cached, they can still be replaced by a reorganisation
+        if self.block_cache is not None:
+            self.block_cache.update_tip_height(self.data_source)
+
+        pending_block_nums = iter(block_nums)
+        fetch_window = 2 * self.fetch_workers
+        analysis_window = BLOCKS_PER_PROCESS * self.process_workers
+
+        # (block_num, future) tuples in block order
+        fetches = deque()
+        analyses = deque()
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='block_pipeline') as fetch_pool, \
+                ProcessPoolExecutor(max_workers=self.process_workers) as process_pool:
+
+            def submit_fetches():
+                while len(fetches) < fetch_window:
+                    block_num = next(pending_block_nums, None)
+                    if block_num is None:
+                        return
+                    fetches.append((block_num, fetch_pool.submit(self._fetch_block_payload, block_num)))
+
+            submit_fetches()
+            while fetches or analyses:
+                # Hand the next downloaded block to the worker processes as long as the analysis window has room
+                if fetches and len(analyses) < analysis_window:
+                    block_num, fetch = fetches.popleft()
+                    payload, from_cache = fetch.result()
+                    submit_fetches()
+
+                    if payload is None:
+                        analysis = Future()
+                        analysis.set_result(None)
+                    else:
+                        analysis = process_pool.submit(analyze_block_payload, block_num, payload, self.json_backend,
+                                                       self.analyzer)
+                    analyses.append((block_num, analysis, None if from_cache else payload))
+                    continue
+
+                # Merge the oldest block
+                block_num, analysis, downloaded_payload = analyses.popleft()
+                block_analysis = self._get_analysis_result(block_num, analysis)
+                if block_analysis is not None:
+                    # The workers run in other processes, so the scanned transactions are counted here
+                    TRANSACTIONS_SCANNED.inc('block', amount=block_analysis.tx_count)
+
+                # Cache the downloaded block once its hash is known, the compression runs in the fetch threads
+                if self.block_cache is not None and block_analysis is not None and downloaded_payload is not None:
+                    fetch_pool.submit(self.block_cache.put_raw, block_num, block_analysis.block_hash,
+                                      downloaded_payload)
+
+                yield block_num, block_analysis
+
+    # Returns (payload, from_cache) of a block, the payload is None if the block could not be retrieved
+    def _fetch_block_payload(self, block_num):
+        if self.block_cache is not None:
+            payload = self.block_cache.get_raw(block_num)
+            if payload is not None:
+                return payload, True
+
+        try:
+            return self.data_source.get_block_payload(block_num), False
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve block %d: %s", block_num, err)
+            return None, False
+
+    # Waits for the analysis of a block, a block that cannot be decoded is reported and skipped
+    @staticmethod
+    def _get_analysis_result(block_num, analysis):
+        try:
+            return analysis.result()
+        except (ValueError, KeyError, TypeError) as err:
+            logger.error("An error occurred while analyzing block %d: %s", block_num, err)
+            return None
@@ -0,0 +1,250 @@
+#############################################################
+# @file     btc_api_client.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.blockchain.com/explorer/api/blockchain_api
+#           https://requests.readthedocs.io/en/latest/user/advanced/#session-objects
+# Hint:     asyncio and the thread pool are only loaded by the asynchronous methods, so a
+#           one-shot check with get_json() does not pay for their import.
+#############################################################
+# Import packages
+import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from json_decoding import get_json_decoder
+from metrics import API_DECODE_SECONDS, API_ERRORS, API_REQUEST_SECONDS, API_RESPONSE_BYTES, API_RETRIES, \
+    get_endpoint_label
+
+# Define Constants
+BLOCKCHAIN_API_URL = 'https://blockchain.info'
+REQUEST_TIMEOUT_SECONDS = 15
+MAX_IN_FLIGHT_REQUESTS = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+MIN_RETRY_AFTER_LIMIT_SECONDS = 60
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Paths of the responses the selective JSON backend can decode (blocks and the memory pool), all other
+# responses, e.g. the address summaries of rawaddr, are decoded completely
+SELECTIVE_DECODING_PATHS = ('/rawblock/', '/unconfirmed-transactions')
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+class BtcApiClient:
+    # Constructor
+    # base_url      - Root URL of the API, can point to a local stand-in server for tests
+    # timeout       - Timeout in seconds for a single request (connect and read)
+    # max_in_flight - Maximum number of concurrent requests, also the size of the connection pool.
+    #                 Keeps the client below the rate limit of the API.
+    # max_retries   - Number of retries of a request after a rate limit, server error or connection error
+    # backoff       - Delay in seconds before the first retry, doubled for every further retry
+    # json_backend  - JSON backend of json_decoding.get_json_decoder(), None for the fastest available backend.
+    #                 'selective' only applies to SELECTIVE_DECODING_PATHS, the fastest backend decodes the rest.
+    def __init__(self, base_url=BLOCKCHAIN_API_URL, timeout=REQUEST_TIMEOUT_SECONDS,
+                 max_in_flight=MAX_IN_FLIGHT_REQUESTS, max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF_SECONDS,
+                 json_backend=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.json_decoder = get_json_decoder(json_backend)
+        self.selective_paths = SELECTIVE_DECODING_PATHS if json_backend == 'selective' else ()
+        self.full_json_decoder = get_json_decoder() if self.selective_paths else self.json_decoder
+
+        # One session keeps the TCP/TLS connections alive between the requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # The blocking requests are run in a bounded thread pool so that the event loop is never blocked.
+        # The pool is created with the first asynchronous request.
+        self._executor = None
+
+        # The semaphore is bound to the event loop it is used in and therefore created lazily
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    #############################################################
+    # @brief    This function requests an API path and returns the parsed JSON response.
+    #           The function blocks until the response was received or the timeout expired.
+    #           Rate limits (HTTP 429), server errors and connection errors are retried
+    #           with exponential backoff.
+    #
+    # @para     path - API path including the query parameters, e.g. '/rawblock/100'
+    # @return   dict - Parsed JSON response
+    # @raise    requests.exceptions.RequestException - API call failed or timed out
+    #           ValueError - Response could not be parsed as JSON
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_json(self, path):
+        return self._call_with_retries(self._get_json_once, path)
+
+    # Requests an API path and returns the undecoded response body, e.g. to decode it in another process
+    def get_content(self, path):
+        return self._call_with_retries(self._get_content_once, path)
+
+    # Calls a single request function and retries it according to _get_retry_delay()
+    def _call_with_retries(self, request_once, path):
+        attempt = 0
+        while True:
+            try:
+                return request_once(path)
+            except requests.exceptions.RequestException as err:
+                delay = self._get_retry_delay(attempt, err)
+                if delay is None:
+                    raise
+                self._record_retry(path, delay, err)
+            time.sleep(delay)
+            attempt += 1
+
+    #############################################################
+    # @brief    This function is the asyncio variant of get_json().
+    #           The number of concurrent requests is limited to max_in_flight.
+    #
+    # @para     path - API path including the query parameters
+    # @return   dict - Parsed JSON response
+    # @raise    requests.exceptions.RequestException - API call failed or timed out
+    #           ValueError - Response could not be parsed as JSON
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    async def fetch_json(self, path):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            try:
+                async with self._get_semaphore(loop):
+                    try:
+                        # The requests timeout applies per socket operation, wait_for bounds the whole request
+                        return await asyncio.wait_for(loop.run_in_executor(self._get_executor(), self._get_json_once,
+                                                                           path), self.timeout * 2)
+                    except asyncio.TimeoutError as err:
+                        API_ERRORS.inc(get_endpoint_label(path), 'Timeout')
+                        raise requests.exceptions.Timeout(f"Request to {path} timed out") from err
+            except requests.exceptions.RequestException as err:
+                delay = self._get_retry_delay(attempt, err)
+                if delay is None:
+                    raise
+                self._record_retry(path, delay, err)
+
+            # The semaphore is released during the backoff so that other requests can proceed
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    #############################################################
+    # @brief    This function requests several API paths concurrently.
+    #           The results are returned in the order of the paths. A failed request
+    #           does not cancel the others, its exception is returned instead of the result.
+    #
+    # @para     paths - Iterable of API paths
+    # @return   list - Parsed JSON responses or exceptions, in the order of the paths
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    async def fetch_many_json(self, paths):
+        import asyncio
+
+        return await asyncio.gather(*(self.fetch_json(path) for path in paths), return_exceptions=True)
+
+    # Requests an API path once without retries
+    def _get_json_once(self, path):
+        content = self._get_content_once(path)
+        json_decoder = self.json_decoder if path.startswith(self.selective_paths) else self.full_json_decoder
+        with API_DECODE_SECONDS.time(get_endpoint_label(path)):
+            return json_decoder(content)
+
+    # Requests an API path once without retries and returns the response body
+    def _get_content_once(self, path):
+        endpoint = get_endpoint_label(path)
+        start_time = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url + path, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            API_ERRORS.inc(endpoint, type(err).__name__)
+            raise
+        finally:
+            API_REQUEST_SECONDS.observe(time.perf_counter() - start_time, endpoint)
+
+        API_RESPONSE_BYTES.inc(endpoint, amount=len(response.content))
+        return response.content
+
+    # Counts and logs a retry
+    @staticmethod
+    def _record_retry(path, delay, err):
+        API_RETRIES.inc(get_endpoint_label(path))
+        logger.info("Retrying %s in %.1f s after: %s", path, delay, err)
+
+    # Returns the delay in seconds before the next retry or None if the error is not retried
+    def _get_retry_delay(self, attempt, err):
+        if attempt >= self.max_retries:
+            return None
+
+        if isinstance(err, requests.exceptions.HTTPError):
+            response = err.response
+            if response is None or response.status_code not in RETRY_STATUS_CODES:
+                return None
+
+            # Respect the waiting time requested by the API, a longer wait than the backoff of all
+            # retries (at least a minute) fails the request instead of blocking the caller
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                if float(retry_after) > max(self.backoff * 2 ** self.max_retries, MIN_RETRY_AFTER_LIMIT_SECONDS):
+                    return None
+                return float(retry_after)
+        elif not isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return None
+
+        return self.backoff * (2 ** attempt)
+
+    # Closes the pooled connections and the thread pool
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
+
+    # Returns the thread pool of the asynchronous requests and creates it on first use
+    def _get_executor(self):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='btc_api_client')
+        return self._executor
+
+    # Returns the semaphore for the running event loop
+    def _get_semaphore(self, loop):
+        import asyncio
+
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+
+# Client shared by all monitoring objects that are created without an explicit client,
+# so that the connection pool survives the objects that main() creates in every polling cycle
+_default_api_client = None
+
+
+#############################################################
+# @brief    This function returns the shared default API client and creates it on first use.
+#
+# @return   BtcApiClient - Shared client for the Blockchain.info API
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_default_api_client():
+    global _default_api_client
+    if _default_api_client is None:
+        _default_api_client = BtcApiClient()
+    return _default_api_client
@@ -3,23 +3,98 @@
 # @author   criticalEntropy
 # @date     23.12.2022
 # Hints:    https://www.blockchain.com/explorer/api/blockchain_api
+# Hint:     asyncio, the block pipeline and the address clusters are imported where they are
+#           used, so a one-shot check of an address does not load them.
 #############################################################
 # Import packages
-import requests
+import logging
+import time
+
+from address_history import iter_missing_pages
+from btc_api_client import get_default_api_client
+from chain_data_source import BlockchainInfoDataSource, DATA_SOURCE_ERRORS
+from coinjoin_analysis import CoinJoinAnalyzer, iter_coinjoin_candidates
+from metrics import record_scan
+from transaction_flow import get_address_flow
+# CoinJoinCandidate is kept importable from here for the callers of the block scan
+from coinjoin_analysis import CoinJoinCandidate  # noqa: F401
+
+# Define Constants
+ADDRESS_HISTORY_LIMIT = 500
+MAX_BLOCK_WORKERS = 4
+ADDRESS_PAGE_SIZE = 50
+MAX_PAGE_WORKERS = 4
+MAX_PAGE_ATTEMPTS = 3
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+#############################################################
+# @brief    This function retrieves the list of unconfirmed transactions from the memory pool
+#           via the Blockchain.info API.
+#
+# @para     api_client - BtcApiClient to be used, the shared default client if None
+# @para     data_source - ChainDataSource to be used instead of the Blockchain.info API of the api_client
+# @para     known_txids - Transaction hashes the caller already knows, the data source may return them
+#                         as {'hash': ...} only (see ChainDataSource.get_unconfirmed_transactions())
+# @return   dict - Parsed API response with the unconfirmed transactions in 'txs'
+#                  or None if the API call or the parsing failed
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def fetch_unconfirmed_transactions(api_client=None, data_source=None, known_txids=None):
+    if data_source is None:
+        data_source = BlockchainInfoDataSource(api_client)
+
+    # Make sure that the API call was successful, no HTTP errors occurred and the response could be parsed
+    try:
+        return data_source.get_unconfirmed_transactions(known_txids)
+    except DATA_SOURCE_ERRORS as err:
+        logger.error("An error occurred while trying to retrieve the list of unconfirmed transactions: %s", err)
+        return None
+
+
+#############################################################
+# @brief    This function is the asyncio variant of fetch_unconfirmed_transactions().
+#
+# @para     api_client - BtcApiClient to be used, the shared default client if None
+# @para     data_source - ChainDataSource to be used instead of the Blockchain.info API of the api_client
+# @return   dict - Parsed API response with the unconfirmed transactions in 'txs'
+#                  or None if the API call or the parsing failed
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+async def fetch_unconfirmed_transactions_async(api_client=None, data_source=None):
+    if data_source is None:
+        data_source = BlockchainInfoDataSource(api_client)
+
+    # Make sure that the API call was successful, no HTTP errors occurred and the response could be parsed
+    try:
+        return await data_source.get_unconfirmed_transactions_async()
+    except DATA_SOURCE_ERRORS as err:
+        logger.error("An error occurred while trying to retrieve the list of unconfirmed transactions: %s", err)
+        return None
 
 
 class BtcAddressMonitoring:
     # Constructor
-    def __init__(self, watch_address):
+    # A MempoolSnapshot shared between several instances can be passed so that the memory pool
+    # is only downloaded once per polling cycle instead of once per address and direction.
+    # Without an api_client the shared default client with its connection pool is used.
+    # An AddressIndex of scanned blocks is queried before the API if it holds the complete history of the
+    # address, i.e. all blocks from the genesis block. A partial index is only queried directly.
+    # A ChainDataSource replaces the Blockchain.info API, e.g. by recorded data for a backtest.
+    def __init__(self, watch_address, mempool_snapshot=None, api_client=None, address_index=None, data_source=None):
         self.watch_address = watch_address
+        self.mempool_snapshot = mempool_snapshot
+        self.api_client = api_client if api_client is not None else get_default_api_client()
+        self.address_index = address_index
+        self.data_source = data_source if data_source is not None else BlockchainInfoDataSource(self.api_client)
 
         self.transaction_list = []
         self.matrix = []
 
-    # Destructor
-    def __del__(self):
-        print(f"Deleting BtcAddressMonitoring object with watch_address {self.watch_address}")
-
     #############################################################
     # @brief    This function monitors a bitcoin address and returns 'True' in
     #           case of an unconfirmed Tx-transaction.
@@ -34,39 +109,19 @@ class BtcAddressMonitoring:
     # @date     23.12.2022
     #############################################################
     def is_tx_transaction_from_btc_address(self):
-        # Send an HTTP request to the Blockchain.info API to retrieve the list of unconfirmed transactions
-        api_url = 'https://blockchain.info/unconfirmed-transactions?format=json'
+        # Answer the check with a single set lookup if a shared snapshot of the memory pool is available
+        if self.mempool_snapshot is not None:
+            return self.mempool_snapshot.is_input_address(self.watch_address)
 
-        # Make sure that the API call was successful and no HTTP errors occurred
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-        except (requests.exceptions.RequestException, ValueError) as err:
-            print(f"An error occurred while trying to retrieve the list of unconfirmed transactions: {err}")
-            return False
+        # Retrieve the list of unconfirmed transactions
+        return self._is_tx_transaction_in(fetch_unconfirmed_transactions(data_source=self.data_source))
 
-        # Make sure that the response of the API call could be parsed correctly
-        try:
-            # Parse the response as a JSON dictionary
-            unconfirmed_transactions = response.json()
-        except ValueError as err:
-            print(f"An error occurred while parsing the response as a JSON dictionary: {err}")
-            return False
-
-        # Make sure that the API response object has the expected format and that the required keys are present.
-        try:
-            # Iterate over each unconfirmed transaction
-            for transaction in unconfirmed_transactions['txs']:
-                # Check if the address to be monitored has sent bitcoin
-                if transaction['inputs'][0]['prev_out']['addr'] == self.watch_address:
-                    # BTC was sent
-                    return True
-        except (KeyError, IndexError) as err:
-            print("An error occurred while parsing the API response:", err)
-            return False
+    # Asyncio variant of is_tx_transaction_from_btc_address()
+    async def is_tx_transaction_from_btc_address_async(self):
+        if self.mempool_snapshot is not None:
+            return self.mempool_snapshot.is_input_address(self.watch_address)
 
-        # Return False if the monitored address has not sent any BTC
-        return False
+        return self._is_tx_transaction_in(await fetch_unconfirmed_transactions_async(data_source=self.data_source))
 
     #############################################################
     # @brief    This function monitors a bitcoin address and returns 'True' in
@@ -82,23 +137,307 @@ class BtcAddressMonitoring:
     # @date     23.12.2022
     #############################################################
     def is_rx_transaction_to_btc_address(self):
-        # Send an HTTP request to the Blockchain.info API to retrieve the list of unconfirmed transactions
-        api_url = 'https://blockchain.info/unconfirmed-transactions?format=json'
+        # Answer the check with a single set lookup if a shared snapshot of the memory pool is available
+        if self.mempool_snapshot is not None:
+            return self.mempool_snapshot.is_output_address(self.watch_address)
+
+        # Retrieve the list of unconfirmed transactions
+        return self._is_rx_transaction_in(fetch_unconfirmed_transactions(data_source=self.data_source))
+
+    # Asyncio variant of is_rx_transaction_to_btc_address()
+    async def is_rx_transaction_to_btc_address_async(self):
+        if self.mempool_snapshot is not None:
+            return self.mempool_snapshot.is_output_address(self.watch_address)
+
+        return self._is_rx_transaction_in(await fetch_unconfirmed_transactions_async(data_source=self.data_source))
+
+    #############################################################
+    # @brief    This function returns the unconfirmed transactions of the watched address with
+    #           the amounts, i.e. the sent and received bitcoin of all inputs and outputs.
+    #
+    # @return   list - AddressFlow per unconfirmed transaction of the address,
+    #                  empty if the memory pool could not be retrieved
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_unconfirmed_flows_of_btc_address(self):
+        unconfirmed_transactions = fetch_unconfirmed_transactions(data_source=self.data_source)
+        if unconfirmed_transactions is None:
+            return []
+        return self._collect_flows(unconfirmed_transactions, 'mempool')
+
+    #############################################################
+    # @brief    This function requests the transactions of the watched address like
+    #           get_transactions_from_btc_address() and returns the flow of the address
+    #           per transaction: sent and received amount and the net flow.
+    #
+    # @return   list - AddressFlow per transaction, newest first, empty if the API request failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_flows_from_btc_address(self):
+        try:
+            data = self.data_source.get_address_transactions(self.watch_address, ADDRESS_HISTORY_LIMIT)
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve the transactions of %s: %s",
+                         self.watch_address, err)
+            return []
+        return self._collect_flows(data, 'address')
+
+    #############################################################
+    # @brief    This function requests the outgoing transaction of a Bitcoin address
+    #           from the Blockchain.info API and stores them in a list.
+    #
+    # @para     watch_address - Address to be monitored
+    # @return   list - A list containing the transaction information of a Bitcoin address,
+    #                  one entry per output of a transaction (see get_flows_from_btc_address() for net flows)
+    #                   -> transmitter address
+    #                   -> receiver address
+    #                   -> transaction amount in *10^-8 btc
+    # @author   criticalEntropy
+    # @date     29.12.2022
+    #############################################################
+
+    def get_transactions_from_btc_address(self):
+        # Answer from the local index of the scanned blocks if it holds the complete history of the address
+        if self._is_address_indexed():
+            self.transaction_list.extend(self.address_index.get_transactions(self.watch_address))
+            return self.transaction_list
+
+        # Make an API request to get the transaction data for the specified address
+        try:
+            data = self.data_source.get_address_transactions(self.watch_address, ADDRESS_HISTORY_LIMIT)
+        except DATA_SOURCE_ERRORS:
+            data = None
+
+        return self._collect_transactions(data)
+
+    # Asyncio variant of get_transactions_from_btc_address()
+    async def get_transactions_from_btc_address_async(self):
+        if self._is_address_indexed():
+            self.transaction_list.extend(self.address_index.get_transactions(self.watch_address))
+            return self.transaction_list
+
+        try:
+            data = await self.data_source.get_address_transactions_async(self.watch_address, ADDRESS_HISTORY_LIMIT)
+        except DATA_SOURCE_ERRORS:
+            data = None
+
+        return self._collect_transactions(data)
+
+    #############################################################
+    # @brief    This function requests the complete transaction history of the watched address
+    #           page by page, newest first. After the first page all further pages are requested
+    #           concurrently in windows of max_workers pages and yielded in order.
+    #           With a checkpoint only the part of the history that was not synced in a previous
+    #           run is requested, i.e. the new transactions and the rest of an interrupted run.
+    #           A page is marked as synced in the checkpoint after it was processed by the caller.
+    #           Transactions that arrive during the paging shift the older ones to higher offsets,
+    #           so a page whose n_tx differs from the first page is requested again at the shifted
+    #           offset and the following pages are requested at the shifted offsets, too.
+    #
+    # @para     checkpoint - AddressHistoryCheckpoint or None to request the complete history
+    # @para     page_size - Number of transactions per page
+    # @para     max_workers - Number of pages requested concurrently
+    # @return   iterator - Lists of transactions of the API response, one list per page
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_transaction_pages_from_btc_address(self, checkpoint=None, page_size=ADDRESS_PAGE_SIZE,
+                                                max_workers=MAX_PAGE_WORKERS):
+        # The first page also tells the current number of transactions of the address
+        try:
+            first_page = self.data_source.get_address_transactions(self.watch_address, page_size)
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve the transactions of %s: %s",
+                         self.watch_address, err)
+            return
+        n_tx = first_page.get("n_tx", len(first_page.get("txs", [])))
+
+        synced_ranges = checkpoint.get_synced_ranges(self.watch_address) if checkpoint is not None else []
+        missing_pages = list(iter_missing_pages(n_tx, synced_ranges, page_size))
+
+        # Re-use the first page if it is needed
+        if missing_pages and missing_pages[0][0] == 0:
+            _, limit = missing_pages.pop(0)
+            transactions = first_page.get("txs", [])[:limit]
+            yield transactions
+            self._mark_page_as_synced(checkpoint, n_tx, 0, transactions)
+
+        # Request the remaining pages concurrently, shifted by the transactions that arrived since the first page
+        import asyncio
+
+        drift = 0
+        for window_start in range(0, len(missing_pages), max_workers):
+            window = missing_pages[window_start:window_start + max_workers]
+            window_drift = drift
+            pages = asyncio.run(self.data_source.get_address_transaction_pages_async(
+                self.watch_address, [(offset + window_drift, limit) for offset, limit in window]))
+
+            for (offset, limit), page in zip(window, pages):
+                # Stop at the first failed page, the checkpoint keeps the progress up to here
+                if isinstance(page, Exception):
+                    logger.error("An error occurred while trying to retrieve the transactions of %s at offset %d: %s",
+                                 self.watch_address, offset, page)
+                    return
+
+                aligned_page = self._align_page(page, offset + window_drift, offset, limit, n_tx)
+                if aligned_page is None:
+                    return
+                page, request_offset = aligned_page
+                drift = request_offset - offset
+
+                transactions = page.get("txs", [])[:limit]
+                yield transactions
+                self._mark_page_as_synced(checkpoint, page.get("n_tx", n_tx), request_offset, transactions)
+
+    #############################################################
+    # @brief    This function makes sure that a page holds the transactions that were planned
+    #           with the n_tx of the first page. If the n_tx of the page differs, the page is
+    #           requested again at the offset shifted by the difference, at most
+    #           MAX_PAGE_ATTEMPTS requests per page.
+    #
+    # @para     page - API response of the page
+    # @para     request_offset - Offset at which the page was requested
+    # @para     offset - Offset of the page in the history of the first page
+    # @para     limit - Number of transactions of the page
+    # @para     n_tx - Number of transactions of the address on the first page
+    # @return   tuple - (page, offset at which it was requested) or None if the history kept changing
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def _align_page(self, page, request_offset, offset, limit, n_tx):
+        for attempt in range(1, MAX_PAGE_ATTEMPTS + 1):
+            shifted_offset = max(offset + page.get("n_tx", n_tx) - n_tx, 0)
+            if shifted_offset == request_offset:
+                return page, request_offset
+            if attempt == MAX_PAGE_ATTEMPTS:
+                break
+
+            request_offset = shifted_offset
+            try:
+                page = self.data_source.get_address_transactions(self.watch_address, limit, request_offset)
+            except DATA_SOURCE_ERRORS as err:
+                logger.error("An error occurred while trying to retrieve the transactions of %s at offset %d: %s",
+                             self.watch_address, request_offset, err)
+                return None
+
+        logger.error("The transactions of %s kept changing while the history was requested", self.watch_address)
+        return None
+
+    #############################################################
+    # @brief    This function requests the complete transaction history of the watched address
+    #           and returns it in the format of get_transactions_from_btc_address().
+    #
+    # @para     checkpoint - AddressHistoryCheckpoint to request only the history not synced before
+    # @return   list - (transmitter address, receiver address, amount in *10^-8 btc) tuples
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_all_transactions_from_btc_address(self, checkpoint=None):
+        transactions = []
+        for page in self.iter_transaction_pages_from_btc_address(checkpoint):
+            for from_address, to_address, amount, _ in self._iter_transactions({"txs": page}):
+                transactions.append((from_address, to_address, amount))
+        return transactions
+
+    #############################################################
+    # @brief    This function requests the complete transaction history of the watched address
+    #           and adds the flows of all its transactions to a transaction graph, so the
+    #           history can be traced beyond the one hop of get_transactions_from_btc_address().
+    #
+    # @para     graph_builder - TransactionGraphBuilder to be extended, e.g. with further addresses or blocks
+    # @para     checkpoint - AddressHistoryCheckpoint to request only the history not synced before
+    # @return   TransactionGraphBuilder - Builder with the edges of the history, build() returns the graph
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transaction_graph_of_btc_address(self, graph_builder=None, checkpoint=None):
+        # NumPy is only needed for the graph
+        from transaction_graph import TransactionGraphBuilder
+
+        if graph_builder is None:
+            graph_builder = TransactionGraphBuilder()
+        for page in self.iter_transaction_pages_from_btc_address(checkpoint):
+            graph_builder.add_transactions(page)
+        return graph_builder
+
+    #############################################################
+    # @brief    This function requests the complete transaction history of the watched address
+    #           and writes every input and output of its transactions to a scan sink page by
+    #           page, so the history is never held in memory as a whole.
+    #
+    # @para     sink - ScanSink of scan_export.open_scan_sink()
+    # @para     checkpoint - AddressHistoryCheckpoint to request only the history not synced before
+    # @return   int - Number of rows added to the sink so far
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def export_transactions_of_btc_address(self, sink, checkpoint=None):
+        for page in self.iter_transaction_pages_from_btc_address(checkpoint):
+            for tx in page:
+                sink.add_transaction(tx.get("block_height"), tx)
+        return sink.row_count
+
+    #############################################################
+    # @brief    This function returns the balance of the watched address.
+    #           A local index that holds all blocks from the genesis block is queried first, its
+    #           balance is the balance at its highest block. Otherwise the final balance is
+    #           requested from the API.
+    #
+    # @return   int - Balance in *10^-8 btc or None if the API request failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_balance_of_btc_address(self):
+        if self._is_address_indexed():
+            return self.address_index.get_balance(self.watch_address)
 
-        # Make sure that the API call was successful and no HTTP errors occurred
         try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-        except (requests.exceptions.RequestException, ValueError) as err:
-            print(f"An error occurred while trying to retrieve the list of unconfirmed transactions: {err}")
+            return self.data_source.get_address_balance(self.watch_address)
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve the balance of %s: %s", self.watch_address, err)
+            return None
+
+    # Returns True if the local index can answer queries about the watched address. An index of a part of
+    # the chain would report a partial balance and history, the API is asked instead.
+    def _is_address_indexed(self):
+        return (self.address_index is not None and self.address_index.has_address(self.watch_address)
+                and self.address_index.is_complete())
+
+    # Marks a page of transactions as synced and saves the checkpoint
+    def _mark_page_as_synced(self, checkpoint, n_tx, offset, transactions):
+        if checkpoint is None:
+            return
+        checkpoint.add_synced_range(self.watch_address, n_tx - offset - len(transactions), n_tx - offset)
+        checkpoint.save()
+
+    # Checks the unconfirmed transactions for a Tx-transaction of the watched address
+    def _is_tx_transaction_in(self, unconfirmed_transactions):
+        # The API call failed
+        if unconfirmed_transactions is None:
             return False
 
-        # Make sure that the response of the API call could be parsed correctly.
+        # Make sure that the API response object has the expected format and that the required keys are present.
         try:
-            # Parse the response as a JSON dictionary
-            unconfirmed_transactions = response.json()
-        except ValueError as err:
-            print(f"An error occurred while parsing the response as a JSON dictionary: {err}")
+            # Iterate over each unconfirmed transaction
+            for transaction in unconfirmed_transactions['txs']:
+                # Check if the address to be monitored has sent bitcoin with any of the inputs
+                for input_data in transaction['inputs']:
+                    if (input_data.get('prev_out') or {}).get('addr') == self.watch_address:
+                        # BTC was sent
+                        return True
+        except (KeyError, IndexError) as err:
+            logger.error("An error occurred while parsing the API response: %s", err)
+            return False
+
+        # Return False if the monitored address has not sent any BTC
+        return False
+
+    # Checks the unconfirmed transactions for an Rx-transaction of the watched address
+    def _is_rx_transaction_in(self, unconfirmed_transactions):
+        # The API call failed
+        if unconfirmed_transactions is None:
             return False
 
         # Make sure that the response of the API call could be parsed correctly
@@ -111,75 +450,382 @@ class BtcAddressMonitoring:
                         # BTC received
                         return True
         except (KeyError, IndexError) as err:
-            print("An error occurred while parsing the API response:", err)
+            logger.error("An error occurred while parsing the API response: %s", err)
             return False
 
         # Return False if the monitored address has not received any BTC
         return False
 
-    #############################################################
-    # @brief    This function requests the outgoing transaction of a Bitcoin address
-    #           from the Blockchain.info API and stores them in a list.
-    #
-    # @para     watch_address - Address to be monitored
-    # @return   list - A list containing the transaction information of a Bitcoin address
-    #                   -> transmitter address
-    #                   -> receiver address
-    #                   -> transaction amount in *10^-8 btc
-    # @author   criticalEntropy
-    # @date     29.12.2022
-    #############################################################
-
-    def get_transactions_from_btc_address(self):
-        # Set the number of data packets to 500 per page - A large number was chosen so that Api requests can be reduced
-        tx_page = 500
-
-        # Add the page parameter to the API URL
-        api_url = f"https://blockchain.info/rawaddr/{self.watch_address}?limit={tx_page}"
-
-        # Make an API request to get the transaction data for the specified address
-        response = requests.get(api_url)
-
+    # Returns the AddressFlow of the watched address for each transaction of the API response it is part of
+    def _collect_flows(self, data, scan):
+        start_time = time.perf_counter()
+        transactions = data.get("txs", [])
+        flows = [flow for flow in (get_address_flow(tx, self.watch_address) for tx in transactions)
+                 if flow is not None]
+        record_scan(scan, len(transactions), time.perf_counter() - start_time)
+        return flows
+
+    # Stores the transactions of the API response of the watched address in the transaction list
+    def _collect_transactions(self, data):
         # Check if the API request was successful
-        if response.ok:
-            # Get the transaction data from the API response
-            data = response.json()
-
-            # Check if the API response contains transaction data
-            if "txs" in data:
-                # Iterate over the transactions in the API response
-                for tx in data["txs"]:
-                    # Check if the transaction has inputs and outputs
-                    if "inputs" in tx and "out" in tx:
-                        # Get the address of the sender and the recipient, and the amount of the transaction
-                        from_address = tx["inputs"][0]["prev_out"]["addr"] if tx["inputs"] else None
-                        to_address = tx["out"][0]["addr"] if tx["out"] else None
-                        amount = tx["out"][0]["value"] if tx["out"] and "value" in tx["out"][0] else None
+        if data is not None:
+            start_time = time.perf_counter()
 
-                        # Check if all required data is present
-                        if from_address and to_address and amount:
-                            # Add the transaction data to the list
-                            self.transaction_list.append((from_address, to_address, amount))
+            # Add the transaction data to the list
+            for from_address, to_address, amount, _ in self._iter_transactions(data):
+                self.transaction_list.append((from_address, to_address, amount))
+            record_scan('address', len(data.get("txs", [])), time.perf_counter() - start_time)
         else:
             # Handle the error here
             self.transaction_list = []
-            pass
 
         # Return the list of transactions
         return self.transaction_list
 
+    # Iterates over the transactions of the API response as (from, to, amount, tx) tuples, one per output:
+    #   -> the watched address paid: every output, sent from the watched address
+    #   -> the watched address only received: its outputs, sent from the first input address
+    #   -> the watched address is not part of the transaction: every output, sent from the first input address
+    def _iter_transactions(self, data):
+        # Check if the API response contains transaction data
+        if "txs" in data:
+            # Iterate over the transactions in the API response
+            for tx in data["txs"]:
+                # Check if the transaction has inputs and outputs
+                if "inputs" in tx and "out" in tx:
+                    # Find the first sender and whether the watched address paid in one pass over the inputs
+                    first_sender = None
+                    is_sender = False
+                    for input_data in tx["inputs"]:
+                        sender = (input_data.get("prev_out") or {}).get("addr")
+                        if first_sender is None:
+                            first_sender = sender
+                        if sender == self.watch_address:
+                            is_sender = True
+                            break
+
+                    from_address = self.watch_address if is_sender else first_sender
+                    is_receiver_only = not is_sender and any(output_data.get("addr") == self.watch_address
+                                                             for output_data in tx["out"])
+
+                    for output_data in tx["out"]:
+                        # Get the recipient and the amount of the output
+                        to_address = output_data.get("addr")
+                        amount = output_data.get("value")
+                        if is_receiver_only and to_address != self.watch_address:
+                            continue
+
+                        # Check if all required data is present
+                        if from_address and to_address and amount:
+                            yield from_address, to_address, amount, tx
+
+    #############################################################
+    # @brief    This function requests the transactions of the watched address like
+    #           get_transactions_from_btc_address() but returns them as a columnar
+    #           TransactionTable with a sent and a received row per transaction.
+    #
+    # @return   TransactionTable - Transactions of the address, empty if the API request failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_transaction_table_from_btc_address(self):
+        # NumPy is only needed for the columnar results
+        from transaction_table import TransactionTableBuilder
+
+        try:
+            data = self.data_source.get_address_transactions(self.watch_address, ADDRESS_HISTORY_LIMIT)
+        except DATA_SOURCE_ERRORS:
+            data = {}
+
+        builder = TransactionTableBuilder()
+        for from_address, to_address, amount, tx in self._iter_transactions(data):
+            builder.add_transaction(from_address, to_address, amount, tx.get("block_height"), tx.get("tx_index"))
+        return builder.build()
+
 
 class BtcBlockMonitoring:
     # Constructor
-    def __init__(self, start_block, end_block):
+    # Without an api_client the shared default client with its connection pool is used.
+    # max_workers is the number of blocks that are downloaded concurrently, the number of requests
+    # in flight is additionally capped by max_in_flight of the api_client.
+    # A BlockCache is consulted before any block is downloaded and filled with every downloaded block
+    # that has enough confirmations.
+    # A ChainDataSource replaces the Blockchain.info API, e.g. a local bitcoind or recorded blocks.
+    def __init__(self, start_block, end_block, api_client=None, max_workers=MAX_BLOCK_WORKERS, block_cache=None,
+                 data_source=None):
         self.start_block = start_block
         self.end_block = end_block
+        self.api_client = api_client if api_client is not None else get_default_api_client()
+        self.max_workers = max_workers
+        self.block_cache = block_cache
+        self.data_source = data_source if data_source is not None else BlockchainInfoDataSource(self.api_client)
 
         self.matrix = []
 
-    # Destructor
-    def __del__(self):
-        print(f"Deleting BtcAddressMonitoring object with block {self.end_block}")
+    #############################################################
+    # @brief    This function requests the data of a block from the data source.
+    #           The block cache is consulted first if one is configured.
+    #
+    # @para     block_num - Height of the block
+    # @return   dict - Block data or None if the API request failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_btc_block(self, block_num):
+        if self.block_cache is not None:
+            block_data = self.block_cache.get(block_num)
+            if block_data is not None:
+                return block_data
+
+        try:
+            block_data = self.data_source.get_block(block_num)
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve block %d: %s", block_num, err)
+            return None
+
+        if self.block_cache is not None:
+            self.block_cache.put(block_num, block_data)
+        return block_data
+
+    # Asyncio variant of get_btc_block(), the cache is accessed in a thread to keep the event loop free
+    async def get_btc_block_async(self, block_num):
+        import asyncio
+
+        if self.block_cache is not None:
+            block_data = await asyncio.to_thread(self.block_cache.get, block_num)
+            if block_data is not None:
+                return block_data
+
+        try:
+            block_data = await self.data_source.get_block_async(block_num)
+        except DATA_SOURCE_ERRORS as err:
+            logger.error("An error occurred while trying to retrieve block %d: %s", block_num, err)
+            return None
+
+        if self.block_cache is not None:
+            await asyncio.to_thread(self.block_cache.put, block_num, block_data)
+        return block_data
+
+    #############################################################
+    # @brief    This function iterates over the block range in block order.
+    #           The blocks are downloaded concurrently, max_workers at a time, in a sliding window
+    #           of two blocks per worker like the downloads of the BlockPipeline. The next block
+    #           is requested as soon as the oldest one was yielded, so a slow block does not stall
+    #           the other workers and only one window of blocks is held in memory.
+    #
+    # @return   iterator - (block_num, block_data) tuples, block_data is None if the block could not be retrieved
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_btc_blocks(self):
+        import asyncio
+        from collections import deque
+
+        # Blocks near the chain tip are not cached, they can still be replaced by a reorganisation
+        if self.block_cache is not None:
+            self.block_cache.update_tip_height(self.data_source)
+
+        max_workers = max(1, self.max_workers)
+        pending_block_nums = iter(range(self.start_block, self.end_block + 1))
+
+        # One event loop for the whole range, the requests run in the threads of the API client and
+        # continue while the caller processes a block, the loop only runs while waiting for the oldest block
+        loop = asyncio.new_event_loop()
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch_block(block_num):
+            async with semaphore:
+                return await self.get_btc_block_async(block_num)
+
+        async def cancel_fetches():
+            for _, fetch in fetches:
+                fetch.cancel()
+            await asyncio.gather(*(fetch for _, fetch in fetches), return_exceptions=True)
+
+        # (block_num, task) tuples in block order
+        fetches = deque()
+        try:
+            while True:
+                while len(fetches) < 2 * max_workers:
+                    block_num = next(pending_block_nums, None)
+                    if block_num is None:
+                        break
+                    fetches.append((block_num, loop.create_task(fetch_block(block_num))))
+                if not fetches:
+                    return
+
+                block_num, fetch = fetches.popleft()
+                yield block_num, loop.run_until_complete(fetch)
+        finally:
+            # The caller stopped early, the remaining downloads are cancelled
+            loop.run_until_complete(cancel_fetches())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    #############################################################
+    # @brief    This function analyzes the block range in a BlockPipeline. The JSON decoding and the
+    #           CoinJoin analysis run in worker processes, so a backfill of many blocks scales with
+    #           the number of CPU cores instead of being limited to one.
+    #
+    # @para     process_workers - Number of worker processes, the number of CPU cores if None
+    # @para     analyzer - CoinJoinAnalyzer, a default analyzer if None
+    # @para     json_backend - JSON backend of the worker processes, None for the fastest available backend
+    # @return   iterator - (block_num, BlockAnalysis) tuples in block order, None for blocks that could not be retrieved
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_btc_block_analyses(self, process_workers=None, analyzer=None, json_backend=None):
+        # The process pool is only needed for the pipeline
+        from block_pipeline import BlockPipeline
+
+        pipeline = BlockPipeline(fetch_workers=self.max_workers, process_workers=process_workers,
+                                 block_cache=self.block_cache, json_backend=json_backend, analyzer=analyzer,
+                                 data_source=self.data_source)
+        return pipeline.iter_block_analyses(range(self.start_block, self.end_block + 1))
+
+    #############################################################
+    # @brief    This function downloads the block range and ingests it into a local address index.
+    #           Blocks that are already indexed are skipped by the index.
+    #
+    # @para     address_index - AddressIndex to be filled
+    # @return   int - Number of newly indexed blocks
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def index_btc_blocks(self, address_index):
+        return address_index.ingest_blocks(self.iter_btc_blocks())
+
+    #############################################################
+    # @brief    This function clusters the input addresses of the block range by the common-input-
+    #           ownership heuristic. All transactions of a block are used, not only the CoinJoin
+    #           candidates, since a consolidation with a single output links its inputs as well.
+    #
+    # @para     address_clusters - AddressClusters to be extended, new clusters if None
+    # @return   AddressClusters - Clusters of the scanned blocks
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def cluster_btc_blocks(self, address_clusters=None):
+        from address_clustering import AddressClusters
+
+        if address_clusters is None:
+            address_clusters = AddressClusters()
+
+        for block_num, block_data in self.iter_btc_blocks():
+            # Check if the API request was successful
+            if block_data is not None:
+                address_clusters.add_block(block_data)
+        return address_clusters
+
+    #############################################################
+    # @brief    This function adds the flows of all transactions of the block range to a
+    #           transaction graph. The blocks are processed one by one as they arrive.
+    #
+    # @para     graph_builder - TransactionGraphBuilder to be extended, e.g. with address histories
+    # @return   TransactionGraphBuilder - Builder with the edges of the blocks, build() returns the graph
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transaction_graph_of_btc_blocks(self, graph_builder=None):
+        # NumPy is only needed for the graph
+        from transaction_graph import TransactionGraphBuilder
+
+        if graph_builder is None:
+            graph_builder = TransactionGraphBuilder()
+        for block_num, block_data in self.iter_btc_blocks():
+            # Check if the API request was successful
+            if block_data is not None:
+                graph_builder.add_block(block_data)
+        return graph_builder
+
+    #############################################################
+    # @brief    This function iterates over the candidate CoinJoin transactions of the block range.
+    #           The candidates are yielded block by block as soon as a block is downloaded,
+    #           so the memory usage does not grow with the size of the block range.
+    #
+    # @return   iterator - CoinJoinCandidate per transaction with more than one input and output
+    #                   -> block_num - Height of the block
+    #                   -> tx_hash - Hash of the transaction
+    #                   -> tx_index - Transaction index of the Blockchain.info API
+    #                   -> inputs - List of (sender address, amount in *10^-8 btc) tuples
+    #                   -> outputs - List of (recipient address, amount in *10^-8 btc) tuples
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_mixed_btc_transactions_from_btc_blocks(self):
+        # Iterate over the block range, the blocks are downloaded concurrently
+        for block_num, block_data in self.iter_btc_blocks():
+            # Check if the API request was successful
+            if block_data is None:
+                continue
+
+            # The candidates of a block are collected first so that the scan time excludes the caller
+            start_time = time.perf_counter()
+            candidates = list(iter_coinjoin_candidates(block_num, block_data))
+            record_scan('block', len(block_data["tx"]), time.perf_counter() - start_time)
+            yield from candidates
+
+    #############################################################
+    # @brief    This function collects the candidate CoinJoin transactions of the block range in a
+    #           columnar TransactionTable with one sent row per input and one received row per output.
+    #
+    # @return   TransactionTable - Inputs and outputs of the candidate CoinJoin transactions
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_mixed_transaction_table_from_btc_blocks(self):
+        # NumPy is only needed for the columnar results
+        from transaction_table import TransactionTableBuilder, TX_DIRECTION_CODE, RX_DIRECTION_CODE
+
+        builder = TransactionTableBuilder()
+        for candidate in self.iter_mixed_btc_transactions_from_btc_blocks():
+            for sender_address, amount in candidate.inputs:
+                builder.add_flow(sender_address, amount, TX_DIRECTION_CODE, candidate.block_num, candidate.tx_index)
+            for recipient_address, amount in candidate.outputs:
+                builder.add_flow(recipient_address, amount, RX_DIRECTION_CODE, candidate.block_num, candidate.tx_index)
+        return builder.build()
+
+    #############################################################
+    # @brief    This function writes the inputs and outputs of the block range to a scan sink
+    #           while the blocks arrive. The sink writes a chunk every row_group_size rows, so
+    #           the memory usage does not grow with the size of the block range.
+    #
+    # @para     sink - ScanSink of scan_export.open_scan_sink()
+    # @para     mixed_only - True to write only the candidate CoinJoin transactions
+    #                        (the transactions of get_mixed_btc_transactions_from_btc_blocks())
+    # @return   int - Number of rows added to the sink so far
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def export_btc_blocks(self, sink, mixed_only=False):
+        if mixed_only:
+            for candidate in self.iter_mixed_btc_transactions_from_btc_blocks():
+                sink.add_candidate(candidate)
+        else:
+            for block_num, block_data in self.iter_btc_blocks():
+                # Check if the API request was successful
+                if block_data is not None:
+                    sink.add_block(block_num, block_data)
+        return sink.row_count
+
+    #############################################################
+    # @brief    This function scans the block range for suspected CoinJoin transactions.
+    #           Every candidate of iter_mixed_btc_transactions_from_btc_blocks() is scored by
+    #           the analyzer, the records are yielded as the blocks arrive.
+    #
+    # @para     analyzer - CoinJoinAnalyzer, a default analyzer if None
+    # @return   iterator - MixRecord per suspected mix
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def iter_coinjoin_records_from_btc_blocks(self, analyzer=None):
+        if analyzer is None:
+            analyzer = CoinJoinAnalyzer()
+
+        for candidate in self.iter_mixed_btc_transactions_from_btc_blocks():
+            record = analyzer.analyze_candidate(candidate)
+            if record is not None:
+                yield record
 
     #############################################################
     # @brief    This function checks if a bitcoin address is potentially involved in mixing bitcoin
@@ -195,49 +841,15 @@ class BtcBlockMonitoring:
 
     def get_mixed_btc_transactions_from_btc_blocks(self):
 
-        # Initialize lists to store the transaction data
-        sender_addresses = []
-        recipient_addresses = []
-        amounts = []
-
-        # Iterate over the block range
-        for block_num in range(self.start_block, self.end_block + 1):
-            # Make an API request to get the block data
-            response = requests.get(f"https://blockchain.info/rawblock/{block_num}")
+        # Iterate over the candidates of the block range
+        for candidate in self.iter_mixed_btc_transactions_from_btc_blocks():
+            # Pair the inputs with the outputs of the same transaction by index, so a transaction with
+            # more inputs than outputs gets None as receiver instead of the output of another transaction
+            for i, (sender_address, amount) in enumerate(candidate.inputs):
+                recipient_address = candidate.outputs[i][0] if i < len(candidate.outputs) else None
 
-            # Check if the API request was successful
-            if response.ok:
-                # Get the block data from the API response
-                block_data = response.json()
-
-                # Iterate over the transactions in the block
-                for tx in block_data["tx"]:
-                    # Check if the transaction is a CoinJoin
-                    if len(tx["inputs"]) > 1 and len(tx["out"]) > 1:
-                        # Iterate over the inputs in the transaction
-                        for input_data in tx["inputs"]:
-                            # Get the sender address and amount
-                            sender_address = input_data["prev_out"]["addr"]
-                            amount = input_data["prev_out"]["value"]
-
-                            # Add the sender address and amount to the lists
-                            sender_addresses.append(sender_address)
-                            amounts.append(amount)
-
-                        # Iterate over the outputs in the transaction
-                        for output_data in tx["out"]:
-                            # Get the recipient address and amount
-                            recipient_address = output_data["addr"]
-                            recipient_addresses.append(recipient_address)
-                            amount = output_data["value"]
-
-        # Iterate over the sender addresses
-        for i in range(len(sender_addresses)):
-            # Create a list for the current transaction
-            transaction = [sender_addresses[i], recipient_addresses[i], amounts[i]]
-
-            # Add the transaction to the matrix
-            self.matrix.append(transaction)
+                # Add the transaction to the matrix
+                self.matrix.append([sender_address, recipient_address, amount])
 
         # Return the matrix
         return self.matrix
@@ -0,0 +1,479 @@
+#############################################################
+# @file     chain_data_source.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.blockchain.com/explorer/api/blockchain_api
+#           https://developer.bitcoin.org/reference/rpc/
+# Hint:     Every data source returns the data in the format of the Blockchain.info API, which is
+#           the format the monitors and analyses of this package work on:
+#           -> block: hash, height, time, tx[*]
+#           -> transaction: hash, tx_index, block_height, time,
+#                           inputs[*].prev_out.addr/value/n, out[*].addr/value/n
+#              (the previous output is referenced by prev_out.tx_index or prev_out.tx_hash)
+#           -> memory pool: txs[*]
+#           -> address history: n_tx, final_balance, txs[*] (newest first)
+#           Values are integers in *10^-8 btc. Fields a source cannot provide are left out.
+#############################################################
+# Import packages
+import glob
+import gzip
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+
+import requests
+
+from btc_api_client import get_default_api_client
+from json_decoding import get_json_decoder
+from metrics import API_ERRORS, API_REQUEST_SECONDS
+
+# Define Constants
+UNCONFIRMED_TRANSACTIONS_PATH = '/unconfirmed-transactions?format=json'
+LATEST_BLOCK_PATH = '/latestblock'
+BITCOIN_CORE_RPC_URL = 'http://127.0.0.1:8332'
+RPC_TIMEOUT_SECONDS = 30
+RPC_BATCH_SIZE = 500
+SATOSHI_PER_BTC = 100000000
+
+# Error code of bitcoind if a transaction is not in the memory pool (anymore)
+RPC_INVALID_ADDRESS_OR_KEY = -5
+
+
+class DataSourceError(Exception):
+    # Base class of the errors of a data source that are not raised by requests
+    pass
+
+
+class UnsupportedQueryError(DataSourceError):
+    # The data source cannot answer this kind of query, e.g. address histories from bitcoind
+    pass
+
+
+class RpcError(DataSourceError):
+    # Constructor
+    # Error returned by a JSON-RPC call
+    def __init__(self, method, code, message):
+        super().__init__(f"RPC {method} failed with code {code}: {message}")
+        self.method = method
+        self.code = code
+
+
+# Errors a caller of a data source has to expect, a failed query is handled like a failed API request
+DATA_SOURCE_ERRORS = (requests.exceptions.RequestException, ValueError, DataSourceError)
+
+
+class ChainDataSource(ABC):
+    # Abstract data source of blocks, the memory pool and address histories.
+    # The asyncio variants run the blocking calls in a thread, sources with a native
+    # asyncio implementation override them.
+
+    # Returns the unconfirmed transactions as {'txs': [...]}. known_txids is a container of the hashes the
+    # caller already knows, a source may return these transactions as {'hash': ...} only to save requests.
+    @abstractmethod
+    def get_unconfirmed_transactions(self, known_txids=None):
+        pass
+
+    # Returns the block at a height
+    @abstractmethod
+    def get_block(self, block_num):
+        pass
+
+    # Returns the height of the chain tip, e.g. to cache only blocks with enough confirmations
+    def get_tip_height(self):
+        raise UnsupportedQueryError(f"{type(self).__name__} has no chain tip")
+
+    # Returns the JSON document of a block as bytes, e.g. to decode it in another process
+    def get_block_payload(self, block_num):
+        return json.dumps(self.get_block(block_num), separators=(',', ':')).encode()
+
+    # Returns a page of the history of an address as {'n_tx': ..., 'final_balance': ..., 'txs': [...]}
+    def get_address_transactions(self, address, limit, offset=0):
+        raise UnsupportedQueryError(f"{type(self).__name__} has no address histories")
+
+    # Returns the balance of an address in *10^-8 btc
+    def get_address_balance(self, address):
+        return self.get_address_transactions(address, 0).get("final_balance")
+
+    # Asyncio variant of get_unconfirmed_transactions()
+    async def get_unconfirmed_transactions_async(self):
+        import asyncio
+
+        return await asyncio.to_thread(self.get_unconfirmed_transactions)
+
+    # Asyncio variant of get_block()
+    async def get_block_async(self, block_num):
+        import asyncio
+
+        return await asyncio.to_thread(self.get_block, block_num)
+
+    # Asyncio variant of get_address_transactions()
+    async def get_address_transactions_async(self, address, limit, offset=0):
+        import asyncio
+
+        return await asyncio.to_thread(self.get_address_transactions, address, limit, offset)
+
+    #############################################################
+    # @brief    This function requests several pages of the history of an address concurrently.
+    #           A failed page does not cancel the others, its exception is returned instead.
+    #
+    # @para     address - Bitcoin address
+    # @para     pages - List of (offset, limit) tuples
+    # @return   list - Pages or exceptions in the order of pages
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    async def get_address_transaction_pages_async(self, address, pages):
+        import asyncio
+
+        return await asyncio.gather(*(self.get_address_transactions_async(address, limit, offset)
+                                      for offset, limit in pages), return_exceptions=True)
+
+
+class BlockchainInfoDataSource(ChainDataSource):
+    # Constructor
+    # api_client - BtcApiClient, the shared default client if None
+    def __init__(self, api_client=None):
+        self.api_client = api_client if api_client is not None else get_default_api_client()
+
+    def get_unconfirmed_transactions(self, known_txids=None):
+        return self.api_client.get_json(UNCONFIRMED_TRANSACTIONS_PATH)
+
+    def get_block(self, block_num):
+        return self.api_client.get_json(f"/rawblock/{block_num}")
+
+    def get_block_payload(self, block_num):
+        return self.api_client.get_content(f"/rawblock/{block_num}")
+
+    def get_tip_height(self):
+        return self.api_client.get_json(LATEST_BLOCK_PATH).get("height")
+
+    def get_address_transactions(self, address, limit, offset=0):
+        return self.api_client.get_json(self.get_address_path(address, limit, offset))
+
+    async def get_unconfirmed_transactions_async(self):
+        return await self.api_client.fetch_json(UNCONFIRMED_TRANSACTIONS_PATH)
+
+    async def get_block_async(self, block_num):
+        return await self.api_client.fetch_json(f"/rawblock/{block_num}")
+
+    async def get_address_transactions_async(self, address, limit, offset=0):
+        return await self.api_client.fetch_json(self.get_address_path(address, limit, offset))
+
+    # Returns the API path of a page of the history of an address
+    @staticmethod
+    def get_address_path(address, limit, offset=0):
+        if offset:
+            return f"/rawaddr/{address}?limit={limit}&offset={offset}"
+        return f"/rawaddr/{address}?limit={limit}"
+
+
+class BitcoinCoreRpcDataSource(ChainDataSource):
+    # Constructor
+    # url             - JSON-RPC endpoint of bitcoind
+    # rpc_user        - RPC user, the password of the cookie file can be passed as rpc_password with user '__cookie__'
+    # rpc_password    - RPC password
+    # block_verbosity - Verbosity of getblock. With 2 the inputs only reference their previous output,
+    #                   with 3 (bitcoind 23 or newer) they also carry its address and value.
+    # batch_size      - Number of calls per JSON-RPC batch when the memory pool transactions are requested
+    def __init__(self, url=BITCOIN_CORE_RPC_URL, rpc_user=None, rpc_password=None, block_verbosity=2,
+                 timeout=RPC_TIMEOUT_SECONDS, batch_size=RPC_BATCH_SIZE, json_backend=None):
+        self.url = url
+        self.block_verbosity = block_verbosity
+        self.timeout = timeout
+        self.batch_size = batch_size
+        # The selective backend only knows the fields of the Blockchain.info API, not the JSON-RPC responses
+        if json_backend == 'selective':
+            raise ValueError("The JSON backend 'selective' cannot decode JSON-RPC responses")
+        self.json_decoder = get_json_decoder(json_backend)
+
+        self.session = requests.Session()
+        if rpc_user is not None:
+            self.session.auth = (rpc_user, rpc_password)
+
+        self._request_id = 0
+
+    #############################################################
+    # @brief    This function requests the memory pool with getrawmempool and the transactions
+    #           with getrawtransaction in batches. With bitcoind 25 or newer (verbosity 2 of
+    #           getrawtransaction) the inputs carry the address and value of their previous output.
+    #           Only the transactions that are not in known_txids are requested, so a polling
+    #           watcher requests the churn of the memory pool instead of the complete memory pool.
+    #           Transactions that leave the memory pool between the calls are skipped.
+    #
+    # @para     known_txids - Container of the transaction hashes the caller already knows, e.g. of a
+    #                         MempoolTracker. They are returned as {'hash': ..., 'time': ...} only.
+    # @return   dict - Unconfirmed transactions in 'txs', newest first
+    # @raise    requests.exceptions.RequestException, RpcError - RPC call failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_unconfirmed_transactions(self, known_txids=None):
+        mempool_entries = self.call('getrawmempool', True)
+        txids = sorted(mempool_entries, key=lambda txid: mempool_entries[txid].get('time', 0), reverse=True)
+        if known_txids is None:
+            known_txids = ()
+
+        new_txids = [txid for txid in txids if txid not in known_txids]
+        new_transactions = {}
+        for batch_start in range(0, len(new_txids), self.batch_size):
+            batch_txids = new_txids[batch_start:batch_start + self.batch_size]
+            results = self.call_batch('getrawtransaction', [(txid, 2) for txid in batch_txids])
+            for txid, result in zip(batch_txids, results):
+                if isinstance(result, RpcError):
+                    if result.code == RPC_INVALID_ADDRESS_OR_KEY:
+                        continue
+                    raise result
+                new_transactions[txid] = map_rpc_transaction(result, tx_time=mempool_entries[txid].get('time'))
+
+        transactions = []
+        for txid in txids:
+            if txid in new_transactions:
+                transactions.append(new_transactions[txid])
+            elif txid in known_txids:
+                transactions.append({'hash': txid, 'time': mempool_entries[txid].get('time')})
+        return {'txs': transactions}
+
+    #############################################################
+    # @brief    This function requests a block with getblockhash and getblock.
+    #
+    # @para     block_num - Height of the block
+    # @return   dict - Block in the format of the rawblock API
+    # @raise    requests.exceptions.RequestException, RpcError - RPC call failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_block(self, block_num):
+        block_hash = self.call('getblockhash', block_num)
+        return map_rpc_block(self.call('getblock', block_hash, self.block_verbosity))
+
+    def get_tip_height(self):
+        return self.call('getblockcount')
+
+    # Calls a JSON-RPC method and returns its result
+    def call(self, method, *params):
+        response = self._post(method, self._create_request(method, params))
+        if response.get('error'):
+            raise RpcError(method, response['error'].get('code'), response['error'].get('message'))
+        return response.get('result')
+
+    # Calls a JSON-RPC method once per parameter tuple in one batch, failed calls return an RpcError
+    def call_batch(self, method, params_list):
+        requests_by_id = [self._create_request(method, params) for params in params_list]
+        responses = {response.get('id'): response for response in self._post(method, requests_by_id)}
+
+        results = []
+        for request in requests_by_id:
+            response = responses.get(request['id'], {})
+            if response.get('error'):
+                results.append(RpcError(method, response['error'].get('code'), response['error'].get('message')))
+            else:
+                results.append(response.get('result'))
+        return results
+
+    # Creates a JSON-RPC request with a new id
+    def _create_request(self, method, params):
+        self._request_id += 1
+        return {'jsonrpc': '1.0', 'id': self._request_id, 'method': method, 'params': list(params)}
+
+    # Posts a JSON-RPC request or batch and returns the decoded response
+    def _post(self, method, payload):
+        endpoint = f"/rpc/{method}"
+        start_time = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+
+            # bitcoind answers failed calls with HTTP 404/500 and the error in the body
+            try:
+                return self.json_decoder(response.content)
+            except ValueError:
+                response.raise_for_status()
+                raise
+        except requests.exceptions.RequestException as err:
+            API_ERRORS.inc(endpoint, type(err).__name__)
+            raise
+        finally:
+            API_REQUEST_SECONDS.observe(time.perf_counter() - start_time, endpoint)
+
+
+class ReplayDataSource(ChainDataSource):
+    # Constructor
+    # replay_dir - Directory with the recorded data:
+    #              -> blocks/<height>.json, blocks/<height>.json.gz or the files of a BlockCache
+    #              -> mempool/<sequence>.json, one memory pool snapshot per poll, replayed in file name order
+    #              -> addresses/<address>.json, complete history of an address in the format of the rawaddr API
+    def __init__(self, replay_dir):
+        self.replay_dir = replay_dir
+        self.mempool_paths = sorted(glob.glob(os.path.join(replay_dir, 'mempool', '*.json')))
+        self.mempool_position = 0
+
+    #############################################################
+    # @brief    This function returns the next recorded memory pool snapshot. After the last
+    #           snapshot the last one is returned again, i.e. the memory pool stays unchanged.
+    #
+    # @return   dict - Unconfirmed transactions in 'txs'
+    # @raise    DataSourceError - No memory pool snapshot was recorded
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_unconfirmed_transactions(self, known_txids=None):
+        if not self.mempool_paths:
+            raise DataSourceError(f"No memory pool snapshots in {self.replay_dir}")
+
+        mempool_path = self.mempool_paths[min(self.mempool_position, len(self.mempool_paths) - 1)]
+        self.mempool_position += 1
+        return _read_json(mempool_path)
+
+    # Returns True if every recorded memory pool snapshot was replayed
+    def is_mempool_exhausted(self):
+        return self.mempool_position >= len(self.mempool_paths)
+
+    def get_block(self, block_num):
+        return json.loads(self.get_block_payload(block_num))
+
+    def get_block_payload(self, block_num):
+        blocks_dir = os.path.join(self.replay_dir, 'blocks')
+        for pattern in (f"{block_num}.json", f"{block_num}.json.gz", f"{block_num}_*.json.gz"):
+            block_paths = glob.glob(os.path.join(blocks_dir, pattern))
+            if block_paths:
+                return _read_bytes(block_paths[0])
+        raise DataSourceError(f"Block {block_num} was not recorded in {self.replay_dir}")
+
+    def get_address_transactions(self, address, limit, offset=0):
+        address_path = os.path.join(self.replay_dir, 'addresses', f"{address}.json")
+        if not os.path.exists(address_path):
+            raise DataSourceError(f"Address {address} was not recorded in {self.replay_dir}")
+
+        history = _read_json(address_path)
+        page = dict(history)
+        page['txs'] = history.get('txs', [])[offset:offset + limit]
+        return page
+
+
+class RecordingDataSource(ChainDataSource):
+    # Constructor
+    # Passes every query to data_source and writes the responses to replay_dir in the layout of ReplayDataSource
+    def __init__(self, data_source, replay_dir):
+        self.data_source = data_source
+        self.replay_dir = replay_dir
+        self.mempool_sequence = len(glob.glob(os.path.join(replay_dir, 'mempool', '*.json')))
+
+        for sub_dir in ('blocks', 'mempool', 'addresses'):
+            os.makedirs(os.path.join(replay_dir, sub_dir), exist_ok=True)
+
+    # The complete memory pool is recorded, so the replay does not depend on the known transactions
+    def get_unconfirmed_transactions(self, known_txids=None):
+        unconfirmed_transactions = self.data_source.get_unconfirmed_transactions()
+        _write_json(os.path.join(self.replay_dir, 'mempool', f"{self.mempool_sequence:08d}.json"),
+                    unconfirmed_transactions)
+        self.mempool_sequence += 1
+        return unconfirmed_transactions
+
+    def get_tip_height(self):
+        return self.data_source.get_tip_height()
+
+    def get_block(self, block_num):
+        block_data = self.data_source.get_block(block_num)
+        _write_json(os.path.join(self.replay_dir, 'blocks', f"{block_num}.json"), block_data)
+        return block_data
+
+    # Only complete histories can be replayed, so a page is recorded if it starts at the newest transaction
+    # and contains the complete history
+    def get_address_transactions(self, address, limit, offset=0):
+        page = self.data_source.get_address_transactions(address, limit, offset)
+        if offset == 0 and len(page.get('txs', [])) >= page.get('n_tx', 0):
+            _write_json(os.path.join(self.replay_dir, 'addresses', f"{address}.json"), page)
+        return page
+
+
+#############################################################
+# @brief    This function converts a transaction of getrawtransaction or getblock (verbosity 2 or 3)
+#           to the format of the Blockchain.info API.
+#
+# @para     tx - Decoded transaction of bitcoind
+# @para     block_height - Height of the block, None for unconfirmed transactions
+# @para     tx_time - Time of the block or the time the transaction entered the memory pool
+# @return   dict - Transaction in the format of the Blockchain.info API
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def map_rpc_transaction(tx, block_height=None, tx_time=None):
+    inputs = []
+    for vin in tx.get('vin', []):
+        # Coinbase inputs have no previous output
+        if 'coinbase' in vin:
+            inputs.append({})
+            continue
+
+        # bitcoind references the previous output by its transaction hash instead of a tx_index
+        prev_out = {'tx_hash': vin.get('txid'), 'n': vin.get('vout')}
+        prevout = vin.get('prevout')
+        if prevout is not None:
+            prev_out['value'] = _to_satoshi(prevout.get('value', 0))
+            address = _get_script_address(prevout.get('scriptPubKey', {}))
+            if address is not None:
+                prev_out['addr'] = address
+        inputs.append({'prev_out': prev_out})
+
+    outputs = []
+    for vout in tx.get('vout', []):
+        output = {'n': vout.get('n'), 'value': _to_satoshi(vout.get('value', 0))}
+        address = _get_script_address(vout.get('scriptPubKey', {}))
+        if address is not None:
+            output['addr'] = address
+        outputs.append(output)
+
+    transaction = {'hash': tx.get('txid'), 'inputs': inputs, 'out': outputs}
+    if block_height is not None:
+        transaction['block_height'] = block_height
+    if tx_time is not None:
+        transaction['time'] = tx_time
+    return transaction
+
+
+# Converts a block of getblock (verbosity 2 or 3) to the format of the rawblock API
+def map_rpc_block(block):
+    height = block.get('height')
+    return {
+        'hash': block.get('hash'),
+        'height': height,
+        'time': block.get('time'),
+        'prev_block': block.get('previousblockhash'),
+        'n_tx': block.get('nTx', len(block.get('tx', []))),
+        'tx': [map_rpc_transaction(tx, height, block.get('time')) for tx in block.get('tx', [])]
+    }
+
+
+# Converts an amount in btc to satoshi without the rounding errors of the float
+def _to_satoshi(value):
+    return int(round(value * SATOSHI_PER_BTC))
+
+
+# Returns the address of an output script, 'address' since bitcoind 22, 'addresses' before
+def _get_script_address(script_pub_key):
+    if 'address' in script_pub_key:
+        return script_pub_key['address']
+    addresses = script_pub_key.get('addresses')
+    return addresses[0] if addresses else None
+
+
+# Reads a JSON or gzip-compressed JSON file as bytes
+def _read_bytes(file_path):
+    if file_path.endswith('.gz'):
+        with gzip.open(file_path, 'rb') as gzip_file:
+            return gzip_file.read()
+    with open(file_path, 'rb') as json_file:
+        return json_file.read()
+
+
+# Reads a recorded JSON file
+def _read_json(file_path):
+    return json.loads(_read_bytes(file_path))
+
+
+# Writes a JSON file, the old file is only replaced after the new one was written completely
+def _write_json(file_path, data):
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w') as json_file:
+        json.dump(data, json_file, separators=(',', ':'))
+    os.replace(temp_path, file_path)
@@ -0,0 +1,220 @@
+#############################################################
+# @file     cli.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://docs.python.org/3/library/argparse.html#sub-commands
+#           https://docs.python.org/3/using/cmdline.html#cmdoption-X (-X importtime)
+# Hint:     Command line for short-lived checks, e.g. from cron or the Windows task scheduler:
+#               python cli.py check-address <address> [<address> ...]
+#               python cli.py scan-blocks <start> <end> [--export scan.parquet] [--mixed-only]
+#               python cli.py address-history <address> [--all] [--export history.csv]
+#               python cli.py watch
+#           Only argparse is imported at startup, the modules of a command are imported when
+#           the command runs, so a check of an address does not load asyncio, NumPy, the
+#           process pool or the metrics server. --timing reports the import and command times.
+#           Exit codes of check-address: 0 no transaction, 1 transaction found, 3 API error.
+#############################################################
+# Import packages
+import argparse
+import importlib
+import sys
+import time
+
+# Define Constants
+SATOSHI_PER_BTC = 100000000
+EXIT_NOTHING_FOUND = 0
+EXIT_FOUND = 1
+EXIT_API_ERROR = 3
+
+# Same as btc_parser.MAX_BLOCK_WORKERS, repeated so that the help does not import btc_parser
+MAX_BLOCK_WORKERS = 4
+
+# Import time in seconds per module imported by a command, reported by --timing
+_import_seconds = {}
+
+
+# Imports a module of a command and records its import time
+def _import(module_name):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    start_time = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_seconds[module_name] = time.perf_counter() - start_time
+    return module
+
+
+# Returns the API client of the command, the shared default client without --api-url
+def _get_api_client(args):
+    btc_api_client = _import('btc_api_client')
+    if args.api_url is None:
+        return btc_api_client.get_default_api_client()
+    return btc_api_client.BtcApiClient(base_url=args.api_url)
+
+
+# Formats an amount in *10^-8 btc as BTC
+def _format_btc(amount):
+    return f"{amount / SATOSHI_PER_BTC:.8f}"
+
+
+# Prints an AddressFlow as tab-separated line: tx hash, address, sent, received, net flow in BTC
+def _print_flow(flow):
+    print(flow.tx_hash, flow.address, _format_btc(flow.sent), _format_btc(flow.received), _format_btc(flow.net_flow),
+          sep='\t')
+
+
+#############################################################
+# @brief    This function checks the memory pool for unconfirmed transactions of the addresses.
+#           The memory pool is downloaded once for all addresses, every transaction of an
+#           address is printed as one line.
+#
+# @para     args - Parsed arguments with addresses
+# @return   int - EXIT_FOUND if a transaction was found, EXIT_NOTHING_FOUND if not, EXIT_API_ERROR on failure
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def check_address(args):
+    btc_parser = _import('btc_parser')
+    transaction_flow = _import('transaction_flow')
+
+    unconfirmed_transactions = btc_parser.fetch_unconfirmed_transactions(_get_api_client(args))
+    if unconfirmed_transactions is None:
+        return EXIT_API_ERROR
+
+    addresses = set(args.addresses)
+    found = False
+    for tx in unconfirmed_transactions.get("txs", ()):
+        for flow in transaction_flow.get_address_flows(tx, addresses):
+            _print_flow(flow)
+            found = True
+    return EXIT_FOUND if found else EXIT_NOTHING_FOUND
+
+
+#############################################################
+# @brief    This function scans a block range. The suspected CoinJoins are printed as one line
+#           per mix, or the rows of the blocks are written to an export file.
+#
+# @para     args - Parsed arguments with start_block, end_block, workers, export and mixed_only
+# @return   int - 0
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def scan_blocks(args):
+    btc_parser = _import('btc_parser')
+    block_monitoring = btc_parser.BtcBlockMonitoring(args.start_block, args.end_block, _get_api_client(args),
+                                                     max_workers=args.workers)
+
+    if args.export is not None:
+        scan_export = _import('scan_export')
+        with scan_export.open_scan_sink(args.export) as sink:
+            row_count = block_monitoring.export_btc_blocks(sink, mixed_only=args.mixed_only)
+        print(f"{row_count} rows written to {args.export}", file=sys.stderr)
+        return 0
+
+    # Block, tx hash, inputs, outputs, equal output value in BTC, score
+    for record in block_monitoring.iter_coinjoin_records_from_btc_blocks():
+        print(record.block_num, record.tx_hash, record.input_count, record.output_count,
+              _format_btc(record.equal_output_value), f"{record.score:.2f}", sep='\t')
+    return 0
+
+
+#############################################################
+# @brief    This function prints the net flows of the recent transactions of an address, or of
+#           its complete history with --all, or writes the history to an export file.
+#
+# @para     args - Parsed arguments with address, all and export
+# @return   int - 0
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def address_history(args):
+    btc_parser = _import('btc_parser')
+    address_monitoring = btc_parser.BtcAddressMonitoring(args.address, api_client=_get_api_client(args))
+
+    if args.export is not None:
+        scan_export = _import('scan_export')
+        with scan_export.open_scan_sink(args.export) as sink:
+            row_count = address_monitoring.export_transactions_of_btc_address(sink)
+        print(f"{row_count} rows written to {args.export}", file=sys.stderr)
+        return 0
+
+    if not args.all:
+        for flow in address_monitoring.get_flows_from_btc_address():
+            _print_flow(flow)
+        return 0
+
+    transaction_flow = _import('transaction_flow')
+    for page in address_monitoring.iter_transaction_pages_from_btc_address():
+        for tx in page:
+            flow = transaction_flow.get_address_flow(tx, args.address)
+            if flow is not None:
+                _print_flow(flow)
+    return 0
+
+
+# Runs the watcher of main.py until it is interrupted
+def watch(args):
+    _import('main').main()
+    return 0
+
+
+# Creates the parser of the command line
+def create_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Bitcoin address and block analytics')
+    parser.add_argument('--api-url', help='Base URL of the Blockchain.info API or a compatible server')
+    parser.add_argument('--timing', action='store_true', help='Report the import and command times on stderr')
+    parser.add_argument('--log-level', default='WARNING', help='Log level of the messages on stderr')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = commands.add_parser('check-address', help='Check the memory pool for transactions of addresses')
+    check_parser.add_argument('addresses', nargs='+', metavar='address')
+    check_parser.set_defaults(function=check_address)
+
+    scan_parser = commands.add_parser('scan-blocks', help='Scan a block range for CoinJoin transactions')
+    scan_parser.add_argument('start_block', type=int)
+    scan_parser.add_argument('end_block', type=int)
+    scan_parser.add_argument('--workers', type=int, default=MAX_BLOCK_WORKERS, help='Blocks downloaded concurrently')
+    scan_parser.add_argument('--export', help='Write the rows to a .parquet, .arrow or .csv file')
+    scan_parser.add_argument('--mixed-only', action='store_true', help='Export the CoinJoin candidates only')
+    scan_parser.set_defaults(function=scan_blocks)
+
+    history_parser = commands.add_parser('address-history', help='Print the transactions of an address')
+    history_parser.add_argument('address')
+    history_parser.add_argument('--all', action='store_true', help='Request the complete history')
+    history_parser.add_argument('--export', help='Write the rows to a .parquet, .arrow or .csv file')
+    history_parser.set_defaults(function=address_history)
+
+    watch_parser = commands.add_parser('watch', help='Run the watcher of main.py')
+    watch_parser.set_defaults(function=watch)
+    return parser
+
+
+#############################################################
+# @brief    This function runs a command of the command line.
+#
+# @para     argv - Arguments without the program name, sys.argv[1:] if None
+# @return   int - Exit code of the command
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def main(argv=None):
+    args = create_parser().parse_args(argv)
+
+    # The CPU time of the interpreter startup and the parsing of the arguments
+    startup_seconds = time.process_time()
+    _import('logging_config').configure_logging(args.log_level.upper())
+
+    start_time = time.perf_counter()
+    exit_code = args.function(args)
+    command_seconds = time.perf_counter() - start_time
+
+    if args.timing:
+        for module_name, import_seconds in _import_seconds.items():
+            print(f"import {module_name}: {import_seconds * 1000:.1f} ms", file=sys.stderr)
+        print(f"startup (cpu): {startup_seconds * 1000:.1f} ms", file=sys.stderr)
+        print(f"command (including imports): {command_seconds * 1000:.1f} ms", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#############################################################
+# @file     coinjoin_analysis.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://en.bitcoin.it/wiki/CoinJoin
+# Hint:     A CoinJoin combines the inputs of several participants into one transaction that
+#           pays every participant the same amount, so the equal outputs cannot be linked to the
+#           inputs. The analyzer looks for this pattern with a value counter per transaction,
+#           so its cost is linear in the number of inputs and outputs.
+#############################################################
+# Import packages
+from collections import Counter, namedtuple
+
+# Define Constants
+MIN_EQUAL_OUTPUTS = 2
+MIN_MIX_SCORE = 0.5
+PARTICIPANTS_FOR_FULL_SCORE = 5
+
+# Candidate CoinJoin transaction of a block scan
+CoinJoinCandidate = namedtuple('CoinJoinCandidate', ['block_num', 'tx_hash', 'tx_index', 'inputs', 'outputs'])
+
+# Suspected mix of a block scan
+MixRecord = namedtuple('MixRecord', [
+    'block_num', 'tx_hash', 'input_count', 'output_count', 'equal_output_value', 'equal_output_count',
+    'participant_count', 'score', 'input_addresses', 'output_addresses'
+])
+
+
+class CoinJoinAnalyzer:
+    # Constructor
+    # min_equal_outputs - Minimum number of outputs with the same value
+    # min_score         - Minimum score in [0, 1] of a transaction to be reported as a mix
+    def __init__(self, min_equal_outputs=MIN_EQUAL_OUTPUTS, min_score=MIN_MIX_SCORE):
+        self.min_equal_outputs = min_equal_outputs
+        self.min_score = min_score
+
+    #############################################################
+    # @brief    This function analyzes a transaction for the CoinJoin pattern.
+    #           -> equal outputs: the most frequent output value and its number of outputs
+    #           -> participants: at most one per equal output and one per distinct input address
+    #           -> score: share of equal outputs times a participant factor that reaches 1 at
+    #              PARTICIPANTS_FOR_FULL_SCORE participants, halved if an equal output goes back
+    #              to an input address, which a CoinJoin wallet would not do
+    #
+    # @para     block_num - Height of the block
+    # @para     tx_hash - Hash of the transaction
+    # @para     inputs - List of (sender address, amount in *10^-8 btc) tuples
+    # @para     outputs - List of (recipient address, amount in *10^-8 btc) tuples
+    # @return   MixRecord - Record of the suspected mix or None
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def analyze(self, block_num, tx_hash, inputs, outputs):
+        if len(inputs) < 2 or len(outputs) < 2:
+            return None
+
+        # Count the output values, outputs without value (e.g. OP_RETURN) are ignored
+        value_counts = Counter(value for _, value in outputs if value)
+        if not value_counts:
+            return None
+        equal_output_value, equal_output_count = value_counts.most_common(1)[0]
+        if equal_output_count < self.min_equal_outputs:
+            return None
+
+        input_addresses = {address for address, _ in inputs if address is not None}
+        participant_count = min(equal_output_count, max(len(input_addresses), 1))
+        if participant_count < 2:
+            return None
+
+        equal_share = equal_output_count / len(outputs)
+        participant_factor = min(1.0, (participant_count - 1) / (PARTICIPANTS_FOR_FULL_SCORE - 1))
+        score = equal_share * participant_factor
+
+        # Address reuse between the inputs and the equal outputs speaks against a CoinJoin
+        equal_output_addresses = [address for address, value in outputs if value == equal_output_value]
+        if any(address in input_addresses for address in equal_output_addresses):
+            score /= 2
+
+        if score < self.min_score:
+            return None
+
+        return MixRecord(block_num, tx_hash, len(inputs), len(outputs), equal_output_value, equal_output_count,
+                         participant_count, round(score, 4), sorted(input_addresses),
+                         [address for address, _ in outputs])
+
+    # Analyzes a CoinJoinCandidate of BtcBlockMonitoring.iter_mixed_btc_transactions_from_btc_blocks()
+    def analyze_candidate(self, candidate):
+        return self.analyze(candidate.block_num, candidate.tx_hash, candidate.inputs, candidate.outputs)
+
+    # Analyzes all transactions of a block and returns the MixRecords of the suspected mixes
+    def analyze_block(self, block_num, block_data):
+        records = []
+        for tx in block_data.get("tx", []):
+            inputs = []
+            for input_data in tx.get("inputs", []):
+                # Coinbase inputs have no previous output
+                prev_out = input_data.get("prev_out") or {}
+                inputs.append((prev_out.get("addr"), prev_out.get("value", 0)))
+            outputs = [(output_data.get("addr"), output_data.get("value", 0)) for output_data in tx.get("out", [])]
+            record = self.analyze(block_num, tx.get("hash"), inputs, outputs)
+            if record is not None:
+                records.append(record)
+        return records
+
+
+#############################################################
+# @brief    This function iterates over the candidate CoinJoin transactions of a block,
+#           i.e. the transactions with more than one input and more than one output.
+#
+# @para     block_num - Height of the block
+# @para     block_data - Block data as returned by the rawblock API
+# @return   iterator - CoinJoinCandidate per candidate transaction
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def iter_coinjoin_candidates(block_num, block_data):
+    for tx in block_data["tx"]:
+        # Check if the transaction is a CoinJoin
+        if len(tx["inputs"]) > 1 and len(tx["out"]) > 1:
+            # Get the sender addresses and amounts, inputs and outputs without address are kept as None.
+            # Sources without the previous outputs (e.g. getblock verbosity 2) give no input amounts.
+            prev_outs = [input_data.get("prev_out") or {} for input_data in tx["inputs"]]
+            inputs = [(prev_out.get("addr"), prev_out.get("value", 0)) for prev_out in prev_outs]
+
+            # Get the recipient addresses and amounts
+            outputs = [(output_data.get("addr"), output_data["value"]) for output_data in tx["out"]]
+
+            yield CoinJoinCandidate(block_num, tx.get("hash"), tx.get("tx_index"), inputs, outputs)
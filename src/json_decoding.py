@@ -0,0 +1,84 @@
+#############################################################
+# @file     json_decoding.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://github.com/ijl/orjson
+#           https://docs.python.org/3/library/json.html#json.JSONDecoder
+#############################################################
+# Import packages
+import json
+
+# orjson is optional, the standard library is used if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Define Constants
+JSON_BACKENDS = ('orjson', 'json')
+
+# Keys of the block and memory pool responses that are needed by the parser, all other keys are dropped by
+# the selective decoder. It does not know address summaries (final_balance, ...) or JSON-RPC responses.
+#   -> mempool responses: txs[*]
+#   -> block responses: tx[*], height, hash
+#   -> transactions: hash, tx_index, block_height, time, inputs[*].prev_out.addr/value, out[*].addr/value
+SELECTED_KEYS = frozenset([
+    'txs', 'tx', 'n_tx', 'height', 'hash', 'tx_index', 'block_height', 'time',
+    'inputs', 'prev_out', 'out', 'addr', 'value', 'n'
+])
+
+
+#############################################################
+# @brief    This function returns the fastest available JSON backend.
+#
+# @return   str - 'orjson' if installed, otherwise 'json'
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_default_json_backend():
+    return 'orjson' if orjson is not None else 'json'
+
+
+#############################################################
+# @brief    This function returns the decode function of a JSON backend.
+#
+# @para     backend - 'orjson', 'json' or 'selective', None for the fastest available backend
+# @return   function - Function bytes -> decoded JSON
+# @raise    ValueError - Unknown or not installed backend
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_json_decoder(backend=None):
+    if backend is None:
+        backend = get_default_json_backend()
+
+    if backend == 'orjson':
+        if orjson is None:
+            raise ValueError("The JSON backend 'orjson' is not installed")
+        return orjson.loads
+    if backend == 'json':
+        return json.loads
+    if backend == 'selective':
+        return loads_selected_fields
+    raise ValueError(f"Unknown JSON backend '{backend}'")
+
+
+#############################################################
+# @brief    This function decodes a JSON document and keeps only the keys in SELECTED_KEYS.
+#           Every object is reduced as soon as it is parsed, so the scripts, witnesses and
+#           other unused fields of a transaction are released immediately and the complete
+#           transaction dicts never exist in memory at the same time. This lowers the peak
+#           memory of multi-megabyte block payloads at the price of a slower parse.
+#
+# @para     data - JSON document as bytes or str
+# @return   dict - Decoded document with the selected keys only
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def loads_selected_fields(data):
+    return json.loads(data, object_pairs_hook=_select_pairs)
+
+
+# Builds an object from its key/value pairs, dropping the keys that are not needed
+def _select_pairs(pairs):
+    return {key: value for key, value in pairs if key in SELECTED_KEYS}
@@ -0,0 +1,62 @@
+#############################################################
+# @file     logging_config.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://docs.python.org/3/howto/logging.html#configuring-logging-for-a-library
+# Hint:     The modules only create their loggers, the handlers are configured once by the
+#           application, e.g. main.py. Without a configuration only warnings and errors are
+#           written to stderr by the logging module.
+#############################################################
+# Import packages
+import json
+import logging
+import sys
+
+# Define Constants
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Attributes of every log record, all other attributes were passed with extra={...}
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    #############################################################
+    # @brief    This function formats a log record as one JSON object per line.
+    #           The fields passed with extra={...} are added as top-level keys.
+    #
+    # @para     record - Log record
+    # @return   str - JSON line with time, level, logger, message and the extra fields
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+#############################################################
+# @brief    This function configures the root logger of the application.
+#
+# @para     level - Log level, e.g. logging.INFO or 'DEBUG'
+# @para     json_format - True for one JSON object per line, False for human-readable lines
+# @para     stream - Output stream, stderr by default
+# @return   logging.Handler - Installed handler
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def configure_logging(level=logging.INFO, json_format=False, stream=None):
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT))
+
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [handler]
+    root_logger.setLevel(level)
+    return handler
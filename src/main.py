@@ -3,47 +3,68 @@
 # @author       criticalEntropy
 # @date         30.12.2022
 #############################################################
+import os
 import sys
-import ctypes
-import time
-from sms_interface import SmsHandling
-from btc_parser import BtcAddressMonitoring
+from address_clustering import AddressClusters
+from alert_dispatcher import AlertDispatcher
+from logging_config import configure_logging
+from metrics import start_metrics_server
+from mempool_analytics import MempoolAnalytics
+from mempool_monitoring import TX_DIRECTION
+from watcher_service import WatcherService
+from watcher_state import WatcherStateStore
 
 # Define Constants
-CHECK_INTERVAL_SECONDS = 30
-SATOSHI_FIRST_ADDRESS = '1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa'
+WATCHLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'watchlist.txt')
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'watcher_state.sqlite')
+CLUSTERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'address_clusters.bin')
 OWN_PHONE_NUMBER = '+4912345678900'
-SMS_MESSAGE_TEXT = 'Attention, Satoshi has made a transaction!'
+SMS_MESSAGE_TEXT = 'Attention, {address} has {action} {amount} BTC in transaction {tx_hash}!'
+SATOSHI_PER_BTC = 100000000
 
 
 def main():
-    transaction_occurred = False
-
     # Check if the script is running as an administrator
     # This is important because in case of no admin rights the environment variables for API access cannot be read
-    # It should be noted that this code works for a Windows machine
-    if not ctypes.windll.shell32.IsUserAnAdmin():
-        # Restart the script with administrator privileges
-        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
-    else:
-        # Check the memory pool as long as no transaction was sent from the genesis address
-        while not transaction_occurred:
-            # Check the memory pool every CHECK_INTERVAL_SECONDS seconds
-            time.sleep(CHECK_INTERVAL_SECONDS)
-            try:
-                # Check if a transaction was sent from the address to be monitored
-                transaction_occurred = BtcAddressMonitoring(SATOSHI_FIRST_ADDRESS).is_tx_transaction_from_btc_address()
-            except Exception as err:
-                # Handle any exceptions that may occur
-                print('An error occurred while checking the BTC address transaction status:', err)
-
-        # When the loop is exited, a transaction was sent from the address to be monitored.
-        # In this case an SMS should be sent
-        try:
-            SmsHandling(OWN_PHONE_NUMBER, OWN_PHONE_NUMBER, SMS_MESSAGE_TEXT).send_sms_via_nexmo()
-        except Exception as err:
-            # Handle any exceptions that may occur
-            print('An error occurred while sending the SMS:', err)
+    # It should be noted that this is only needed on a Windows machine, other systems start the watcher directly
+    if os.name == 'nt':
+        import ctypes
+
+        if not ctypes.windll.shell32.IsUserAnAdmin():
+            # Restart the script with administrator privileges
+            ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
+            return
+
+    # Log to stderr, serve the metrics on http://127.0.0.1:9464/metrics and the statistics of the
+    # memory pool over the last 1, 5 and 60 minutes on http://127.0.0.1:9464/mempool
+    configure_logging()
+    mempool_analytics = MempoolAnalytics()
+    start_metrics_server(json_endpoints={'/mempool': mempool_analytics.get_statistics})
+
+    # The seen transactions and sent alerts survive a restart, so nothing is alerted twice
+    state_store = WatcherStateStore(STATE_PATH)
+
+    # The watched addresses are expanded to their wallets if clusters of a block scan were saved
+    address_clusters = AddressClusters.load(CLUSTERS_PATH) if os.path.exists(CLUSTERS_PATH) else None
+
+    # The watcher polls the memory pool in its own thread and keeps running after an alert
+    watcher = WatcherService(WATCHLIST_PATH, state_store=state_store, address_clusters=address_clusters,
+                             mempool_analytics=mempool_analytics)
+    watcher.start()
+
+    # The dispatcher sends the SMS in its own thread, coalesced per recipient and rate limited
+    alert_dispatcher = AlertDispatcher(OWN_PHONE_NUMBER, state_store=state_store)
+    alert_dispatcher.start()
+
+    # Submit an SMS for every event of a watched address, an event is alerted only once
+    while True:
+        event = watcher.event_queue.get()
+        action = 'sent' if event.direction == TX_DIRECTION else 'received'
+        amount = '?' if event.amount is None else f"{event.amount / SATOSHI_PER_BTC:.8f}"
+        message_text = SMS_MESSAGE_TEXT.format(address=event.address, action=action, amount=amount,
+                                               tx_hash=event.tx_hash)
+        alert_dispatcher.submit(OWN_PHONE_NUMBER, message_text,
+                                dedup_key=(event.tx_hash, event.address, event.direction), tx_hash=event.tx_hash)
 
 
 if __name__ == "__main__":
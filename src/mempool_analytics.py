@@ -0,0 +1,255 @@
+#############################################################
+# @file     mempool_analytics.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://en.wikipedia.org/wiki/Moving_average
+#           https://en.wikipedia.org/wiki/Standard_score
+# Hint:     Live statistics of the memory pool over sliding windows (1, 5 and 60 minutes by
+#           default): arrival rate, value in flight, top sending and receiving addresses and
+#           large-value outliers. Every window keeps its transactions in a bounded ring buffer
+#           and its aggregates as running sums, a new transaction is added to the sums and an
+#           expired one is subtracted again. A poll therefore costs time proportional to its
+#           new and expired transactions, not to the size of the windows.
+#############################################################
+# Import packages
+import heapq
+import math
+import threading
+import time
+from collections import deque, namedtuple
+
+from metrics import MEMPOOL_ARRIVAL_RATE, MEMPOOL_WINDOW_TRANSACTIONS, MEMPOOL_WINDOW_VALUE
+from transaction_flow import get_address_flows
+
+# Define Constants
+WINDOW_SECONDS = (60, 300, 3600)
+
+# Transactions per window, the oldest transactions are evicted early if a window is full
+MAX_WINDOW_TRANSACTIONS = 200000
+
+# A transaction is an outlier if its log value is this many standard deviations above the mean of the window
+OUTLIER_SIGMAS = 3.0
+MIN_OUTLIER_SAMPLES = 30
+MAX_REPORTED_ADDRESSES = 10
+
+# Transaction of a window
+#   -> arrival_time - Time in seconds since the epoch of the poll that found the transaction
+#   -> tx_hash - Hash of the transaction
+#   -> value - Sum of the outputs in *10^-8 btc
+#   -> sent - (address, amount) tuples of the paying addresses
+#   -> received - (address, amount) tuples of the receiving addresses
+WindowTransaction = namedtuple('WindowTransaction', ['arrival_time', 'tx_hash', 'value', 'sent', 'received'])
+
+# Large-value outlier of a window
+#   -> arrival_time - Time in seconds since the epoch of the poll that found the transaction
+#   -> tx_hash - Hash of the transaction
+#   -> value - Sum of the outputs in *10^-8 btc
+#   -> score - Standard deviations of the log value above the mean of the window at arrival
+OutlierTransaction = namedtuple('OutlierTransaction', ['arrival_time', 'tx_hash', 'value', 'score'])
+
+
+class MempoolWindow:
+    # Constructor
+    # window_seconds   - Length of the window
+    # max_transactions - Capacity of the ring buffer
+    def __init__(self, window_seconds, max_transactions=MAX_WINDOW_TRANSACTIONS):
+        self.window_seconds = window_seconds
+        self.transactions = deque()
+        self.max_transactions = max_transactions
+
+        # Running aggregates, updated on every add and evict. The address sums are [amount, count]
+        # lists, an address is removed with its last transaction in the window.
+        self.total_value = 0
+        self.sent_by_address = {}
+        self.received_by_address = {}
+        self.log_value_sum = 0.0
+        self.log_value_square_sum = 0.0
+        self.outliers = deque()
+
+        # Time of the first transaction, the rate of a window that is not yet full is based on its age
+        self.start_time = None
+        self.dropped_transactions = 0
+
+    def __len__(self):
+        return len(self.transactions)
+
+    # Adds a transaction to the aggregates, a full ring buffer drops its oldest transaction
+    def add(self, transaction):
+        if len(self.transactions) >= self.max_transactions:
+            self._evict_oldest()
+            self.dropped_transactions += 1
+        if self.start_time is None:
+            self.start_time = transaction.arrival_time
+
+        # The outlier test compares with the window before the transaction
+        log_value = math.log10(max(transaction.value, 1))
+        score = self._get_score(log_value)
+        if score is not None and score >= OUTLIER_SIGMAS:
+            self.outliers.append(OutlierTransaction(transaction.arrival_time, transaction.tx_hash, transaction.value,
+                                                    round(score, 2)))
+
+        self.transactions.append(transaction)
+        self.total_value += transaction.value
+        self.log_value_sum += log_value
+        self.log_value_square_sum += log_value * log_value
+        _add_amounts(self.sent_by_address, transaction.sent, 1)
+        _add_amounts(self.received_by_address, transaction.received, 1)
+
+    # Removes the transactions that arrived before now - window_seconds
+    def evict(self, now):
+        min_time = now - self.window_seconds
+        while self.transactions and self.transactions[0].arrival_time < min_time:
+            self._evict_oldest()
+        while self.outliers and self.outliers[0].arrival_time < min_time:
+            self.outliers.popleft()
+
+    #############################################################
+    # @brief    This function returns the statistics of the window. The sums are read from the
+    #           running aggregates, only the top addresses are selected from the address sums.
+    #
+    # @para     now - Current time in seconds since the epoch
+    # @return   dict - Statistics of the window, amounts in *10^-8 btc
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_statistics(self, now):
+        return {
+            'window_seconds': self.window_seconds,
+            'transaction_count': len(self.transactions),
+            'arrival_rate': self.get_arrival_rate(now),
+            'total_value': self.total_value,
+            'top_senders': _get_top_addresses(self.sent_by_address),
+            'top_receivers': _get_top_addresses(self.received_by_address),
+            'outliers': [outlier._asdict() for outlier in
+                         heapq.nlargest(MAX_REPORTED_ADDRESSES, self.outliers, key=lambda outlier: outlier.value)]
+        }
+
+    # Returns the transactions per second, a window that is not yet full is averaged over its age
+    def get_arrival_rate(self, now):
+        elapsed_seconds = self.window_seconds
+        if self.start_time is not None:
+            elapsed_seconds = min(self.window_seconds, max(now - self.start_time, 1.0))
+        return len(self.transactions) / elapsed_seconds
+
+    # Removes the oldest transaction from the aggregates
+    def _evict_oldest(self):
+        transaction = self.transactions.popleft()
+        log_value = math.log10(max(transaction.value, 1))
+        self.total_value -= transaction.value
+        self.log_value_sum -= log_value
+        self.log_value_square_sum -= log_value * log_value
+        _add_amounts(self.sent_by_address, transaction.sent, -1)
+        _add_amounts(self.received_by_address, transaction.received, -1)
+
+        # The float sums are reset with the empty window, so rounding errors do not accumulate
+        if not self.transactions:
+            self.log_value_sum = self.log_value_square_sum = 0.0
+
+    # Returns the standard score of a log value in the window, None for too few transactions
+    def _get_score(self, log_value):
+        count = len(self.transactions)
+        if count < MIN_OUTLIER_SAMPLES:
+            return None
+        mean = self.log_value_sum / count
+        variance = max(self.log_value_square_sum / count - mean * mean, 0.0)
+        if variance == 0.0:
+            return None
+        return (log_value - mean) / math.sqrt(variance)
+
+
+class MempoolAnalytics:
+    # Constructor
+    # window_seconds - Lengths of the sliding windows
+    # clock          - Wall clock in seconds since the epoch
+    def __init__(self, window_seconds=WINDOW_SECONDS, max_transactions=MAX_WINDOW_TRANSACTIONS, clock=time.time):
+        self.windows = [MempoolWindow(seconds, max_transactions) for seconds in sorted(window_seconds)]
+        self.clock = clock
+
+        # The watcher adds the transactions while the metrics server reads the statistics
+        self._lock = threading.Lock()
+
+    #############################################################
+    # @brief    This function adds the new transactions of a poll to all windows and evicts the
+    #           expired ones. Each transaction is summarized once and shared by the windows.
+    #
+    # @para     transactions - New unconfirmed transactions in the format of the Blockchain.info API,
+    #                          e.g. of BtcWatchlistMonitoring.poll_new_transactions()
+    # @para     arrival_time - Time of the poll in seconds since the epoch, the clock if None
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transactions(self, transactions, arrival_time=None):
+        if arrival_time is None:
+            arrival_time = self.clock()
+
+        window_transactions = [_summarize_transaction(transaction, arrival_time) for transaction in transactions]
+        with self._lock:
+            for window in self.windows:
+                window.evict(arrival_time)
+                for window_transaction in window_transactions:
+                    window.add(window_transaction)
+            self._update_metrics(arrival_time)
+
+    # Returns the statistics of the window with the given length
+    def get_window(self, window_seconds):
+        now = self.clock()
+        with self._lock:
+            for window in self.windows:
+                if window.window_seconds == window_seconds:
+                    window.evict(now)
+                    return window.get_statistics(now)
+        raise KeyError(window_seconds)
+
+    # Returns the statistics of all windows, shortest first, e.g. for the '/mempool' endpoint of the metrics server
+    def get_statistics(self):
+        now = self.clock()
+        with self._lock:
+            for window in self.windows:
+                window.evict(now)
+            return {'time': now, 'windows': [window.get_statistics(now) for window in self.windows]}
+
+    # Updates the gauges of the windows
+    def _update_metrics(self, now):
+        for window in self.windows:
+            label = _format_window_label(window.window_seconds)
+            MEMPOOL_WINDOW_TRANSACTIONS.set(len(window), label)
+            MEMPOOL_WINDOW_VALUE.set(window.total_value, label)
+            MEMPOOL_ARRIVAL_RATE.set(window.get_arrival_rate(now), label)
+
+
+# Summarizes a transaction once for all windows
+def _summarize_transaction(transaction, arrival_time):
+    flows = get_address_flows(transaction)
+    return WindowTransaction(
+        arrival_time,
+        transaction.get("hash"),
+        sum(output_data.get("value", 0) for output_data in transaction.get("out", ())),
+        tuple((flow.address, flow.sent) for flow in flows if flow.input_count),
+        tuple((flow.address, flow.received) for flow in flows if flow.output_count)
+    )
+
+
+# Adds (sign 1) or subtracts (sign -1) amounts from the [amount, count] sums per address
+def _add_amounts(amount_by_address, amounts, sign):
+    for address, amount in amounts:
+        address_sum = amount_by_address.get(address)
+        if address_sum is None:
+            amount_by_address[address] = [amount, 1]
+        elif sign < 0 and address_sum[1] == 1:
+            del amount_by_address[address]
+        else:
+            address_sum[0] += sign * amount
+            address_sum[1] += sign
+
+
+# Returns the addresses with the largest sums as (address, amount) tuples
+def _get_top_addresses(amount_by_address):
+    top_items = heapq.nlargest(MAX_REPORTED_ADDRESSES, amount_by_address.items(), key=lambda item: item[1][0])
+    return [(address, amount) for address, (amount, _) in top_items]
+
+
+# Returns the metric label of a window, e.g. '5m'
+def _format_window_label(window_seconds):
+    if window_seconds % 60 == 0:
+        return f"{window_seconds // 60}m"
+    return f"{window_seconds}s"
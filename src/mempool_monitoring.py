@@ -0,0 +1,327 @@
+#############################################################
+# @file     mempool_monitoring.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.blockchain.com/explorer/api/blockchain_api
+#############################################################
+# Import packages
+import time
+from collections import OrderedDict
+
+from btc_parser import fetch_unconfirmed_transactions
+from metrics import WATCH_MATCHES, record_scan
+from transaction_flow import get_address_flows
+from watchlist_filter import CompactWatchlist
+
+# Define Constants
+TX_DIRECTION = 'tx'
+RX_DIRECTION = 'rx'
+MAX_SEEN_TRANSACTIONS = 200000
+MAX_MISSED_POLLS = 10
+
+
+class MempoolSnapshot:
+    # Constructor
+    def __init__(self, unconfirmed_transactions):
+        self.transactions = unconfirmed_transactions.get('txs', [])
+
+        # Hash indexes of every input and output address in the memory pool
+        self.input_addresses = set()
+        self.output_addresses = set()
+
+        self._build_address_index()
+
+    #############################################################
+    # @brief    This function downloads the memory pool once and returns it as a snapshot.
+    #
+    # @para     api_client - BtcApiClient to be used, the shared default client if None
+    # @para     data_source - ChainDataSource to be used instead of the Blockchain.info API
+    # @return   MempoolSnapshot - Snapshot of the memory pool or None if the API call failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def fetch(cls, api_client=None, data_source=None):
+        unconfirmed_transactions = fetch_unconfirmed_transactions(api_client, data_source)
+        if unconfirmed_transactions is None:
+            return None
+        return cls(unconfirmed_transactions)
+
+    #############################################################
+    # @brief    This function collects every input and output address of the unconfirmed
+    #           transactions in a set so that each check is a single O(1) lookup.
+    #           Inputs and outputs without an address (e.g. OP_RETURN outputs) are skipped.
+    #
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def _build_address_index(self):
+        start_time = time.perf_counter()
+        for transaction in self.transactions:
+            # Collect the addresses that have sent bitcoin
+            for input_data in transaction.get('inputs', ()):
+                prev_out = input_data.get('prev_out')
+                if prev_out and 'addr' in prev_out:
+                    self.input_addresses.add(prev_out['addr'])
+
+            # Collect the addresses that have received bitcoin
+            for output_data in transaction.get('out', ()):
+                if 'addr' in output_data:
+                    self.output_addresses.add(output_data['addr'])
+        record_scan('mempool', len(self.transactions), time.perf_counter() - start_time)
+
+    # Returns True if the address has sent bitcoin in an unconfirmed transaction
+    def is_input_address(self, address):
+        return address in self.input_addresses
+
+    # Returns True if the address has received bitcoin in an unconfirmed transaction
+    def is_output_address(self, address):
+        return address in self.output_addresses
+
+
+class MempoolTracker:
+    # Constructor
+    # max_seen_transactions bounds the memory of the tracker beyond the transactions of the current poll,
+    # max_missed_polls defines after how many polls without the transaction in the memory pool feed it
+    # counts as confirmed or dropped.
+    # A WatcherStateStore keeps the seen transactions across restarts.
+    def __init__(self, max_seen_transactions=MAX_SEEN_TRANSACTIONS, max_missed_polls=MAX_MISSED_POLLS,
+                 state_store=None):
+        self.max_seen_transactions = max_seen_transactions
+        self.max_missed_polls = max_missed_polls
+        self.state_store = state_store
+
+        # Transaction hash -> number of the poll in which the transaction was last seen
+        # The dictionary is kept in the order of the last sighting, so aged-out entries are at the front
+        self.seen_transactions = OrderedDict()
+        self.poll_count = 0
+
+        # Number of transactions of the last poll, i.e. the size of the memory pool feed
+        self.last_poll_size = 0
+
+    #############################################################
+    # @brief    This function compares the unconfirmed transactions of a poll with the transaction
+    #           hashes that are already known and returns only the newly appeared transactions.
+    #           Known transactions are only touched by a hash lookup, so the parsing and matching
+    #           work of a polling cycle scales with the churn of the memory pool, not with its size.
+    #           Transactions that have not been seen for max_missed_polls polls are evicted.
+    #           With a state store the hashes that are unknown to the tracker are looked up in the
+    #           store, e.g. after a restart. The new hashes are not recorded in the store here, the
+    #           caller records them with record_seen_transactions() once they are handled, so a
+    #           crash before the alert is delivered reports the transaction again.
+    #
+    # @para     transactions - List of unconfirmed transactions ('txs' of the API response)
+    # @return   list - Transactions that were not seen in a previous poll
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_new_transactions(self, transactions):
+        start_time = time.perf_counter()
+        self.poll_count += 1
+        self.last_poll_size = len(transactions)
+        new_transactions = []
+
+        # Only the hashes the tracker does not know are looked up, i.e. the churn or the first poll after a restart
+        stored_hashes = set()
+        if self.state_store is not None:
+            stored_hashes = self.state_store.get_known_transactions(
+                transaction['hash'] for transaction in transactions
+                if transaction.get('hash') is not None and transaction['hash'] not in self.seen_transactions)
+
+        for transaction in transactions:
+            tx_hash = transaction.get('hash')
+            if tx_hash is None:
+                continue
+
+            if tx_hash in self.seen_transactions:
+                # Refresh the sighting of a known transaction
+                self.seen_transactions.move_to_end(tx_hash)
+            elif tx_hash not in stored_hashes:
+                new_transactions.append(transaction)
+            self.seen_transactions[tx_hash] = self.poll_count
+
+        self._evict_aged_out_transactions()
+        record_scan('mempool_poll', len(transactions), time.perf_counter() - start_time)
+        return new_transactions
+
+    # Records the hashes of handled transactions in the state store, so they are not reported after a restart
+    def record_seen_transactions(self, tx_hashes):
+        tx_hashes = list(tx_hashes)
+        if self.state_store is not None and tx_hashes:
+            self.state_store.add_seen_transactions(tx_hashes)
+
+    # Removes confirmed or dropped transactions and keeps the tracker within its size limit.
+    # The transactions of the current poll are never evicted, otherwise a memory pool feed larger
+    # than the limit would report its oldest transactions as new in every poll.
+    def _evict_aged_out_transactions(self):
+        oldest_valid_poll = self.poll_count - self.max_missed_polls
+        while self.seen_transactions:
+            tx_hash, last_seen_poll = next(iter(self.seen_transactions.items()))
+            if last_seen_poll == self.poll_count:
+                break
+            if last_seen_poll > oldest_valid_poll and len(self.seen_transactions) <= self.max_seen_transactions:
+                break
+            del self.seen_transactions[tx_hash]
+
+    # Returns True if the transaction hash was already seen by the tracker
+    def is_known_transaction(self, tx_hash):
+        return tx_hash in self.seen_transactions
+
+
+class BtcWatchlistMonitoring:
+    # Constructor
+    # A ChainDataSource replaces the Blockchain.info API of the api_client, e.g. a local bitcoind.
+    # A CompactWatchlist is used as it is, every other iterable of addresses is converted to a set.
+    def __init__(self, watch_addresses, mempool_tracker=None, api_client=None, data_source=None):
+        self.watch_addresses = (watch_addresses if isinstance(watch_addresses, CompactWatchlist)
+                                else set(watch_addresses))
+        self.api_client = api_client
+        self.data_source = data_source
+
+        self.mempool_snapshot = None
+        self.mempool_tracker = mempool_tracker if mempool_tracker is not None else MempoolTracker()
+
+    #############################################################
+    # @brief    This function downloads the memory pool once for all watched addresses.
+    #           It needs to be called once per polling cycle before the checks are made.
+    #
+    # @return   boolean - Was the memory pool retrieved successfully?
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def update_mempool_snapshot(self):
+        mempool_snapshot = MempoolSnapshot.fetch(self.api_client, self.data_source)
+        if mempool_snapshot is None:
+            return False
+
+        self.mempool_snapshot = mempool_snapshot
+        return True
+
+    #############################################################
+    # @brief    This function returns 'True' in case of an unconfirmed Tx-transaction
+    #           of a watched address in the current memory pool snapshot.
+    #
+    # @para     address - Watched address to be checked
+    # @return   boolean - BTC sent from the address?
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def is_tx_transaction_from_btc_address(self, address):
+        if self.mempool_snapshot is None:
+            return False
+        return self.mempool_snapshot.is_input_address(address)
+
+    #############################################################
+    # @brief    This function returns 'True' in case of an unconfirmed Rx-transaction
+    #           of a watched address in the current memory pool snapshot.
+    #
+    # @para     address - Watched address to be checked
+    # @return   boolean - BTC received by the address?
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def is_rx_transaction_to_btc_address(self, address):
+        if self.mempool_snapshot is None:
+            return False
+        return self.mempool_snapshot.is_output_address(address)
+
+    #############################################################
+    # @brief    This function returns all watched addresses that have sent bitcoin
+    #           in the current memory pool snapshot.
+    #           The smaller of the two sets is iterated, so the cost is bounded by
+    #           min(len(watchlist), len(mempool addresses)). A CompactWatchlist always checks
+    #           the memory pool addresses, most of them are rejected by its Bloom filter.
+    #
+    # @return   set - Watched addresses with an unconfirmed Tx-transaction
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_tx_transaction_addresses(self):
+        if self.mempool_snapshot is None:
+            return set()
+        return self.watch_addresses.intersection(self.mempool_snapshot.input_addresses)
+
+    #############################################################
+    # @brief    This function returns all watched addresses that have received bitcoin
+    #           in the current memory pool snapshot.
+    #
+    # @return   set - Watched addresses with an unconfirmed Rx-transaction
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_rx_transaction_addresses(self):
+        if self.mempool_snapshot is None:
+            return set()
+        return self.watch_addresses.intersection(self.mempool_snapshot.output_addresses)
+
+    #############################################################
+    # @brief    This function polls the memory pool and matches only the transactions that
+    #           newly appeared since the last poll against the watchlist.
+    #           Each event is therefore reported exactly once per transaction instead of
+    #           on every poll while the transaction is waiting in the memory pool.
+    #
+    # @return   list - Events as (tx_hash, address, direction) tuples
+    #                   -> direction is TX_DIRECTION for sent and RX_DIRECTION for received bitcoin
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_new_transaction_events(self):
+        new_transactions = self.poll_new_transactions()
+        if new_transactions is None:
+            return []
+
+        events = []
+        for transaction in new_transactions:
+            events.extend(self.get_transaction_events(transaction))
+        return events
+
+    #############################################################
+    # @brief    This function polls the memory pool and returns the transactions that newly
+    #           appeared since the last poll.
+    #
+    # @return   list - New unconfirmed transactions or None if the API call failed
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def poll_new_transactions(self):
+        # The transactions known to the tracker are only needed by their hash, so a data source that
+        # requests every transaction separately (bitcoind) only requests the new ones
+        unconfirmed_transactions = fetch_unconfirmed_transactions(self.api_client, self.data_source,
+                                                                  self.mempool_tracker.seen_transactions)
+        if unconfirmed_transactions is None:
+            return None
+        return self.mempool_tracker.get_new_transactions(unconfirmed_transactions.get('txs', []))
+
+    # Matches a transaction against the watchlist and returns its (tx_hash, address, direction) events
+    def get_transaction_events(self, transaction):
+        flows = self.get_transaction_flows(transaction)
+        if not flows:
+            return []
+
+        # Each address is reported once per direction
+        return ([(flow.tx_hash, flow.address, TX_DIRECTION) for flow in flows if flow.input_count] +
+                [(flow.tx_hash, flow.address, RX_DIRECTION) for flow in flows if flow.output_count])
+
+    #############################################################
+    # @brief    This function matches all inputs and outputs of a transaction against the
+    #           watchlist in a single pass and sums the amounts per watched address.
+    #
+    # @para     transaction - Transaction in the format of the Blockchain.info API
+    # @return   list - AddressFlow per watched address of the transaction
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_transaction_flows(self, transaction):
+        flows = get_address_flows(transaction, self.watch_addresses)
+
+        # Only matches are counted, so the metrics cost nothing for the transactions without match
+        if not flows:
+            return flows
+
+        sender_count = sum(1 for flow in flows if flow.input_count)
+        receiver_count = sum(1 for flow in flows if flow.output_count)
+        if sender_count:
+            WATCH_MATCHES.inc(TX_DIRECTION, amount=sender_count)
+        if receiver_count:
+            WATCH_MATCHES.inc(RX_DIRECTION, amount=receiver_count)
+        return flows
@@ -0,0 +1,292 @@
+#############################################################
+# @file     metrics.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://prometheus.io/docs/instrumenting/exposition_formats/
+# Hint:     Minimal metrics registry in the Prometheus text format without a client library.
+#           The metrics are recorded once per request, poll or block, never per transaction,
+#           so the instrumentation adds a few lock acquisitions per API call to the scanning loop.
+#           The metrics can be scraped from a local HTTP endpoint (start_metrics_server()) or
+#           passed to any exporter with MetricsRegistry.collect(). The same server can serve
+#           further JSON endpoints, e.g. the statistics of the memory pool analytics.
+#############################################################
+# Import packages
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Define Constants
+METRICS_PORT = 9464
+METRICS_PATH = '/metrics'
+
+# Upper bounds in seconds of the latency buckets, from 1 ms up to the request timeout
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    # Constructor
+    # name        - Metric name, e.g. 'btc_api_requests_total'
+    # description - Help text of the metric
+    # label_names - Names of the labels, the values are passed positionally to inc()
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.metric_type = 'counter'
+
+        # Tuple of label values -> value
+        self._values = {}
+        self._lock = threading.Lock()
+
+    # Increases the counter of the label values by amount
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    # Returns the value of the label values
+    def get(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    # Returns the samples as (suffix, label values, value) tuples
+    def collect(self):
+        with self._lock:
+            return [('', label_values, value) for label_values, value in self._values.items()]
+
+
+class Gauge(Counter):
+    # Constructor
+    # A gauge is a counter that can also be set or decreased
+    def __init__(self, name, description, label_names=()):
+        super().__init__(name, description, label_names)
+        self.metric_type = 'gauge'
+
+    # Sets the gauge of the label values
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram:
+    # Constructor
+    # buckets - Sorted upper bounds of the buckets, an infinite bucket is added
+    def __init__(self, name, description, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.metric_type = 'histogram'
+
+        # Tuple of label values -> [bucket counts, sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    # Records an observation of the label values
+    def observe(self, value, *label_values):
+        # Only the bucket of the value is counted, the cumulative counts are built when collected
+        bucket_index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bucket_index] += 1
+            state[1] += value
+            state[2] += 1
+
+    # Measures the duration of the with-block
+    @contextmanager
+    def time(self, *label_values):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time, *label_values)
+
+    # Returns (count, sum) of the label values
+    def get(self, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            return (0, 0.0) if state is None else (state[2], state[1])
+
+    # Returns the samples as (suffix, label values, value) tuples, the bucket bound is the last label value
+    def collect(self):
+        samples = []
+        with self._lock:
+            for label_values, (bucket_counts, value_sum, count) in self._values.items():
+                cumulative_count = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                    cumulative_count += bucket_count
+                    samples.append(('_bucket', label_values + (_format_value(bound),), cumulative_count))
+                samples.append(('_sum', label_values, value_sum))
+                samples.append(('_count', label_values, count))
+        return samples
+
+
+class MetricsRegistry:
+    # Constructor
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    # Registers a metric, a metric with the same name is returned instead of being registered twice
+    def register(self, metric):
+        with self._lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    # Creates and registers a counter
+    def counter(self, name, description, label_names=()):
+        return self.register(Counter(name, description, label_names))
+
+    # Creates and registers a gauge
+    def gauge(self, name, description, label_names=()):
+        return self.register(Gauge(name, description, label_names))
+
+    # Creates and registers a histogram
+    def histogram(self, name, description, label_names=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, description, label_names, buckets))
+
+    #############################################################
+    # @brief    This function collects the samples of all metrics, e.g. for a custom exporter.
+    #
+    # @return   list - (metric, list of (suffix, label values, value) tuples) tuples
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def collect(self):
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return [(metric, metric.collect()) for metric in metrics]
+
+    #############################################################
+    # @brief    This function renders all metrics in the Prometheus text exposition format.
+    #
+    # @return   str - Metrics in the Prometheus text format
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def render(self):
+        lines = []
+        for metric, samples in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for suffix, label_values, value in samples:
+                label_names = metric.label_names + (('le',) if suffix == '_bucket' else ())
+                labels = ','.join(f'{name}="{_escape_label(label_value)}"'
+                                  for name, label_value in zip(label_names, label_values))
+                lines.append(f"{metric.name}{suffix}{{{labels}}} {_format_value(value)}" if labels
+                             else f"{metric.name}{suffix} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# Registry of the metrics of this package
+REGISTRY = MetricsRegistry()
+
+# Metrics of the API client, the endpoint is the first path segment of the request, e.g. '/rawblock'
+API_REQUEST_SECONDS = REGISTRY.histogram('btc_api_request_seconds', 'Duration of the API requests',
+                                         ('endpoint',))
+API_RESPONSE_BYTES = REGISTRY.counter('btc_api_response_bytes_total', 'Bytes of the API responses', ('endpoint',))
+API_DECODE_SECONDS = REGISTRY.histogram('btc_api_decode_seconds', 'Duration of the JSON decoding', ('endpoint',))
+API_ERRORS = REGISTRY.counter('btc_api_errors_total', 'Failed API requests', ('endpoint', 'error'))
+API_RETRIES = REGISTRY.counter('btc_api_retries_total', 'Retried API requests', ('endpoint',))
+
+# Metrics of the scanning loops
+TRANSACTIONS_SCANNED = REGISTRY.counter('btc_transactions_scanned_total', 'Transactions scanned', ('scan',))
+SCAN_SECONDS = REGISTRY.counter('btc_scan_seconds_total', 'Time spent scanning transactions', ('scan',))
+WATCH_MATCHES = REGISTRY.counter('btc_watch_matches_total', 'Transactions matching a watched address',
+                                 ('direction',))
+
+# Metrics of the memory pool analytics, the window is its length, e.g. '5m'
+MEMPOOL_WINDOW_TRANSACTIONS = REGISTRY.gauge('btc_mempool_window_transactions', 'New transactions in the window',
+                                             ('window',))
+MEMPOOL_WINDOW_VALUE = REGISTRY.gauge('btc_mempool_window_value_satoshi', 'Output value of the new transactions '
+                                      'in the window', ('window',))
+MEMPOOL_ARRIVAL_RATE = REGISTRY.gauge('btc_mempool_arrival_rate', 'New transactions per second in the window',
+                                      ('window',))
+
+
+#############################################################
+# @brief    This function returns the endpoint label of an API path.
+#           Only the first path segment is used, so the number of label values stays small.
+#
+# @para     path - API path, e.g. '/rawaddr/1A1z...?limit=50'
+# @return   str - Endpoint, e.g. '/rawaddr'
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_endpoint_label(path):
+    return '/' + path.lstrip('/').split('?', 1)[0].split('/', 1)[0]
+
+
+# Records the number of transactions and the duration of a scan, the throughput is their ratio
+def record_scan(scan, transaction_count, seconds):
+    TRANSACTIONS_SCANNED.inc(scan, amount=transaction_count)
+    SCAN_SECONDS.inc(scan, amount=seconds)
+
+
+# Request handler of the metrics server, combined with BaseHTTPRequestHandler when a server is started,
+# so http.server is only imported by the processes that serve the metrics
+class _MetricsRequestHandler:
+    registry = REGISTRY
+
+    # Path -> function that returns the JSON-serializable content of the endpoint
+    json_endpoints = {}
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == METRICS_PATH:
+            body = self.registry.render().encode()
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif path in self.json_endpoints:
+            body = json.dumps(self.json_endpoints[path]()).encode()
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # The scrapes are not logged
+    def log_message(self, format, *args):
+        pass
+
+
+#############################################################
+# @brief    This function serves the metrics on a local HTTP endpoint in a daemon thread.
+#
+# @para     port - TCP port, 0 for a free port
+# @para     host - Interface, only the local host by default
+# @para     registry - MetricsRegistry to be served
+# @para     json_endpoints - Dictionary path -> function returning the content of a further JSON endpoint
+# @return   ThreadingHTTPServer - Running server, server_address holds the port, shutdown() stops it
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def start_metrics_server(port=METRICS_PORT, host='127.0.0.1', registry=REGISTRY, json_endpoints=None):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type('MetricsRequestHandler', (_MetricsRequestHandler, BaseHTTPRequestHandler),
+                   {'registry': registry, 'json_endpoints': dict(json_endpoints or {})})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics_server', daemon=True).start()
+    return server
+
+
+# Escapes a label value of the text format
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Formats a value of the text format
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
@@ -0,0 +1,333 @@
+#############################################################
+# @file     scan_export.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://arrow.apache.org/docs/python/parquet.html
+#           https://arrow.apache.org/docs/python/ipc.html#efficiently-writing-and-reading-arrow-data
+# Hint:     Sinks that write the results of a scan to disk while the scan progresses. The rows are
+#           buffered in typed arrays and written as one row group (Parquet) or record batch
+#           (Arrow IPC) every row_group_size rows, so a backfill of millions of rows needs the
+#           memory of one chunk only. An Arrow IPC file is loaded back memory-mapped without
+#           copying the columns, iter_scan_batches() returns its numeric columns as NumPy views
+#           per record batch. Without pyarrow the rows are written as CSV.
+#           One row per input (sent) and output (received) of a transaction:
+#           block_height | tx_hash | address | direction | value
+#############################################################
+# Import packages
+import csv
+from abc import ABC, abstractmethod
+from array import array
+
+import numpy as np
+
+from transaction_table import RX_DIRECTION_CODE, TX_DIRECTION_CODE
+
+# pyarrow is optional, the rows are written as CSV if it is not installed
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Define Constants
+EXPORT_FORMATS = ('parquet', 'arrow', 'csv')
+FORMAT_EXTENSIONS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow', '.csv': 'csv'}
+ROW_GROUP_SIZE = 100000
+PARQUET_COMPRESSION = 'zstd'
+
+# Columns of an export, unknown block heights are -1 and outputs without address (OP_RETURN) have no address
+EXPORT_COLUMNS = ('block_height', 'tx_hash', 'address', 'direction', 'value')
+
+# Magic bytes at the start of a Parquet and an Arrow IPC file
+PARQUET_MAGIC = b'PAR1'
+ARROW_MAGIC = b'ARROW1'
+
+
+#############################################################
+# @brief    This function returns the best available export format.
+#
+# @return   str - 'parquet' if pyarrow is installed, otherwise 'csv'
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_default_export_format():
+    return 'parquet' if pyarrow is not None else 'csv'
+
+
+#############################################################
+# @brief    This function opens a sink for the rows of a scan. The format is taken from the
+#           file extension ('.parquet', '.arrow', '.csv'), the best available format is used
+#           for other extensions.
+#
+# @para     export_path - Path of the export file
+# @para     export_format - 'parquet', 'arrow' or 'csv' instead of the file extension
+# @para     row_group_size - Rows per row group or record batch, i.e. rows held in memory
+# @return   ScanSink - Open sink, to be closed or used as context manager
+# @raise    ValueError - Unknown format or pyarrow not installed for 'parquet' and 'arrow'
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def open_scan_sink(export_path, export_format=None, row_group_size=ROW_GROUP_SIZE):
+    if export_format is None:
+        extension = '.' + export_path.rsplit('.', 1)[-1].lower() if '.' in export_path else ''
+        export_format = FORMAT_EXTENSIONS.get(extension, get_default_export_format())
+
+    if export_format == 'csv':
+        return CsvScanSink(export_path, row_group_size)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}'")
+    if pyarrow is None:
+        raise ValueError(f"The export format '{export_format}' needs pyarrow, which is not installed")
+    if export_format == 'parquet':
+        return ParquetScanSink(export_path, row_group_size)
+    return ArrowScanSink(export_path, row_group_size)
+
+
+class ScanSink(ABC):
+    # Constructor
+    # Use open_scan_sink() instead, the subclasses write the chunks in their format
+    def __init__(self, export_path, row_group_size=ROW_GROUP_SIZE):
+        self.export_path = export_path
+        self.row_group_size = row_group_size
+
+        # Number of added rows, written or buffered
+        self.row_count = 0
+        self._clear_chunk()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Appends one row, a full chunk is written
+    def add_row(self, block_height, tx_hash, address, direction, value):
+        self._block_height_column.append(-1 if block_height is None else block_height)
+        self._tx_hash_column.append(tx_hash)
+        self._address_column.append(address)
+        self._direction_column.append(direction)
+        self._value_column.append(value)
+        self.row_count += 1
+        if len(self._value_column) >= self.row_group_size:
+            self.flush()
+
+    #############################################################
+    # @brief    This function appends a sent row per input and a received row per output of a
+    #           transaction. Coinbase inputs are skipped.
+    #
+    # @para     block_height - Height of the block, None for unconfirmed transactions
+    # @para     tx - Transaction in the format of the Blockchain.info API
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transaction(self, block_height, tx):
+        tx_hash = tx.get("hash")
+        for input_data in tx.get("inputs", ()):
+            prev_out = input_data.get("prev_out")
+            if prev_out:
+                self.add_row(block_height, tx_hash, prev_out.get("addr"), TX_DIRECTION_CODE, prev_out.get("value", 0))
+        for output_data in tx.get("out", ()):
+            self.add_row(block_height, tx_hash, output_data.get("addr"), RX_DIRECTION_CODE, output_data.get("value", 0))
+
+    # Appends the rows of all transactions of a block
+    def add_block(self, block_num, block_data):
+        for tx in block_data.get("tx", ()):
+            self.add_transaction(block_data.get("height", block_num), tx)
+
+    # Appends the rows of a CoinJoinCandidate of BtcBlockMonitoring.iter_mixed_btc_transactions_from_btc_blocks()
+    def add_candidate(self, candidate):
+        for sender_address, amount in candidate.inputs:
+            self.add_row(candidate.block_num, candidate.tx_hash, sender_address, TX_DIRECTION_CODE, amount)
+        for recipient_address, amount in candidate.outputs:
+            self.add_row(candidate.block_num, candidate.tx_hash, recipient_address, RX_DIRECTION_CODE, amount)
+
+    # Writes the buffered rows as one chunk
+    def flush(self):
+        if not self._value_column:
+            return
+        self._write_chunk()
+        self._clear_chunk()
+
+    # Writes the remaining rows and closes the file
+    def close(self):
+        self.flush()
+        self._close_file()
+
+    # Returns the buffered rows as NumPy and Python columns
+    def _get_chunk_columns(self):
+        return (np.frombuffer(self._block_height_column, dtype=np.int64), self._tx_hash_column,
+                self._address_column, np.frombuffer(self._direction_column, dtype=np.int8),
+                np.frombuffer(self._value_column, dtype=np.int64))
+
+    def _clear_chunk(self):
+        self._block_height_column = array('q')
+        self._tx_hash_column = []
+        self._address_column = []
+        self._direction_column = array('b')
+        self._value_column = array('q')
+
+    # Writes the buffered rows in the format of the sink
+    @abstractmethod
+    def _write_chunk(self):
+        pass
+
+    # Closes the export file
+    @abstractmethod
+    def _close_file(self):
+        pass
+
+
+class CsvScanSink(ScanSink):
+    # Constructor
+    # The header is written immediately, a missing address is an empty field
+    def __init__(self, export_path, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(export_path, row_group_size)
+        self._file = open(export_path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_COLUMNS)
+
+    def _write_chunk(self):
+        self._writer.writerows(zip(self._block_height_column, self._tx_hash_column, self._address_column,
+                                   self._direction_column, self._value_column))
+
+    def _close_file(self):
+        self._file.close()
+
+
+class ParquetScanSink(ScanSink):
+    # Constructor
+    # Every chunk becomes one row group of the Parquet file
+    def __init__(self, export_path, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(export_path, row_group_size)
+        self._writer = pyarrow.parquet.ParquetWriter(export_path, get_export_schema(),
+                                                     compression=PARQUET_COMPRESSION)
+
+    def _write_chunk(self):
+        self._writer.write_table(pyarrow.Table.from_batches([_create_record_batch(self._get_chunk_columns())]))
+
+    def _close_file(self):
+        self._writer.close()
+
+
+class ArrowScanSink(ScanSink):
+    # Constructor
+    # Every chunk becomes one record batch of the Arrow IPC file, the file is uncompressed for memory-mapped reads
+    def __init__(self, export_path, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(export_path, row_group_size)
+        self._file = pyarrow.OSFile(export_path, 'wb')
+        self._writer = pyarrow.ipc.new_file(self._file, get_export_schema())
+
+    def _write_chunk(self):
+        self._writer.write_batch(_create_record_batch(self._get_chunk_columns()))
+
+    def _close_file(self):
+        self._writer.close()
+        self._file.close()
+
+
+# Returns the Arrow schema of an export
+def get_export_schema():
+    return pyarrow.schema([
+        ('block_height', pyarrow.int64()),
+        ('tx_hash', pyarrow.string()),
+        ('address', pyarrow.string()),
+        ('direction', pyarrow.int8()),
+        ('value', pyarrow.int64())
+    ])
+
+
+#############################################################
+# @brief    This function reads a Parquet or Arrow IPC export as pyarrow.Table. An Arrow IPC
+#           file is memory-mapped, its columns reference the mapped file without a copy.
+#
+# @para     export_path - Path of the export file
+# @return   pyarrow.Table - Rows of the export
+# @raise    ValueError - pyarrow not installed or the file is a CSV export
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def read_scan_table(export_path):
+    if pyarrow is None:
+        raise ValueError("Reading an export as table needs pyarrow, which is not installed")
+
+    export_format = get_export_format(export_path)
+    if export_format == 'parquet':
+        return pyarrow.parquet.read_table(export_path, memory_map=True)
+    if export_format == 'arrow':
+        with pyarrow.memory_map(export_path, 'r') as source:
+            return pyarrow.ipc.open_file(source).read_all()
+    raise ValueError(f"{export_path} is no Parquet or Arrow export")
+
+
+#############################################################
+# @brief    This function reads an export of any format as NumPy columns. The chunks of a
+#           Parquet or Arrow IPC export are concatenated, i.e. the columns are copied unless
+#           the export has a single chunk. iter_scan_batches() avoids the copy.
+#
+# @para     export_path - Path of the export file
+# @return   dict - Column name -> NumPy array, the hashes and addresses as object arrays
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def read_scan_columns(export_path):
+    if get_export_format(export_path) != 'csv':
+        table = read_scan_table(export_path)
+        return {name: table.column(name).to_numpy() for name in EXPORT_COLUMNS}
+
+    block_heights, tx_hashes, addresses, directions, values = columns = tuple([] for _ in EXPORT_COLUMNS)
+    with open(export_path, newline='') as export_file:
+        reader = csv.reader(export_file)
+        next(reader, None)
+        for row in reader:
+            for column, value in zip(columns, row):
+                column.append(value)
+    return {
+        'block_height': np.array(block_heights, dtype=np.int64),
+        'tx_hash': np.array(tx_hashes, dtype=object),
+        'address': np.array([address or None for address in addresses], dtype=object),
+        'direction': np.array(directions, dtype=np.int8),
+        'value': np.array(values, dtype=np.int64)
+    }
+
+
+#############################################################
+# @brief    This function reads an export chunk by chunk as NumPy columns, one dictionary per
+#           row group or record batch. The numeric columns of an Arrow IPC export are views of
+#           the memory-mapped file. A CSV export is returned as one chunk.
+#
+# @para     export_path - Path of the export file
+# @return   iterator - Column name -> NumPy array per chunk, the hashes and addresses as object arrays
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def iter_scan_batches(export_path):
+    if get_export_format(export_path) == 'csv':
+        yield read_scan_columns(export_path)
+        return
+
+    for batch in read_scan_table(export_path).to_batches():
+        yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in EXPORT_COLUMNS}
+
+
+# Returns the format of an export file by its magic bytes
+def get_export_format(export_path):
+    with open(export_path, 'rb') as export_file:
+        magic = export_file.read(len(ARROW_MAGIC))
+    if magic.startswith(PARQUET_MAGIC):
+        return 'parquet'
+    if magic == ARROW_MAGIC:
+        return 'arrow'
+    return 'csv'
+
+
+# Creates a record batch of the chunk columns
+def _create_record_batch(columns):
+    block_heights, tx_hashes, addresses, directions, values = columns
+    return pyarrow.RecordBatch.from_arrays([
+        pyarrow.array(block_heights, type=pyarrow.int64()),
+        pyarrow.array(tx_hashes, type=pyarrow.string()),
+        pyarrow.array(addresses, type=pyarrow.string()),
+        pyarrow.array(directions, type=pyarrow.int8()),
+        pyarrow.array(values, type=pyarrow.int64())
+    ], schema=get_export_schema())
@@ -4,9 +4,15 @@
 # @date     30.12.2022
 # Hints:    https://developer.vonage.com/messaging/sms/overview
 #############################################################
+import logging
 import os
 from nexmo import Client
 
+from alert_dispatcher import check_sms_response
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
 
 class SmsHandling:
     # Constructor
@@ -15,10 +21,6 @@ class SmsHandling:
         self.to_number = to_number
         self.message_text = message_text
 
-    # Destructor
-    def __del__(self):
-        print(f"Deleting SmsHandling object")
-
     #############################################################
     # @brief    This function sends an SMS from a mobile number to a mobile number with a defined text.
     #           Note that admin rights are required to read the environment variables for API access.
@@ -34,22 +36,69 @@ class SmsHandling:
     #############################################################
     def send_sms_via_nexmo(self):
         try:
-            # Replace with your Twilio account SID and auth token
-            api_key = os.environ['NEXMO_API_KEY']
-            api_secret = os.environ['NEXMO_API_SECRET']
-
-            # Create a Nexmo client
-            client = Client(key=api_key, secret=api_secret)
+            # The client is created once with the credentials of the environment and reused
+            client = get_nexmo_client()
 
             # Send the SMS
-            response = client.send_message({
+            response = check_sms_response(client.send_message({
                 'from': self.from_number,
                 'to': self.to_number,
                 'text': self.message_text
-            })
-            print(f"Sent message to number {response}")
+            }))
+            logger.info("Sent message to number %s", response)
             return True
         except Exception as err:
             # Handle any errors that occur
-            print(f"An error occurred: {err}")
+            logger.error("An error occurred: %s", err)
             return False
+
+
+class NexmoSmsBackend:
+    # Constructor
+    # Backend of the AlertDispatcher, without credentials the environment variables are read on first use
+    def __init__(self, api_key=None, api_secret=None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._client = None
+
+    #############################################################
+    # @brief    This function sends an SMS with the reused Nexmo client.
+    #
+    # @para     from_number - Cell phone number from which the SMS should be sent
+    # @para     to_number - Cell phone number to which the SMS should be sent
+    # @para     message_text - Message to be sent
+    # @return   dict - Response of the Nexmo API
+    # @raise    SmsRejectedError - The API rejected the SMS, e.g. throttled
+    #           Exception - The SMS could not be sent
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def send_message(self, from_number, to_number, message_text):
+        if self._client is None:
+            if self.api_key is None:
+                self._client = get_nexmo_client()
+            else:
+                self._client = Client(key=self.api_key, secret=self.api_secret)
+
+        response = self._client.send_message({'from': from_number, 'to': to_number, 'text': message_text})
+        return check_sms_response(response)
+
+
+# Client shared by all SmsHandling objects, created with the credentials of the environment on first use
+_nexmo_client = None
+
+
+#############################################################
+# @brief    This function returns the shared Nexmo client and creates it on first use.
+#           Note that admin rights are required to read the environment variables for API access.
+#
+# @return   Client - Shared Nexmo client
+# @raise    KeyError - NEXMO_API_KEY or NEXMO_API_SECRET is not set
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_nexmo_client():
+    global _nexmo_client
+    if _nexmo_client is None:
+        _nexmo_client = Client(key=os.environ['NEXMO_API_KEY'], secret=os.environ['NEXMO_API_SECRET'])
+    return _nexmo_client
@@ -0,0 +1,84 @@
+#############################################################
+# @file     transaction_flow.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.blockchain.com/explorer/api/blockchain_api
+# Hint:     Attribution of a transaction to all of its input and output addresses. Every input
+#           and output is visited once, the amounts are summed per address, so an address that
+#           pays from its second input or receives on its third output is not missed.
+#############################################################
+# Import packages
+from collections import namedtuple
+
+# Flow of bitcoin of one address in one transaction
+#   -> tx_hash - Hash of the transaction
+#   -> address - Bitcoin address
+#   -> sent - Sum of the inputs of the address in *10^-8 btc
+#   -> received - Sum of the outputs to the address in *10^-8 btc, change included
+#   -> net_flow - received - sent, negative if the address paid
+#   -> input_count - Number of inputs of the address
+#   -> output_count - Number of outputs to the address
+AddressFlow = namedtuple('AddressFlow', ['tx_hash', 'address', 'sent', 'received', 'net_flow', 'input_count',
+                                         'output_count'])
+
+
+#############################################################
+# @brief    This function sums the inputs and outputs of a transaction per address in a single
+#           pass. Inputs without previous output (coinbase) and outputs without address
+#           (OP_RETURN) are skipped, missing amounts count as 0.
+#
+# @para     tx - Transaction in the format of the Blockchain.info API
+# @para     addresses - Container of the addresses of interest (set, CompactWatchlist, ...), all if None
+# @return   list - AddressFlow per address, in the order of their first appearance
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def get_address_flows(tx, addresses=None):
+    if addresses is None:
+        addresses = _ANY_ADDRESS
+
+    # Address -> [sent, received, input count, output count]
+    flows = {}
+
+    # The membership test comes first, it rejects almost every address of a watchlist scan
+    for input_data in tx.get("inputs", ()):
+        prev_out = input_data.get("prev_out")
+        if not prev_out or prev_out.get("addr") not in addresses:
+            continue
+
+        address = prev_out["addr"]
+        flow = flows.get(address)
+        if flow is None:
+            flow = flows[address] = [0, 0, 0, 0]
+        flow[0] += prev_out.get("value", 0)
+        flow[2] += 1
+
+    for output_data in tx.get("out", ()):
+        address = output_data.get("addr")
+        if address not in addresses:
+            continue
+
+        flow = flows.get(address)
+        if flow is None:
+            flow = flows[address] = [0, 0, 0, 0]
+        flow[1] += output_data.get("value", 0)
+        flow[3] += 1
+
+    tx_hash = tx.get("hash")
+    return [AddressFlow(tx_hash, address, sent, received, received - sent, input_count, output_count)
+            for address, (sent, received, input_count, output_count) in flows.items()]
+
+
+class _AnyAddress:
+    # Container of all addresses, an input or output without address is not contained
+    def __contains__(self, address):
+        return address is not None
+
+
+_ANY_ADDRESS = _AnyAddress()
+
+
+# Returns the AddressFlow of one address in a transaction, None if the address is not part of it
+def get_address_flow(tx, address):
+    flows = get_address_flows(tx, (address,))
+    return flows[0] if flows else None
@@ -0,0 +1,298 @@
+#############################################################
+# @file     transaction_graph.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+#           https://en.bitcoin.it/wiki/Privacy#Taint_analysis
+# Hint:     Graph of the flows of bitcoin between addresses. Every transaction adds an edge from
+#           each paying address to each receiving address, the amount of a receiver is split
+#           over the payers in proportion to their inputs (haircut). Edges between the same two
+#           addresses are summed, change back to a paying address is no edge.
+#           The edges are stored in CSR arrays (address ids and satoshi weights in NumPy arrays,
+#           once by sender and once by receiver), so the neighbours of an address are one slice
+#           and a hop of a trace is a few vectorized operations over the whole frontier.
+#############################################################
+# Import packages
+import logging
+from array import array
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from transaction_flow import get_address_flows
+from transaction_table import AddressCodes, NO_ADDRESS_CODE
+
+# Define Constants
+FORWARD_DIRECTION = 'forward'
+BACKWARD_DIRECTION = 'backward'
+MAX_TRACE_HOPS = 5
+
+# Transactions with more payer-receiver pairs (large CoinJoins) are not added, their edges would not trace anything
+MAX_TRANSACTION_EDGES = 10000
+
+# Number of traces whose frontier is kept for a deeper trace of the same address
+MAX_CACHED_TRACES = 64
+
+# Address reached by a trace
+#   -> address - Bitcoin address
+#   -> hops - Number of edges from the traced address
+#   -> amount - Sum of the edges over which the address was reached from the previous hop in *10^-8 btc
+TracedAddress = namedtuple('TracedAddress', ['address', 'hops', 'amount'])
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+class TransactionGraphBuilder:
+    # Constructor
+    # The edges are appended to typed arrays, so an edge costs 16 bytes until the graph is built
+    def __init__(self, address_codes=None):
+        self.address_codes = address_codes if address_codes is not None else AddressCodes()
+
+        self._source_column = array('i')
+        self._target_column = array('i')
+        self._amount_column = array('q')
+
+        self.skipped_transactions = 0
+
+    # Returns the number of added edges, duplicates included
+    def get_edge_count(self):
+        return len(self._amount_column)
+
+    # Appends an edge, edges without address and from an address to itself are ignored
+    def add_edge(self, from_address, to_address, amount):
+        if from_address is None or to_address is None or from_address == to_address:
+            return
+        self._source_column.append(self.address_codes.encode(from_address))
+        self._target_column.append(self.address_codes.encode(to_address))
+        self._amount_column.append(amount)
+
+    #############################################################
+    # @brief    This function adds the edges of a transaction. Every payer gets an edge to every
+    #           receiver with the receiver's amount times the payer's share of the inputs.
+    #           Without input amounts (e.g. getblock verbosity 2) the amount is split equally.
+    #
+    # @para     tx - Transaction in the format of the Blockchain.info API
+    # @return   int - Number of added edges
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_transaction(self, tx):
+        flows = get_address_flows(tx)
+        payers = [(flow.address, flow.sent) for flow in flows if flow.input_count]
+        if not payers:
+            return 0
+
+        # An output to a paying address is change and no flow
+        receivers = [(flow.address, flow.received) for flow in flows if flow.output_count and not flow.input_count]
+        if len(payers) * len(receivers) > MAX_TRANSACTION_EDGES:
+            self.skipped_transactions += 1
+            logger.debug("Transaction %s with %d payers and %d receivers is not added to the graph", tx.get("hash"),
+                         len(payers), len(receivers))
+            return 0
+
+        total_sent = sum(sent for _, sent in payers)
+        for receiver_address, received in receivers:
+            for payer_address, sent in payers:
+                amount = received * sent // total_sent if total_sent else received // len(payers)
+                self.add_edge(payer_address, receiver_address, amount)
+        return len(payers) * len(receivers)
+
+    # Adds the edges of several transactions, e.g. a page of an address history
+    def add_transactions(self, txs):
+        for tx in txs:
+            self.add_transaction(tx)
+
+    # Adds the edges of all transactions of a block
+    def add_block(self, block_data):
+        self.add_transactions(block_data.get("tx", ()))
+
+    # Adds (from, to, amount) tuples as returned by BtcAddressMonitoring.get_transactions_from_btc_address()
+    def add_transaction_list(self, transaction_list):
+        for from_address, to_address, amount in transaction_list:
+            self.add_edge(from_address, to_address, amount)
+
+    # Returns the edges as TransactionGraph
+    def build(self):
+        return TransactionGraph.from_edges(
+            self.address_codes,
+            np.frombuffer(self._source_column, dtype=np.int32),
+            np.frombuffer(self._target_column, dtype=np.int32),
+            np.frombuffer(self._amount_column, dtype=np.int64)
+        )
+
+
+class TransactionGraph:
+    # Constructor
+    # Use TransactionGraphBuilder.build() or from_edges() instead
+    # Both adjacencies are CSR arrays: the edges of address id i are edge_ids[indptr[i]:indptr[i + 1]]
+    def __init__(self, address_codes, forward_adjacency, backward_adjacency):
+        self.address_codes = address_codes
+
+        # The address codes may grow with a builder that is extended after build()
+        self.node_count = len(forward_adjacency[0]) - 1
+
+        # Direction -> (indptr, neighbour ids, weights)
+        self.adjacencies = {FORWARD_DIRECTION: forward_adjacency, BACKWARD_DIRECTION: backward_adjacency}
+
+        # (address id, direction, min_amount) -> _TraceState, least recently used first
+        self._trace_cache = OrderedDict()
+
+    def __len__(self):
+        return self.node_count
+
+    # Returns the number of edges after summing the edges between the same addresses
+    def get_edge_count(self):
+        return len(self.adjacencies[FORWARD_DIRECTION][1])
+
+    #############################################################
+    # @brief    This function creates a graph from edge columns. Edges between the same two
+    #           addresses are summed, the edges are sorted once by sender and once by receiver.
+    #
+    # @para     address_codes - AddressCodes of the address ids
+    # @para     sources - NumPy array of the sender ids
+    # @para     targets - NumPy array of the receiver ids
+    # @para     amounts - NumPy array of the amounts in *10^-8 btc
+    # @return   TransactionGraph - Graph of the edges
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def from_edges(cls, address_codes, sources, targets, amounts):
+        node_count = len(address_codes)
+
+        # One key per address pair, the unique keys are sorted by sender and then by receiver
+        keys = sources.astype(np.int64) * node_count + targets
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+        weights = np.zeros(len(unique_keys), dtype=np.int64)
+        np.add.at(weights, inverse, amounts)
+        sources = (unique_keys // max(node_count, 1)).astype(np.int32)
+        targets = (unique_keys % max(node_count, 1)).astype(np.int32)
+
+        forward_adjacency = (_get_indptr(sources, node_count), targets, weights)
+        order = np.argsort(targets, kind='stable')
+        backward_adjacency = (_get_indptr(targets, node_count), sources[order], weights[order])
+        return cls(address_codes, forward_adjacency, backward_adjacency)
+
+    # Returns the (address, amount) tuples of the direct neighbours of an address, largest amount first
+    def get_neighbors(self, address, direction=FORWARD_DIRECTION):
+        address_id = self.address_codes.get_code(address)
+        if address_id == NO_ADDRESS_CODE or address_id >= self.node_count:
+            return []
+
+        indptr, neighbor_ids, weights = self.adjacencies[direction]
+        edge_slice = slice(indptr[address_id], indptr[address_id + 1])
+        neighbors = zip(neighbor_ids[edge_slice].tolist(), weights[edge_slice].tolist())
+        return sorted(((self.address_codes.decode(neighbor_id), weight) for neighbor_id, weight in neighbors),
+                      key=lambda neighbor: -neighbor[1])
+
+    #############################################################
+    # @brief    This function traces the flows of an address over up to max_hops edges.
+    #           Every address is reported once at its smallest number of hops, edges below
+    #           min_amount are not followed.
+    #
+    # @para     address - Bitcoin address to be traced
+    # @para     max_hops - Maximum number of edges from the address
+    # @para     direction - FORWARD_DIRECTION where the bitcoin went, BACKWARD_DIRECTION where it came from
+    # @para     min_amount - Minimum amount of a followed edge in *10^-8 btc
+    # @return   list - TracedAddress per reached address, sorted by hops and then by amount descending
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def trace(self, address, max_hops=MAX_TRACE_HOPS, direction=FORWARD_DIRECTION, min_amount=0):
+        address_id = self.address_codes.get_code(address)
+        if address_id == NO_ADDRESS_CODE or address_id >= self.node_count:
+            return []
+
+        address_ids, hops, amounts = self.trace_ids(address_id, max_hops, direction, min_amount)
+        order = np.lexsort((-amounts, hops))
+        decode = self.address_codes.decode
+        return [TracedAddress(decode(reached_id), hop_count, amount) for reached_id, hop_count, amount
+                in zip(address_ids[order].tolist(), hops[order].tolist(), amounts[order].tolist())]
+
+    #############################################################
+    # @brief    This function is the vectorized core of trace(). The hops of a trace are kept per
+    #           address id, direction and min_amount, so a repeated or deeper trace of the same
+    #           address only expands the hops that were not traced before.
+    #
+    # @para     address_id - Id of the traced address
+    # @para     max_hops - Maximum number of edges from the address
+    # @para     direction - FORWARD_DIRECTION or BACKWARD_DIRECTION
+    # @para     min_amount - Minimum amount of a followed edge in *10^-8 btc
+    # @return   tuple - NumPy arrays (address ids, hops, amounts) of the reached addresses
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def trace_ids(self, address_id, max_hops=MAX_TRACE_HOPS, direction=FORWARD_DIRECTION, min_amount=0):
+        cache_key = (address_id, direction, min_amount)
+        trace_state = self._trace_cache.pop(cache_key, None)
+        if trace_state is None:
+            trace_state = _TraceState(address_id)
+        if len(trace_state.layers) < max_hops and not trace_state.is_exhausted:
+            self._expand(trace_state, max_hops, self.adjacencies[direction], min_amount)
+
+        self._trace_cache[cache_key] = trace_state
+        if len(self._trace_cache) > MAX_CACHED_TRACES:
+            self._trace_cache.popitem(last=False)
+
+        layers = trace_state.layers[:max_hops]
+        if not layers:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        return (np.concatenate([layer_ids for layer_ids, _ in layers]),
+                np.concatenate([np.full(len(layer_ids), hop, dtype=np.int32)
+                                for hop, (layer_ids, _) in enumerate(layers, 1)]),
+                np.concatenate([layer_amounts for _, layer_amounts in layers]))
+
+    # Breadth-first expansion of a trace up to max_hops, one hop is one pass over the edges of the frontier
+    def _expand(self, trace_state, max_hops, adjacency, min_amount):
+        indptr, neighbor_ids, weights = adjacency
+
+        # The visited addresses are not kept between traces, they are restored from the layers
+        visited = np.zeros(self.node_count, dtype=bool)
+        visited[trace_state.address_id] = True
+        for layer_ids, _ in trace_state.layers:
+            visited[layer_ids] = True
+
+        frontier = trace_state.layers[-1][0] if trace_state.layers else np.array([trace_state.address_id])
+        while len(trace_state.layers) < max_hops:
+            # Indexes of all edges of the frontier: the edge ranges of the addresses laid end to end
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            offsets = np.cumsum(counts) - counts
+            edge_indexes = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+            edge_weights = weights[edge_indexes]
+            if min_amount:
+                edge_indexes = edge_indexes[edge_weights >= min_amount]
+                edge_weights = edge_weights[edge_weights >= min_amount]
+            edge_targets = neighbor_ids[edge_indexes]
+            is_new = ~visited[edge_targets]
+
+            # Sum the edges per newly reached address
+            layer_ids, inverse = np.unique(edge_targets[is_new], return_inverse=True)
+            if not len(layer_ids):
+                trace_state.is_exhausted = True
+                return
+            layer_amounts = np.zeros(len(layer_ids), dtype=np.int64)
+            np.add.at(layer_amounts, inverse, edge_weights[is_new])
+
+            visited[layer_ids] = True
+            trace_state.layers.append((layer_ids, layer_amounts))
+            frontier = layer_ids
+
+
+class _TraceState:
+    # Constructor
+    # layers - (address ids, amounts) per hop, the last layer is the frontier of the next hop
+    def __init__(self, address_id):
+        self.address_id = address_id
+        self.layers = []
+        self.is_exhausted = False
+
+
+# Returns the CSR index pointer of the sorted row ids
+def _get_indptr(row_ids, node_count):
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=node_count), out=indptr[1:])
+    return indptr
@@ -0,0 +1,192 @@
+#############################################################
+# @file     transaction_table.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://numpy.org/doc/stable/reference/generated/numpy.ufunc.at.html
+#############################################################
+# Import packages
+from array import array
+
+import numpy as np
+
+# Define Constants
+# Direction codes of the direction column
+TX_DIRECTION_CODE = 0
+RX_DIRECTION_CODE = 1
+
+# Code of a missing address, e.g. an OP_RETURN output
+NO_ADDRESS_CODE = -1
+
+
+class AddressCodes:
+    # Constructor
+    # Maps every address to a consecutive integer code, each address string is stored only once
+    def __init__(self):
+        self.addresses = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.addresses)
+
+    # Returns the code of an address and assigns a new code to an unknown address
+    def encode(self, address):
+        if address is None:
+            return NO_ADDRESS_CODE
+
+        code = self._codes.get(address)
+        if code is None:
+            code = len(self.addresses)
+            self._codes[address] = code
+            self.addresses.append(address)
+        return code
+
+    # Returns the code of a known address or NO_ADDRESS_CODE
+    def get_code(self, address):
+        return self._codes.get(address, NO_ADDRESS_CODE)
+
+    # Returns the address of a code
+    def decode(self, code):
+        if code == NO_ADDRESS_CODE:
+            return None
+        return self.addresses[code]
+
+
+class TransactionTableBuilder:
+    # Constructor
+    # The rows are appended to typed arrays, so a row costs 29 bytes instead of a Python tuple per row
+    def __init__(self, address_codes=None):
+        self.address_codes = address_codes if address_codes is not None else AddressCodes()
+
+        self._address_column = array('i')
+        self._amount_column = array('q')
+        self._direction_column = array('b')
+        self._block_height_column = array('q')
+        self._tx_index_column = array('q')
+
+    #############################################################
+    # @brief    This function appends one flow of bitcoin to the table.
+    #
+    # @para     address - Sending or receiving address, None if the input or output has no address
+    # @para     amount - Amount in *10^-8 btc
+    # @para     direction - TX_DIRECTION_CODE for sent, RX_DIRECTION_CODE for received bitcoin
+    # @para     block_height - Height of the block, -1 for unconfirmed or unknown
+    # @para     tx_index - Transaction index of the Blockchain.info API, -1 if unknown
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def add_flow(self, address, amount, direction, block_height=-1, tx_index=-1):
+        self._address_column.append(self.address_codes.encode(address))
+        self._amount_column.append(amount)
+        self._direction_column.append(direction)
+        self._block_height_column.append(-1 if block_height is None else block_height)
+        self._tx_index_column.append(-1 if tx_index is None else tx_index)
+
+    # Appends a (from, to, amount) transaction as a sent and a received flow
+    def add_transaction(self, from_address, to_address, amount, block_height=-1, tx_index=-1):
+        self.add_flow(from_address, amount, TX_DIRECTION_CODE, block_height, tx_index)
+        self.add_flow(to_address, amount, RX_DIRECTION_CODE, block_height, tx_index)
+
+    # Returns the columns as a TransactionTable
+    def build(self):
+        return TransactionTable(
+            self.address_codes,
+            np.frombuffer(self._address_column, dtype=np.int32).copy(),
+            np.frombuffer(self._amount_column, dtype=np.int64).copy(),
+            np.frombuffer(self._direction_column, dtype=np.int8).copy(),
+            np.frombuffer(self._block_height_column, dtype=np.int64).copy(),
+            np.frombuffer(self._tx_index_column, dtype=np.int64).copy()
+        )
+
+
+class TransactionTable:
+    # Constructor
+    # One row per flow of bitcoin from or to an address, stored as NumPy columns
+    def __init__(self, address_codes, address, amount, direction, block_height, tx_index):
+        self.address_codes = address_codes
+
+        self.address = address
+        self.amount = amount
+        self.direction = direction
+        self.block_height = block_height
+        self.tx_index = tx_index
+
+    def __len__(self):
+        return len(self.amount)
+
+    #############################################################
+    # @brief    This function creates a table from a list of (from, to, amount) tuples as returned
+    #           by BtcAddressMonitoring.get_transactions_from_btc_address().
+    #
+    # @para     transaction_list - List of (from address, to address, amount) tuples
+    # @return   TransactionTable - Table with a sent and a received row per transaction
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def from_transaction_list(cls, transaction_list):
+        builder = TransactionTableBuilder()
+        for from_address, to_address, amount in transaction_list:
+            builder.add_transaction(from_address, to_address, amount)
+        return builder.build()
+
+    #############################################################
+    # @brief    This function sums the amounts per address with a single vectorized pass.
+    #           Rows without an address are ignored.
+    #
+    # @para     direction - TX_DIRECTION_CODE for sent, RX_DIRECTION_CODE for received bitcoin
+    # @return   numpy.ndarray - Sum in *10^-8 btc per address code
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def sum_by_address(self, direction):
+        mask = (self.direction == direction) & (self.address != NO_ADDRESS_CODE)
+
+        sums = np.zeros(len(self.address_codes), dtype=np.int64)
+        np.add.at(sums, self.address[mask], self.amount[mask])
+        return sums
+
+    # Returns the received minus the sent amount per address code
+    def net_flow_by_address(self):
+        return self.sum_by_address(RX_DIRECTION_CODE) - self.sum_by_address(TX_DIRECTION_CODE)
+
+    # Returns the n addresses that have sent the most bitcoin as (address, amount) tuples
+    def top_senders(self, n=10):
+        return self._top_addresses(self.sum_by_address(TX_DIRECTION_CODE), n)
+
+    # Returns the n addresses that have received the most bitcoin as (address, amount) tuples
+    def top_receivers(self, n=10):
+        return self._top_addresses(self.sum_by_address(RX_DIRECTION_CODE), n)
+
+    #############################################################
+    # @brief    This function computes a histogram of the amounts.
+    #           By default the bins are logarithmic, one bin per power of ten from 1 satoshi
+    #           up to the total bitcoin supply.
+    #
+    # @para     bins - Number of bins or bin edges as accepted by numpy.histogram
+    # @para     direction - Only rows of this direction code, all rows if None
+    # @return   tuple - (counts, bin_edges)
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def amount_histogram(self, bins=None, direction=None):
+        amounts = self.amount if direction is None else self.amount[self.direction == direction]
+        if bins is None:
+            bins = np.logspace(0, 16, 17)
+        return np.histogram(amounts, bins=bins)
+
+    # Returns the rows as (address, amount, direction, block_height, tx_index) tuples
+    def to_rows(self):
+        return [(self.address_codes.decode(code), int(amount), int(direction), int(block_height), int(tx_index))
+                for code, amount, direction, block_height, tx_index
+                in zip(self.address, self.amount, self.direction, self.block_height, self.tx_index)]
+
+    # Returns the n largest sums as (address, amount) tuples, sorted descending
+    def _top_addresses(self, sums, n):
+        n = min(n, np.count_nonzero(sums))
+        if n == 0:
+            return []
+
+        # argpartition selects the top n in linear time, only these n are sorted
+        top_codes = np.argpartition(sums, -n)[-n:]
+        top_codes = top_codes[np.argsort(sums[top_codes])[::-1]]
+        return [(self.address_codes.decode(code), int(sums[code])) for code in top_codes]
@@ -0,0 +1,359 @@
+#############################################################
+# @file     watcher_service.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Long-running watcher for a list of addresses. Every polling cycle downloads the memory
+#           pool once, matches the new transactions against the watchlist and puts the events into
+#           a queue, so the alerting runs independently of the polling. The polling interval adapts
+#           to the churn of the memory pool and is jittered so that several watchers do not poll
+#           the API in lockstep.
+#############################################################
+# Import packages
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+from mempool_monitoring import BtcWatchlistMonitoring, MempoolTracker, RX_DIRECTION, TX_DIRECTION
+from watchlist_filter import CompactWatchlist
+
+# Define Constants
+CHECK_INTERVAL_SECONDS = 30
+MIN_CHECK_INTERVAL_SECONDS = 5
+MAX_CHECK_INTERVAL_SECONDS = 120
+POLL_JITTER = 0.1
+
+# Share of new transactions in a poll above which the memory pool counts as busy and below which as quiet.
+# If most transactions of the feed are new, transactions may have been pushed out of the feed between two polls.
+BUSY_NEW_TRANSACTION_SHARE = 0.5
+QUIET_NEW_TRANSACTION_SHARE = 0.1
+INTERVAL_TIGHTEN_FACTOR = 0.5
+INTERVAL_BACKOFF_FACTOR = 1.5
+
+# Watchlist files with more addresses are held as CompactWatchlist instead of a set of strings
+COMPACT_WATCHLIST_SIZE = 50000
+
+REPORT_INTERVAL_SECONDS = 600
+MAX_STATISTICS_SAMPLES = 1000
+
+# Event of a watched address
+#   -> tx_hash - Hash of the unconfirmed transaction
+#   -> address - Watched address
+#   -> direction - TX_DIRECTION for sent and RX_DIRECTION for received bitcoin
+#   -> tx_time - Time in seconds since the epoch at which the API has first seen the transaction, None if unknown
+#   -> detected_time - Time in seconds since the epoch at which the watcher has detected the transaction
+#   -> amount - Sum of the inputs (sent) or outputs (received) of the address in *10^-8 btc, None if unknown
+WatchEvent = namedtuple('WatchEvent', ['tx_hash', 'address', 'direction', 'tx_time', 'detected_time', 'amount'],
+                        defaults=(None,))
+
+# Logger of the module
+logger = logging.getLogger(__name__)
+
+
+#############################################################
+# @brief    This function reads a watchlist file with one address per line.
+#           Empty lines and lines starting with '#' are ignored, duplicates are removed.
+#
+# @para     watchlist_path - Path of the watchlist file
+# @return   list - Watched addresses in the order of the file
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def load_watchlist(watchlist_path):
+    addresses = {}
+    with open(watchlist_path) as watchlist_file:
+        for line in watchlist_file:
+            address = line.split('#', 1)[0].strip()
+            if address:
+                addresses[address] = None
+    return list(addresses)
+
+
+class PollScheduler:
+    # Constructor
+    # interval     - Initial polling interval in seconds
+    # min_interval - Shortest polling interval of a busy memory pool
+    # max_interval - Longest polling interval of a quiet memory pool or a failing API
+    # jitter       - Relative random deviation of every delay, e.g. 0.1 for +-10 %
+    # rng          - random.Random instance, can be seeded for tests
+    def __init__(self, interval=CHECK_INTERVAL_SECONDS, min_interval=MIN_CHECK_INTERVAL_SECONDS,
+                 max_interval=MAX_CHECK_INTERVAL_SECONDS, jitter=POLL_JITTER, rng=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.rng = rng if rng is not None else random.Random()
+
+    #############################################################
+    # @brief    This function adapts the polling interval to the result of a poll.
+    #           -> busy memory pool: the interval is halved so no transaction is missed
+    #           -> quiet memory pool or failed poll: the interval is increased
+    #           -> otherwise the interval is kept
+    #
+    # @para     new_transaction_count - Number of new transactions of the poll, None if the poll failed
+    # @para     transaction_count - Number of transactions in the memory pool feed
+    # @return   float - New polling interval in seconds
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def update(self, new_transaction_count, transaction_count):
+        if new_transaction_count is None:
+            self.interval *= INTERVAL_BACKOFF_FACTOR
+        elif transaction_count > 0:
+            new_transaction_share = new_transaction_count / transaction_count
+            if new_transaction_share >= BUSY_NEW_TRANSACTION_SHARE:
+                self.interval *= INTERVAL_TIGHTEN_FACTOR
+            elif new_transaction_share <= QUIET_NEW_TRANSACTION_SHARE:
+                self.interval *= INTERVAL_BACKOFF_FACTOR
+        else:
+            self.interval *= INTERVAL_BACKOFF_FACTOR
+
+        self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+        return self.interval
+
+    # Returns the delay until the next poll, the interval with a random jitter
+    def get_next_delay(self):
+        return self.interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+
+class WatcherStatistics:
+    # Constructor
+    # The samples are kept in bounded deques, so the statistics of a long-running watcher use constant memory
+    def __init__(self, max_samples=MAX_STATISTICS_SAMPLES):
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.events = 0
+
+        self.cycle_durations = deque(maxlen=max_samples)
+        self.cycle_cpu_times = deque(maxlen=max_samples)
+        self.new_transaction_counts = deque(maxlen=max_samples)
+        self.detection_latencies = deque(maxlen=max_samples)
+        self.intervals = deque(maxlen=max_samples)
+
+    # Records a polling cycle, new_transaction_count is None for a failed cycle
+    def add_cycle(self, duration, cpu_time, new_transaction_count, interval):
+        self.cycles += 1
+        if new_transaction_count is None:
+            self.failed_cycles += 1
+        else:
+            self.new_transaction_counts.append(new_transaction_count)
+        self.cycle_durations.append(duration)
+        self.cycle_cpu_times.append(cpu_time)
+        self.intervals.append(interval)
+
+    # Records an event and its detection latency
+    def add_event(self, event):
+        self.events += 1
+        if event.tx_time is not None:
+            self.detection_latencies.append(max(0.0, event.detected_time - event.tx_time))
+
+    #############################################################
+    # @brief    This function summarizes the recorded samples for tuning the watcher.
+    #
+    # @return   dict - Cycle counters and mean, p50, p90 and max of the cycle duration, the CPU time
+    #                  per cycle, the detection latency and the polling interval in seconds
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_report(self):
+        return {
+            'cycles': self.cycles,
+            'failed_cycles': self.failed_cycles,
+            'events': self.events,
+            'mean_new_transactions': _get_mean(self.new_transaction_counts),
+            'cycle_duration_seconds': _summarize(self.cycle_durations),
+            'cycle_cpu_seconds': _summarize(self.cycle_cpu_times),
+            'detection_latency_seconds': _summarize(self.detection_latencies),
+            'interval_seconds': _summarize(self.intervals)
+        }
+
+
+class WatcherService:
+    # Constructor
+    # watchlist_path  - Watchlist file, reloaded when it changes. Either a text file with one address per line
+    #                   or a file of CompactWatchlist.build(), which is memory-mapped.
+    # event_queue     - queue.Queue that receives the WatchEvents, a new queue if None
+    # api_client      - BtcApiClient, the shared default client if None
+    # scheduler       - PollScheduler, a default scheduler if None
+    # report_interval - Seconds between two logged statistics reports, None to disable the reports
+    # data_source     - ChainDataSource of the memory pool, the Blockchain.info API of the api_client if None
+    # state_store     - WatcherStateStore that keeps the seen transactions across restarts
+    # address_clusters - AddressClusters, every watched address is expanded to the addresses of its wallet
+    # mempool_analytics - MempoolAnalytics that receives the new transactions of every poll
+    def __init__(self, watchlist_path, event_queue=None, api_client=None, scheduler=None,
+                 report_interval=REPORT_INTERVAL_SECONDS, data_source=None, state_store=None, address_clusters=None,
+                 mempool_analytics=None):
+        self.watchlist_path = watchlist_path
+        self.event_queue = event_queue if event_queue is not None else queue.Queue()
+        self.scheduler = scheduler if scheduler is not None else PollScheduler()
+        self.report_interval = report_interval
+        self.statistics = WatcherStatistics()
+        self.address_clusters = address_clusters
+        self.mempool_analytics = mempool_analytics
+
+        self.watchlist_monitor = BtcWatchlistMonitoring([], MempoolTracker(state_store=state_store),
+                                                        api_client=api_client, data_source=data_source)
+        self._watchlist_mtime = None
+        self.reload_watchlist()
+
+        self._stop_event = threading.Event()
+        self._last_report_time = time.monotonic()
+
+    # Reloads the watchlist if the file was modified, returns True if it was reloaded
+    def reload_watchlist(self):
+        try:
+            watchlist_mtime = os.stat(self.watchlist_path).st_mtime
+            if watchlist_mtime == self._watchlist_mtime:
+                return False
+            watch_addresses = self._load_watch_addresses()
+        except (OSError, ValueError) as err:
+            # The last loaded watchlist stays active
+            logger.error("An error occurred while loading the watchlist %s: %s", self.watchlist_path, err)
+            return False
+
+        # The memory mapping of a replaced compact watchlist is released
+        if isinstance(self.watchlist_monitor.watch_addresses, CompactWatchlist):
+            self.watchlist_monitor.watch_addresses.close()
+
+        self.watchlist_monitor.watch_addresses = watch_addresses
+        self._watchlist_mtime = watchlist_mtime
+        logger.info("Watching %d addresses from %s", len(watch_addresses), self.watchlist_path)
+        return True
+
+    # Loads the watchlist file as set or, for large watchlists, as CompactWatchlist
+    def _load_watch_addresses(self):
+        if CompactWatchlist.is_watchlist_file(self.watchlist_path):
+            watchlist = CompactWatchlist.open(self.watchlist_path)
+            if self.address_clusters is None:
+                return watchlist
+            with watchlist:
+                addresses = self.address_clusters.expand(watchlist)
+        else:
+            addresses = load_watchlist(self.watchlist_path)
+            if self.address_clusters is not None:
+                addresses = self.address_clusters.expand(addresses)
+
+        if len(addresses) > COMPACT_WATCHLIST_SIZE:
+            return CompactWatchlist.from_addresses(addresses)
+        return set(addresses)
+
+    #############################################################
+    # @brief    This function runs one polling cycle: the memory pool is polled once, the new
+    #           transactions are matched against the watchlist and the events are put into the
+    #           event queue. The scheduler is updated with the churn of the poll.
+    #
+    # @return   list - WatchEvents of the cycle
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def run_cycle(self):
+        start_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        self.reload_watchlist()
+
+        new_transactions = self.watchlist_monitor.poll_new_transactions()
+
+        events = []
+        if new_transactions is None:
+            self.scheduler.update(None, 0)
+        else:
+            detected_time = time.time()
+            if self.mempool_analytics is not None:
+                self.mempool_analytics.add_transactions(new_transactions, detected_time)
+
+            # Transactions without an event are handled, the others are recorded as seen by the
+            # AlertDispatcher once their alert was delivered
+            handled_tx_hashes = []
+            for transaction in new_transactions:
+                transaction_events = self._get_flow_events(transaction, detected_time)
+                if not transaction_events:
+                    handled_tx_hashes.append(transaction['hash'])
+                for event in transaction_events:
+                    events.append(event)
+                    self.statistics.add_event(event)
+                    self.event_queue.put(event)
+            self.watchlist_monitor.mempool_tracker.record_seen_transactions(handled_tx_hashes)
+
+            self.scheduler.update(len(new_transactions), self.watchlist_monitor.mempool_tracker.last_poll_size)
+
+        self.statistics.add_cycle(time.perf_counter() - start_time, time.process_time() - start_cpu_time,
+                                  None if new_transactions is None else len(new_transactions),
+                                  self.scheduler.interval)
+        return events
+
+    #############################################################
+    # @brief    This function runs the polling cycles until stop() is called.
+    #           An alert does not stop the watcher.
+    #
+    # @para     max_cycles - Number of cycles after which the watcher returns, None to run until stop()
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def run(self, max_cycles=None):
+        cycles = 0
+        while not self._stop_event.is_set():
+            try:
+                self.run_cycle()
+            except Exception as err:
+                # A single broken cycle must not end the watcher
+                logger.exception("An error occurred in the polling cycle: %s", err)
+                self.scheduler.update(None, 0)
+
+            cycles += 1
+            self._report_statistics()
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+            # The wait is interrupted immediately by stop()
+            self._stop_event.wait(self.scheduler.get_next_delay())
+
+    # Stops run() after the current cycle
+    def stop(self):
+        self._stop_event.set()
+
+    # Starts run() in a daemon thread and returns the thread
+    def start(self):
+        thread = threading.Thread(target=self.run, name='watcher_service', daemon=True)
+        thread.start()
+        return thread
+
+    # Returns the WatchEvents of a transaction, the sent or received amount is taken from the flow of the address
+    def _get_flow_events(self, transaction, detected_time):
+        flows = self.watchlist_monitor.get_transaction_flows(transaction)
+        if not flows:
+            return []
+
+        tx_time = transaction.get('time')
+        return ([WatchEvent(flow.tx_hash, flow.address, TX_DIRECTION, tx_time, detected_time, flow.sent)
+                 for flow in flows if flow.input_count] +
+                [WatchEvent(flow.tx_hash, flow.address, RX_DIRECTION, tx_time, detected_time, flow.received)
+                 for flow in flows if flow.output_count])
+
+    # Logs the statistics every report_interval seconds
+    def _report_statistics(self):
+        if self.report_interval is None or time.monotonic() - self._last_report_time < self.report_interval:
+            return
+        self._last_report_time = time.monotonic()
+        logger.info("Watcher statistics: %s", self.statistics.get_report())
+
+
+# Returns the mean of the samples or None
+def _get_mean(samples):
+    return round(sum(samples) / len(samples), 6) if samples else None
+
+
+# Returns mean, p50, p90 and max of the samples
+def _summarize(samples):
+    if not samples:
+        return {'mean': None, 'p50': None, 'p90': None, 'max': None}
+
+    sorted_samples = sorted(samples)
+    return {
+        'mean': _get_mean(sorted_samples),
+        'p50': round(sorted_samples[int(0.5 * (len(sorted_samples) - 1))], 6),
+        'p90': round(sorted_samples[int(0.9 * (len(sorted_samples) - 1))], 6),
+        'max': round(sorted_samples[-1], 6)
+    }
@@ -0,0 +1,219 @@
+#############################################################
+# @file     watcher_state.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://www.sqlite.org/wal.html
+#           https://www.sqlite.org/pragma.html#pragma_incremental_vacuum
+# Hint:     Persistent state of the watcher, so that a restart neither re-alerts nor re-downloads:
+#           -> seen transactions: hashes of the memory pool transactions without a watched address
+#              or with a delivered alert
+#           -> address checkpoints: synced position ranges of the address histories
+#           -> alert history: deduplication keys of the sent alerts
+#           Nothing is loaded at startup. The tracker asks for the hashes of a poll that it does not
+#           know itself, so a warm restart costs one query per poll instead of loading the state.
+#           Every write is a committed WAL transaction, a crash loses at most the running poll.
+#           Old rows are removed by compact(), which is also run periodically by the writes.
+#############################################################
+# Import packages
+import json
+import sqlite3
+import threading
+import time
+
+from address_history import AddressHistoryCheckpoint
+
+# Define Constants
+# bitcoind drops unconfirmed transactions after 336 hours by default, older hashes cannot reappear
+SEEN_RETENTION_SECONDS = 336 * 3600
+MAX_SEEN_TRANSACTIONS = 500000
+ALERT_RETENTION_SECONDS = 7 * 24 * 3600
+MAX_ALERTS = 100000
+COMPACT_INTERVAL_SECONDS = 3600
+
+# Maximum number of parameters of one query, below the SQLite limit of older versions
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS seen_transactions (
+    tx_hash TEXT PRIMARY KEY,
+    seen_time REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_transactions_by_time ON seen_transactions (seen_time);
+CREATE TABLE IF NOT EXISTS address_checkpoints (
+    address TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (address, start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS alert_history (
+    dedup_key TEXT PRIMARY KEY,
+    recipient TEXT,
+    alert_time REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS alert_history_by_time ON alert_history (alert_time);
+'''
+
+
+class WatcherStateStore:
+    # Constructor
+    # state_path - SQLite database file, ':memory:' for a state that only lives as long as the object
+    # clock      - Wall clock in seconds since the epoch, the times are compared across restarts
+    def __init__(self, state_path=':memory:', max_seen_transactions=MAX_SEEN_TRANSACTIONS,
+                 seen_retention_seconds=SEEN_RETENTION_SECONDS, max_alerts=MAX_ALERTS,
+                 alert_retention_seconds=ALERT_RETENTION_SECONDS, compact_interval=COMPACT_INTERVAL_SECONDS,
+                 clock=time.time):
+        self.state_path = state_path
+        self.max_seen_transactions = max_seen_transactions
+        self.seen_retention_seconds = seen_retention_seconds
+        self.max_alerts = max_alerts
+        self.alert_retention_seconds = alert_retention_seconds
+        self.compact_interval = compact_interval
+        self.clock = clock
+
+        # The tracker, the dispatcher and the history sync use the store from different threads
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(state_path, check_same_thread=False)
+
+        # Freed pages are returned to the file system by compact(), only effective for a new database
+        self.connection.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self._last_compact_time = time.monotonic()
+
+    # Closes the database
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    #############################################################
+    # @brief    This function returns which of the transaction hashes were seen before.
+    #
+    # @para     tx_hashes - Iterable of transaction hashes
+    # @return   set - Known transaction hashes
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def get_known_transactions(self, tx_hashes):
+        tx_hashes = list(tx_hashes)
+        known_hashes = set()
+        with self._lock:
+            for chunk_start in range(0, len(tx_hashes), QUERY_CHUNK_SIZE):
+                chunk = tx_hashes[chunk_start:chunk_start + QUERY_CHUNK_SIZE]
+                query = f"SELECT tx_hash FROM seen_transactions WHERE tx_hash IN ({','.join('?' * len(chunk))})"
+                known_hashes.update(row[0] for row in self.connection.execute(query, chunk))
+        return known_hashes
+
+    # Records newly seen transaction hashes in one transaction
+    def add_seen_transactions(self, tx_hashes):
+        seen_time = self.clock()
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT OR IGNORE INTO seen_transactions VALUES (?, ?)',
+                                        ((tx_hash, seen_time) for tx_hash in tx_hashes))
+        self._compact_if_due()
+
+    # Returns the number of stored transaction hashes
+    def get_seen_transaction_count(self):
+        with self._lock:
+            return self.connection.execute('SELECT COUNT(*) FROM seen_transactions').fetchone()[0]
+
+    # Returns the synced position ranges of an address as sorted (start, end) tuples
+    def get_synced_ranges(self, address):
+        with self._lock:
+            return self.connection.execute('SELECT start, end FROM address_checkpoints WHERE address = ? '
+                                           'ORDER BY start', (address,)).fetchall()
+
+    # Replaces the synced position ranges of an address
+    def set_synced_ranges(self, address, synced_ranges):
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM address_checkpoints WHERE address = ?', (address,))
+            self.connection.executemany('INSERT INTO address_checkpoints VALUES (?, ?, ?)',
+                                        ((address, start, end) for start, end in synced_ranges))
+
+    # Returns a checkpoint of the address histories that is saved to this store
+    def get_address_checkpoint(self):
+        return StoredAddressHistoryCheckpoint(self)
+
+    # Records sent alerts, a key is any JSON-serializable value
+    def add_alerts(self, recipient, dedup_keys):
+        alert_time = self.clock()
+        with self._lock, self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO alert_history VALUES (?, ?, ?)',
+                                        ((_encode_key(dedup_key), recipient, alert_time) for dedup_key in dedup_keys))
+        self._compact_if_due()
+
+    # Returns True if an alert with the key was sent within the last max_age seconds
+    def is_alert_sent(self, dedup_key, max_age):
+        with self._lock:
+            row = self.connection.execute('SELECT 1 FROM alert_history WHERE dedup_key = ? AND alert_time > ?',
+                                          (_encode_key(dedup_key), self.clock() - max_age)).fetchone()
+        return row is not None
+
+    #############################################################
+    # @brief    This function keeps the state file bounded: transaction hashes and alerts that
+    #           are older than their retention or beyond their maximum count are deleted, the
+    #           WAL is checkpointed and the freed pages are returned to the file system.
+    #
+    # @return   int - Number of deleted rows
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    def compact(self):
+        now = self.clock()
+        with self._lock:
+            with self.connection:
+                deleted_count = self._delete_old_rows('seen_transactions', 'seen_time',
+                                                      now - self.seen_retention_seconds, self.max_seen_transactions)
+                deleted_count += self._delete_old_rows('alert_history', 'alert_time',
+                                                       now - self.alert_retention_seconds, self.max_alerts)
+
+            self.connection.execute('PRAGMA incremental_vacuum')
+            self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self._last_compact_time = time.monotonic()
+        return deleted_count
+
+    # Deletes the rows that are older than min_time and the oldest rows beyond max_rows,
+    # rows with the same time (e.g. of one poll) are deleted together
+    def _delete_old_rows(self, table, time_column, min_time, max_rows):
+        deleted_count = self.connection.execute(f"DELETE FROM {table} WHERE {time_column} < ?", (min_time,)).rowcount
+        row = self.connection.execute(f"SELECT {time_column} FROM {table} ORDER BY {time_column} DESC "
+                                      f"LIMIT 1 OFFSET ?", (max_rows,)).fetchone()
+        if row is not None:
+            deleted_count += self.connection.execute(f"DELETE FROM {table} WHERE {time_column} <= ?",
+                                                     (row[0],)).rowcount
+        return deleted_count
+
+    # Runs compact() every compact_interval seconds
+    def _compact_if_due(self):
+        if time.monotonic() - self._last_compact_time >= self.compact_interval:
+            self.compact()
+
+
+class StoredAddressHistoryCheckpoint(AddressHistoryCheckpoint):
+    # Constructor
+    # The ranges of an address are loaded from the store when the address is synced for the first time
+    def __init__(self, state_store):
+        super().__init__()
+        self.state_store = state_store
+        self._dirty_addresses = set()
+
+    def get_synced_ranges(self, address):
+        if address not in self.synced_ranges:
+            self.synced_ranges[address] = [list(synced_range) for synced_range in
+                                           self.state_store.get_synced_ranges(address)]
+        return super().get_synced_ranges(address)
+
+    def add_synced_range(self, address, start, end):
+        super().add_synced_range(address, start, end)
+        self._dirty_addresses.add(address)
+
+    # Writes the changed addresses to the store
+    def save(self):
+        for address in self._dirty_addresses:
+            self.state_store.set_synced_ranges(address, self.synced_ranges[address])
+        self._dirty_addresses.clear()
+
+
+# Encodes a deduplication key as text, tuples and lists give the same key
+def _encode_key(dedup_key):
+    return json.dumps(dedup_key, separators=(',', ':'), default=str)
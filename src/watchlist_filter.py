@@ -0,0 +1,249 @@
+#############################################################
+# @file     watchlist_filter.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hints:    https://en.wikipedia.org/wiki/Bloom_filter
+#           https://docs.python.org/3/library/mmap.html
+# Hint:     Compact watchlist for hundreds of thousands of addresses:
+#           -> Bloom filter: answers most lookups of unwatched addresses with a few bit tests
+#           -> exact list: one table of sorted fixed-width records per address length, a lookup
+#              that passes the Bloom filter is verified by a binary search, so there are no
+#              false matches and no record is padded
+#           Both parts are stored in one file that is memory-mapped, i.e. the addresses are
+#           not held as Python strings and only the touched pages are loaded by the OS.
+#           File layout: header | table directory | Bloom filter bits | address tables
+#############################################################
+# Import packages
+import hashlib
+import mmap
+import os
+import struct
+from math import ceil, log
+
+# Define Constants
+FALSE_POSITIVE_RATE = 0.01
+
+# Header of the watchlist file: magic, table count, hash count, address count, Bloom filter bits
+WATCHLIST_MAGIC = b'BTCWL\x00\x01\x00'
+WATCHLIST_HEADER = struct.Struct('<8sIIQQ')
+
+# Entry of the table directory: record width (address length in bytes), number of records
+TABLE_ENTRY = struct.Struct('<IQ')
+
+
+class BloomFilter:
+    # Constructor
+    # bit_count  - Number of bits of the filter
+    # hash_count - Number of bit positions per address
+    # bits       - Bytes-like object with the bits, e.g. a slice of a memory-mapped file, a zeroed bytearray if None
+    def __init__(self, bit_count, hash_count, bits=None):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+
+    #############################################################
+    # @brief    This function creates an empty Bloom filter with the optimal size for the
+    #           number of addresses and the false positive rate.
+    #
+    # @para     capacity - Number of addresses that will be added
+    # @para     false_positive_rate - Probability that an address that was not added passes
+    # @return   BloomFilter - Empty filter
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def create(cls, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        capacity = max(1, capacity)
+        bit_count = max(64, ceil(-capacity * log(false_positive_rate) / log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * log(2)))
+        return cls(bit_count, hash_count)
+
+    # Sets the bits of an address
+    def add(self, address):
+        for bit_index in self._iter_bit_indexes(address):
+            self.bits[bit_index >> 3] |= 1 << (bit_index & 7)
+
+    # Returns False if the address was certainly not added
+    def __contains__(self, address):
+        bits = self.bits
+        for bit_index in self._iter_bit_indexes(address):
+            if not bits[bit_index >> 3] & (1 << (bit_index & 7)):
+                return False
+        return True
+
+    # Derives the bit positions from one stable hash (double hashing), Python's hash() differs between processes
+    def _iter_bit_indexes(self, address):
+        digest = hashlib.blake2b(address.encode() if isinstance(address, str) else address, digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], 'little')
+        second_hash = int.from_bytes(digest[8:], 'little') | 1
+        bit_count = self.bit_count
+        for index in range(self.hash_count):
+            yield (first_hash + index * second_hash) % bit_count
+
+
+class CompactWatchlist:
+    # Constructor
+    # Use from_addresses(), build() or open() instead
+    # buffer - Bytes-like object or mmap with the content of a watchlist file
+    def __init__(self, buffer, file=None):
+        if len(buffer) < WATCHLIST_HEADER.size:
+            raise ValueError("No compact watchlist")
+        magic, table_count, hash_count, self.address_count, bit_count = WATCHLIST_HEADER.unpack_from(buffer)
+        if magic != WATCHLIST_MAGIC:
+            raise ValueError("No compact watchlist")
+
+        self.buffer = buffer
+        self._file = file
+
+        # Record width -> (offset of the table, number of records)
+        bloom_start = WATCHLIST_HEADER.size + table_count * TABLE_ENTRY.size
+        bloom_end = table_start = bloom_start + (bit_count + 7) // 8
+        self.tables = {}
+        for table_index in range(table_count):
+            entry_start = WATCHLIST_HEADER.size + table_index * TABLE_ENTRY.size
+            record_width, record_count = TABLE_ENTRY.unpack_from(buffer, entry_start)
+            self.tables[record_width] = (table_start, record_count)
+            table_start += record_width * record_count
+        if table_start > len(buffer):
+            raise ValueError("Truncated compact watchlist")
+
+        # The Bloom filter reads its bits directly from the buffer
+        self.bloom_filter = BloomFilter(bit_count, hash_count, memoryview(buffer)[bloom_start:bloom_end])
+
+        # Counters for monitoring, the filtered lookups never touch the address records
+        self.filtered_lookups = 0
+        self.false_positive_lookups = 0
+
+    #############################################################
+    # @brief    This function creates a compact watchlist in memory.
+    #
+    # @para     addresses - Iterable of watched addresses
+    # @para     false_positive_rate - False positive rate of the Bloom filter
+    # @return   CompactWatchlist - Watchlist
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def from_addresses(cls, addresses, false_positive_rate=FALSE_POSITIVE_RATE):
+        return cls(_serialize_watchlist(addresses, false_positive_rate))
+
+    #############################################################
+    # @brief    This function writes a watchlist file and opens it memory-mapped.
+    #
+    # @para     addresses - Iterable of watched addresses
+    # @para     watchlist_path - Path of the watchlist file, replaced atomically
+    # @para     false_positive_rate - False positive rate of the Bloom filter
+    # @return   CompactWatchlist - Memory-mapped watchlist
+    # @author   criticalEntropy
+    # @date     18.10.2026
+    #############################################################
+    @classmethod
+    def build(cls, addresses, watchlist_path, false_positive_rate=FALSE_POSITIVE_RATE):
+        temp_path = f"{watchlist_path}.tmp"
+        with open(temp_path, 'wb') as watchlist_file:
+            watchlist_file.write(_serialize_watchlist(addresses, false_positive_rate))
+        os.replace(temp_path, watchlist_path)
+        return cls.open(watchlist_path)
+
+    # Opens a watchlist file memory-mapped and read-only
+    @classmethod
+    def open(cls, watchlist_path):
+        watchlist_file = open(watchlist_path, 'rb')
+        try:
+            buffer = mmap.mmap(watchlist_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return cls(buffer, watchlist_file)
+            except (ValueError, struct.error):
+                buffer.close()
+                raise
+        except (OSError, ValueError, struct.error):
+            watchlist_file.close()
+            raise
+
+    # Returns True if the file is a compact watchlist
+    @staticmethod
+    def is_watchlist_file(watchlist_path):
+        with open(watchlist_path, 'rb') as watchlist_file:
+            return watchlist_file.read(len(WATCHLIST_MAGIC)) == WATCHLIST_MAGIC
+
+    # Returns True if the address is watched, most unwatched addresses are rejected by the Bloom filter
+    def __contains__(self, address):
+        if not isinstance(address, str) or address not in self.bloom_filter:
+            self.filtered_lookups += 1
+            return False
+
+        found = self._find_record(address.encode())
+        if not found:
+            self.false_positive_lookups += 1
+        return found
+
+    def __len__(self):
+        return self.address_count
+
+    # Iterates over the watched addresses, sorted by length and then alphabetically
+    def __iter__(self):
+        for record_width, (table_start, record_count) in self.tables.items():
+            for index in range(record_count):
+                yield self.buffer[table_start + index * record_width:table_start + (index + 1) * record_width].decode()
+
+    # Returns the watched addresses of an iterable, like set.intersection()
+    def intersection(self, addresses):
+        return {address for address in addresses if address in self}
+
+    # Returns the bytes that the watchlist occupies in memory or in the memory-mapped file
+    def get_size(self):
+        return len(self.buffer)
+
+    # Releases the memory mapping, the watchlist cannot be used afterwards
+    def close(self):
+        self.bloom_filter.bits.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Binary search over the sorted records of the address length
+    def _find_record(self, encoded_address):
+        record_width = len(encoded_address)
+        table = self.tables.get(record_width)
+        if table is None:
+            return False
+
+        buffer = self.buffer
+        table_start, record_count = table
+        low, high = 0, record_count
+        while low < high:
+            middle = (low + high) // 2
+            record_start = table_start + middle * record_width
+            middle_record = buffer[record_start:record_start + record_width]
+            if middle_record < encoded_address:
+                low = middle + 1
+            elif middle_record > encoded_address:
+                high = middle
+            else:
+                return True
+        return False
+
+
+# Serializes the addresses to the content of a watchlist file
+def _serialize_watchlist(addresses, false_positive_rate):
+    # Sorting by length groups the addresses into the tables, each table is sorted for the binary search
+    encoded_addresses = sorted({address.encode() for address in addresses}, key=lambda address: (len(address), address))
+
+    bloom_filter = BloomFilter.create(len(encoded_addresses), false_positive_rate)
+    tables = {}
+    for encoded_address in encoded_addresses:
+        bloom_filter.add(encoded_address)
+        tables[len(encoded_address)] = tables.get(len(encoded_address), 0) + 1
+
+    header = WATCHLIST_HEADER.pack(WATCHLIST_MAGIC, len(tables), bloom_filter.hash_count, len(encoded_addresses),
+                                   bloom_filter.bit_count)
+    directory = b''.join(TABLE_ENTRY.pack(record_width, record_count) for record_width, record_count in tables.items())
+    return header + directory + bytes(bloom_filter.bits) + b''.join(encoded_addresses)
@@ -0,0 +1,128 @@
+#############################################################
+# @file     chain_fixtures.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Builders of transactions, blocks and address histories in the format of the
+#           Blockchain.info API and fakes of the clock and the SMS backend, shared by the tests.
+#           Usage:
+#               block = create_block(7, payment=True)
+#               tx = create_transaction('tx_1', [('sender', 1000)], [('receiver', 900)])
+#############################################################
+
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+
+# Creates a transaction from the (address, amount) inputs to the (address, amount) outputs
+def create_transaction(tx_hash, inputs, outputs, tx_time=None):
+    transaction = {
+        'hash': tx_hash,
+        'inputs': [{'prev_out': {'addr': address, 'value': value}} for address, value in inputs],
+        'out': [{'addr': address, 'value': value} for address, value in outputs]
+    }
+    if tx_time is not None:
+        transaction['time'] = tx_time
+    return transaction
+
+
+# Creates a transaction of the value from the sender to the receiver, the input also pays the fee
+def create_payment(tx_hash, sender, receiver, value, fee=100, tx_time=None):
+    return create_transaction(tx_hash, [(sender, value + fee)], [(receiver, value)], tx_time)
+
+
+# Creates a transaction whose addresses spend 1000 each, e.g. to be clustered as one wallet
+def create_spend(tx_hash, input_addresses, outputs):
+    return create_transaction(tx_hash, [(address, 1000) for address in input_addresses], outputs)
+
+
+#############################################################
+# @brief    This function creates a block in the format of the rawblock API. By default the
+#           block holds one mix of four participants with equal outputs of 10000, the addresses
+#           contain the block number.
+#
+# @para     block_num - Height of the block, the block hash is hash_<block_num>
+# @para     transactions - Transactions of the block instead of the mix
+# @para     payment - Adds a payment from payer to payee after the mix
+# @para     payload_size - Adds an incompressible payload of roughly this size in bytes
+# @return   dict - Block
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+def create_block(block_num, transactions=None, payment=False, payload_size=0):
+    if transactions is None:
+        transactions = [create_transaction(f"mix_{block_num}",
+                                           [(f"participant_{block_num}_{i}", 10500) for i in range(4)],
+                                           [(f"fresh_{block_num}_{i}", 10000) for i in range(4)])]
+    if payment:
+        transactions = transactions + [create_payment(f"payment_{block_num}", 'payer', 'payee', 4000, fee=1000)]
+
+    block = {'height': block_num, 'hash': f"hash_{block_num}", 'tx': transactions}
+    if payload_size:
+        block['payload'] = os.urandom(payload_size).hex()
+    return block
+
+
+# Wallet 1 spends a_1 and a_2, then a_2 and a_3 together; a_4 pays alone; the CoinJoin mixes five wallets
+BLOCK_1 = {'height': 1, 'tx': [
+    create_spend('tx_1', ['a_1', 'a_2'], [('receiver_1', 1500)]),
+    {'hash': 'coinbase', 'inputs': [{}], 'out': [{'addr': 'miner', 'value': 5000}]}
+]}
+BLOCK_2 = {'height': 2, 'tx': [
+    create_spend('tx_2', ['a_2', 'a_3', 'a_2'], [('receiver_2', 2500), ('a_3', 400)]),
+    create_spend('tx_3', ['a_4'], [('receiver_3', 900)]),
+    create_spend('mix', [f"mixer_{i}" for i in range(5)], [(f"mixed_{i}", 1000) for i in range(5)])
+]}
+
+
+class AddressHistory:
+    # Constructor
+    # Simulates the rawaddr API of an address with n_tx transactions, newest first
+    def __init__(self, n_tx):
+        self.transactions = [self.create_transaction(position) for position in range(n_tx)]
+
+    @staticmethod
+    def create_transaction(position):
+        return {
+            'hash': f"hash_{position}",
+            'inputs': [{'prev_out': {'addr': 'watch_address'}}],
+            'out': [{'addr': 'receiver_address', 'value': position + 1}]
+        }
+
+    # Answers a rawaddr request with the requested page
+    def handle(self, path):
+        query = parse_qs(urlparse(path).query)
+        limit = int(query['limit'][0])
+        offset = int(query.get('offset', ['0'])[0])
+        newest_first = self.transactions[::-1]
+        return {'n_tx': len(self.transactions), 'txs': newest_first[offset:offset + limit]}
+
+
+# Local stand-in of the SMS backend that records the messages instead of sending them
+class FakeSmsBackend:
+    def __init__(self, fail_recipients=()):
+        self.fail_recipients = set(fail_recipients)
+        self.messages = []
+        self.send_times = []
+        self._lock = threading.Lock()
+
+    def send_message(self, from_number, to_number, message_text):
+        if to_number in self.fail_recipients:
+            raise ConnectionError('backend unavailable')
+        with self._lock:
+            self.messages.append((from_number, to_number, message_text))
+            self.send_times.append(time.monotonic())
+        return {'message-count': '1'}
+
+
+# Clock that only advances when the test or the token bucket moves it
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
@@ -0,0 +1,98 @@
+#############################################################
+# @file     stub_api_server.py
+# @author   criticalEntropy
+# @date     18.10.2026
+# Hint:     Local stand-in for the Blockchain.info API that serves canned JSON responses.
+#           Usage:
+#               with StubApiServer({'/rawblock/1': block_data}) as server:
+#                   client = BtcApiClient(base_url=server.base_url)
+#############################################################
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubApiServer:
+    # Constructor
+    # routes - Dictionary API path (including the query) -> JSON serializable response or (status, response)
+    # delay  - Seconds every request is delayed before it is answered
+    # fallback - Function path -> response for paths without route, None answers with 404
+    def __init__(self, routes=None, delay=0.0, fallback=None):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.fallback = fallback
+
+        # Paths of all requests in the order of arrival
+        self.requests = []
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._create_handler())
+        self._server.daemon_threads = True
+        self._server.block_on_close = False
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Answers a request with the canned response of its path or 404
+    def _handle(self, path):
+        with self._lock:
+            self.requests.append(path)
+            self._concurrent_requests += 1
+            self.max_concurrent_requests = max(self.max_concurrent_requests, self._concurrent_requests)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+
+            route = self.routes.get(path)
+            if route is None and self.fallback is not None:
+                route = self.fallback(path)
+            if route is None:
+                return 404, {'error': 'not found'}
+            if callable(route):
+                route = route()
+            if isinstance(route, tuple):
+                return route
+            return 200, route
+        finally:
+            with self._lock:
+                self._concurrent_requests -= 1
+
+    def _create_handler(self):
+        stub_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, payload = stub_server._handle(self.path)
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request, e.g. after a timeout
+                    pass
+
+            # Keep the test output clean
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,97 @@
+#############################################################
+# @file     test_address_clustering.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import os
+import tempfile
+import unittest
+
+from address_clustering import AddressClusters
+from btc_api_client import BtcApiClient
+from btc_parser import BtcBlockMonitoring
+from chain_fixtures import BLOCK_1, BLOCK_2
+from stub_api_server import StubApiServer
+from watcher_service import WatcherService
+
+
+class TestAddressClusters(unittest.TestCase):
+
+    def test_common_inputs_are_clustered(self):
+        address_clusters = AddressClusters()
+        address_clusters.add_block(BLOCK_1)
+        address_clusters.add_block(BLOCK_2)
+
+        self.assertEqual(address_clusters.get_cluster('a_1'), {'a_1', 'a_2', 'a_3'})
+        self.assertTrue(address_clusters.is_same_cluster('a_3', 'a_1'))
+        self.assertFalse(address_clusters.is_same_cluster('a_1', 'a_4'))
+        self.assertEqual(address_clusters.get_cluster('a_4'), {'a_4'})
+        self.assertEqual(address_clusters.expand(['a_3', 'unknown']), {'a_1', 'a_2', 'a_3', 'unknown'})
+
+        # Assert that the CoinJoin does not merge its participants
+        self.assertEqual(address_clusters.skipped_coinjoins, 1)
+        self.assertNotIn('mixer_0', address_clusters)
+        self.assertEqual(address_clusters.cluster_count, 1)
+
+    def test_coinjoins_are_merged_without_skip(self):
+        address_clusters = AddressClusters(skip_coinjoins=False)
+        address_clusters.add_block(BLOCK_2)
+        self.assertEqual(address_clusters.get_cluster_sizes(), [5, 2])
+
+    def test_large_merge_chain(self):
+        # Every transaction links the next address, so all addresses end up in one cluster
+        address_clusters = AddressClusters(skip_coinjoins=False)
+        for index in range(20000):
+            address_clusters.add_inputs([f"address_{index}", f"address_{index + 1}"])
+
+        self.assertEqual(address_clusters.cluster_count, 1)
+        self.assertTrue(address_clusters.is_same_cluster('address_0', 'address_20000'))
+        self.assertLessEqual(max(address_clusters.ranks), 15)
+
+    def test_clusters_survive_save_and_load(self):
+        address_clusters = AddressClusters()
+        address_clusters.add_block(BLOCK_1)
+        address_clusters.add_block(BLOCK_2)
+        address_clusters.add_inputs(['b_1', 'b_2'])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            clusters_path = os.path.join(temp_dir, 'clusters.bin')
+            address_clusters.save(clusters_path)
+            loaded_clusters = AddressClusters.load(clusters_path)
+
+            with open(os.path.join(temp_dir, 'other.bin'), 'wb') as other_file:
+                other_file.write(b'no clusters')
+            with self.assertRaises(ValueError):
+                AddressClusters.load(os.path.join(temp_dir, 'other.bin'))
+
+        self.assertEqual(loaded_clusters.get_cluster('a_2'), {'a_1', 'a_2', 'a_3'})
+        self.assertEqual(loaded_clusters.cluster_count, 2)
+
+        # Assert that the loaded clusters can still be merged
+        loaded_clusters.add_inputs(['b_2', 'a_1'])
+        self.assertEqual(loaded_clusters.get_cluster('b_1'), {'a_1', 'a_2', 'a_3', 'b_1', 'b_2'})
+
+    def test_block_monitoring_clusters_the_scanned_blocks(self):
+        with StubApiServer({'/rawblock/1': BLOCK_1, '/rawblock/2': BLOCK_2}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            address_clusters = BtcBlockMonitoring(1, 2, api_client=client).cluster_btc_blocks()
+            client.close()
+
+        self.assertEqual(address_clusters.get_cluster('a_3'), {'a_1', 'a_2', 'a_3'})
+
+    def test_watcher_expands_the_watchlist(self):
+        address_clusters = AddressClusters()
+        address_clusters.add_block(BLOCK_1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.txt')
+            with open(watchlist_path, 'w') as watchlist_file:
+                watchlist_file.write('a_1\n')
+
+            watcher = WatcherService(watchlist_path, report_interval=None, address_clusters=address_clusters)
+
+        self.assertEqual(watcher.watchlist_monitor.watch_addresses, {'a_1', 'a_2'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#############################################################
+# @file     test_address_history.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import os
+import tempfile
+import unittest
+
+from address_history import AddressHistoryCheckpoint, iter_missing_pages
+from btc_api_client import BtcApiClient
+from btc_parser import BtcAddressMonitoring
+from chain_fixtures import AddressHistory
+from stub_api_server import StubApiServer
+
+
+class TestAddressHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.temp_dir.name, 'checkpoint.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_missing_pages(self):
+        # Assert the pages of a complete history and of a history with a synced middle part
+        self.assertEqual(list(iter_missing_pages(5, [], 2)), [(0, 2), (2, 2), (4, 1)])
+        self.assertEqual(list(iter_missing_pages(10, [(3, 8)], 5)), [(0, 2), (7, 3)])
+        self.assertEqual(list(iter_missing_pages(10, [(0, 10)], 5)), [])
+
+    def test_checkpoint_merges_and_persists_ranges(self):
+        checkpoint = AddressHistoryCheckpoint(self.checkpoint_path)
+        checkpoint.add_synced_range('watch_address', 5, 10)
+        checkpoint.add_synced_range('watch_address', 0, 5)
+        checkpoint.save()
+
+        # Assert that adjacent ranges are merged and the checkpoint is loaded again
+        self.assertEqual(AddressHistoryCheckpoint(self.checkpoint_path).get_synced_ranges('watch_address'), [(0, 10)])
+
+    def test_full_history_is_paginated(self):
+        history = AddressHistory(23)
+        with StubApiServer(fallback=history.handle) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            pages = list(BtcAddressMonitoring('watch_address', api_client=client)
+                         .iter_transaction_pages_from_btc_address(page_size=5))
+            client.close()
+
+        # Assert that all transactions are returned once, newest first, in five pages
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual([tx['hash'] for page in pages for tx in page], [f"hash_{i}" for i in range(22, -1, -1)])
+        self.assertEqual(len(server.requests), 5)
+
+    def test_resume_fetches_only_new_and_missing_history(self):
+        history = AddressHistory(20)
+        with StubApiServer(fallback=history.handle) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            checkpoint = AddressHistoryCheckpoint(self.checkpoint_path)
+            monitor = BtcAddressMonitoring('watch_address', api_client=client)
+
+            # Interrupt the first run after two pages
+            pages = monitor.iter_transaction_pages_from_btc_address(checkpoint, page_size=5, max_workers=1)
+            next(pages)
+            next(pages)
+            next(pages)
+            pages.close()
+            self.assertEqual(checkpoint.get_synced_ranges('watch_address'), [(10, 20)])
+
+            # Three new transactions arrive before the next run
+            history.transactions.extend(AddressHistory.create_transaction(position) for position in range(20, 23))
+            checkpoint = AddressHistoryCheckpoint(self.checkpoint_path)
+            hashes = [tx['hash'] for page in monitor.iter_transaction_pages_from_btc_address(checkpoint, page_size=5)
+                      for tx in page]
+            client.close()
+
+        # Assert that only the new transactions and the rest of the interrupted run were requested
+        self.assertEqual(hashes, [f"hash_{i}" for i in (22, 21, 20)] + [f"hash_{i}" for i in range(9, -1, -1)])
+        self.assertEqual(checkpoint.get_synced_ranges('watch_address'), [(0, 23)])
+        self.assertEqual(checkpoint.get_synced_count('watch_address'), 23)
+
+    def test_transactions_arriving_during_the_paging_shift_the_pages(self):
+        history = AddressHistory(20)
+        with StubApiServer(fallback=history.handle) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            checkpoint = AddressHistoryCheckpoint(self.checkpoint_path)
+            pages = BtcAddressMonitoring('watch_address', api_client=client).iter_transaction_pages_from_btc_address(
+                checkpoint, page_size=5, max_workers=2)
+            hashes = [tx['hash'] for tx in next(pages)]
+
+            # Two new transactions arrive after the first page
+            history.transactions.extend(AddressHistory.create_transaction(position) for position in range(20, 22))
+            hashes.extend(tx['hash'] for page in pages for tx in page)
+            client.close()
+
+        # Assert that no transaction is repeated or skipped and the new ones are left to the next run
+        self.assertEqual(hashes, [f"hash_{i}" for i in range(19, -1, -1)])
+        self.assertEqual(checkpoint.get_synced_ranges('watch_address'), [(0, 20)])
+
+    def test_get_all_transactions_from_btc_address(self):
+        history = AddressHistory(7)
+        with StubApiServer(fallback=history.handle) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            transactions = BtcAddressMonitoring('watch_address', api_client=client).get_all_transactions_from_btc_address()
+            client.close()
+
+        # Assert that the transactions beyond the first page are included
+        self.assertEqual(len(transactions), 7)
+        self.assertEqual(transactions[-1], ('watch_address', 'receiver_address', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#############################################################
+# @file     test_address_index.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from address_index import AddressIndex
+from btc_api_client import BtcApiClient
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring
+from stub_api_server import StubApiServer
+
+# Block 1 pays 5000 to address_a, block 2 spends it to address_b and address_a (change)
+BLOCK_1 = {
+    'hash': 'block_hash_1',
+    'tx': [{
+        'hash': 'tx_1',
+        'tx_index': 1,
+        'inputs': [{'sequence': 0}],
+        'out': [{'addr': 'address_a', 'value': 5000, 'n': 0}]
+    }]
+}
+BLOCK_2 = {
+    'hash': 'block_hash_2',
+    'tx': [{
+        'hash': 'tx_2',
+        'tx_index': 2,
+        'inputs': [{'prev_out': {'addr': 'address_a', 'value': 5000, 'tx_index': 1, 'n': 0}}],
+        'out': [{'addr': 'address_b', 'value': 3000, 'n': 0}, {'addr': 'address_a', 'value': 1900, 'n': 1}]
+    }]
+}
+
+
+class TestAddressIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.address_index = AddressIndex()
+        self.address_index.ingest_blocks([(1, BLOCK_1), (2, BLOCK_2)])
+
+    def tearDown(self):
+        self.address_index.close()
+
+    def test_balances_and_first_last_seen(self):
+        self.assertEqual(self.address_index.get_balance('address_a'), 1900)
+        self.assertEqual(self.address_index.get_balance('address_b'), 3000)
+        self.assertEqual(self.address_index.get_first_last_seen('address_a'), (1, 2))
+        self.assertEqual(self.address_index.get_indexed_block_range(), (1, 2))
+
+    def test_history_and_unspent_outputs(self):
+        # Assert that the history holds the net flow per transaction and spent outputs are marked
+        self.assertEqual(self.address_index.get_history('address_a'), [('tx_1', 1, 5000, 0), ('tx_2', 2, 1900, 5000)])
+        self.assertEqual(self.address_index.get_unspent_outputs('address_a'), [('tx_2', 1, 1900, 2)])
+        self.assertEqual(self.address_index.get_transactions('address_b'), [('address_a', 'address_b', 3000)])
+
+    def test_spends_are_found_in_any_ingest_order(self):
+        # Assert that a spend ingested before its output still marks the output as spent
+        address_index = AddressIndex()
+        address_index.ingest_blocks([(2, BLOCK_2), (1, BLOCK_1)])
+        self.assertEqual(address_index.get_unspent_outputs('address_a'), [('tx_2', 1, 1900, 2)])
+        address_index.close()
+
+    def test_outputs_without_tx_index_are_indexed(self):
+        # Blocks of bitcoind have no tx_index, their inputs reference the previous output by hash
+        rpc_block_1 = {'hash': 'block_hash_1', 'tx': [{'hash': 'tx_1', 'inputs': [{}],
+                                                       'out': [{'addr': 'address_a', 'value': 5000, 'n': 0}]}]}
+        rpc_block_2 = {'hash': 'block_hash_2', 'tx': [{
+            'hash': 'tx_2',
+            'inputs': [{'prev_out': {'addr': 'address_a', 'value': 5000, 'tx_hash': 'tx_1', 'n': 0}}],
+            'out': [{'addr': 'address_b', 'value': 3000, 'n': 0}, {'addr': 'address_a', 'value': 1900, 'n': 1}]
+        }]}
+        address_index = AddressIndex()
+        address_index.ingest_blocks([(2, rpc_block_2), (1, rpc_block_1)])
+        self.assertEqual(address_index.get_unspent_outputs('address_a'), [('tx_2', 1, 1900, 2)])
+        self.assertEqual(address_index.get_transactions('address_b'), [('address_a', 'address_b', 3000)])
+        address_index.close()
+
+    def test_balance_without_prevout(self):
+        # bitcoind without the prevout verbosity only references the previous output of an input
+        rpc_block_2 = {'hash': 'block_hash_2', 'tx': [{
+            'hash': 'tx_2',
+            'inputs': [{'prev_out': {'tx_hash': 'tx_1', 'n': 0}}],
+            'out': [{'addr': 'address_b', 'value': 3000, 'n': 0}, {'addr': 'address_a', 'value': 1900, 'n': 1}]
+        }]}
+        address_index = AddressIndex()
+        address_index.ingest_blocks([(1, BLOCK_1), (2, rpc_block_2)])
+
+        # Assert that the spent output is not part of the balance although the input has no address and value
+        self.assertEqual(address_index.get_balance('address_a'), 1900)
+        self.assertEqual(address_index.get_balance('address_b'), 3000)
+        address_index.close()
+
+    def test_first_sender_is_the_first_input_with_address(self):
+        block = {'hash': 'block_hash_3', 'tx': [{
+            'hash': 'tx_3',
+            'inputs': [{'prev_out': {'value': 700, 'tx_hash': 'tx_0', 'n': 0}},
+                       {'prev_out': {'addr': 'address_c', 'value': 800, 'tx_hash': 'tx_0', 'n': 1}}],
+            'out': [{'addr': 'address_d', 'value': 1400, 'n': 0}]
+        }]}
+        self.address_index.ingest_block(3, block)
+        self.assertEqual(self.address_index.get_transactions('address_d'), [('address_c', 'address_d', 1400)])
+
+    def test_reingest_is_skipped(self):
+        # Assert that indexed blocks are not counted twice
+        self.assertEqual(self.address_index.ingest_block(2, BLOCK_2), 0)
+        self.assertEqual(self.address_index.get_balance('address_b'), 3000)
+
+    def test_index_is_persistent(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = os.path.join(temp_dir, 'index.sqlite')
+            address_index = AddressIndex(index_path)
+            address_index.ingest_block(1, BLOCK_1)
+            address_index.close()
+
+            # Assert that a new index object finds the ingested block
+            address_index = AddressIndex(index_path)
+            self.assertTrue(address_index.has_address('address_a'))
+            address_index.close()
+
+    def test_block_monitoring_fills_index(self):
+        address_index = AddressIndex()
+        with StubApiServer({'/rawblock/1': BLOCK_1, '/rawblock/2': BLOCK_2}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            self.assertEqual(BtcBlockMonitoring(1, 2, api_client=client).index_btc_blocks(address_index), 2)
+            client.close()
+
+        self.assertEqual(address_index.get_balance('address_a'), 1900)
+        address_index.close()
+
+    @patch('requests.Session.get')
+    def test_address_monitoring_queries_complete_index_first(self, mock_get):
+        self.address_index.ingest_block(0, {'hash': 'block_hash_0', 'tx': []})
+        self.assertTrue(self.address_index.is_complete())
+        monitor = BtcAddressMonitoring('address_b', address_index=self.address_index)
+
+        # Assert that an indexed address is answered without API request
+        self.assertEqual(monitor.get_balance_of_btc_address(), 3000)
+        self.assertEqual(monitor.get_transactions_from_btc_address(), [('address_a', 'address_b', 3000)])
+        mock_get.assert_not_called()
+
+        # Assert that an unknown address falls back to the API
+        mock_get.return_value.content = b'{"final_balance": 42, "txs": []}'
+        self.assertEqual(BtcAddressMonitoring('address_c', address_index=self.address_index)
+                         .get_balance_of_btc_address(), 42)
+
+    @patch('requests.Session.get')
+    def test_address_monitoring_ignores_partial_index(self, mock_get):
+        # Assert that an index without the genesis block does not answer with the balance of its range
+        self.assertFalse(self.address_index.is_complete())
+        mock_get.return_value.content = b'{"final_balance": 42, "txs": []}'
+        self.assertEqual(BtcAddressMonitoring('address_b', address_index=self.address_index)
+                         .get_balance_of_btc_address(), 42)
+        mock_get.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
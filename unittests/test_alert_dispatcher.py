@@ -0,0 +1,137 @@
+#############################################################
+# @file     test_alert_dispatcher.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import unittest
+
+from alert_dispatcher import AlertDispatcher, SmsRejectedError, TokenBucket, check_sms_response
+from chain_fixtures import FakeClock, FakeSmsBackend
+
+
+class TestAlertDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeSmsBackend()
+
+    def test_alerts_of_a_recipient_are_coalesced(self):
+        dispatcher = AlertDispatcher('+100', backend=self.backend, max_alerts_per_message=2)
+        for i in range(3):
+            dispatcher.submit('+200', f"alert {i}")
+        dispatcher.submit('+300', 'single alert')
+
+        # Assert that every recipient gets one message and long lists are cut
+        self.assertEqual(dispatcher.flush(), 2)
+        self.assertEqual(self.backend.messages, [
+            ('+100', '+200', '3 alerts:\nalert 0\nalert 1\n... and 1 more'),
+            ('+100', '+300', 'single alert')
+        ])
+
+    def test_duplicates_are_dropped_within_the_window(self):
+        clock = FakeClock()
+        dispatcher = AlertDispatcher('+100', backend=self.backend, dedup_seconds=60, clock=clock)
+
+        self.assertTrue(dispatcher.submit('+200', 'alert', dedup_key='hash_1'))
+        self.assertFalse(dispatcher.submit('+200', 'alert again', dedup_key='hash_1'))
+        self.assertTrue(dispatcher.submit('+300', 'alert', dedup_key='hash_1'))
+
+        # After the window the same key is accepted again
+        clock.now += 61
+        self.assertTrue(dispatcher.submit('+200', 'alert', dedup_key='hash_1'))
+        self.assertEqual(dispatcher.get_statistics()['deduplicated_alerts'], 1)
+
+    def test_failed_messages_are_counted(self):
+        backend = FakeSmsBackend(fail_recipients=['+200'])
+        dispatcher = AlertDispatcher('+100', backend=backend)
+        dispatcher.submit('+200', 'lost alert')
+        dispatcher.submit('+300', 'alert')
+
+        self.assertEqual(dispatcher.flush(), 1)
+        self.assertEqual(dispatcher.get_statistics()['retried_messages'], 3)
+        self.assertEqual(dispatcher.get_statistics()['failed_messages'], 1)
+        self.assertEqual(dispatcher.get_statistics()['sent_messages'], 1)
+
+        # Assert that the dropped alert is not deduplicated against a new submission
+        self.assertTrue(dispatcher.submit('+200', 'lost alert'))
+
+    def test_rejected_messages_are_retried(self):
+        # The Nexmo API answers a throttled message with HTTP 200 and a non-zero status
+        class ThrottledBackend(FakeSmsBackend):
+            def send_message(self, from_number, to_number, message_text):
+                super().send_message(from_number, to_number, message_text)
+                return {'message-count': '1',
+                        'messages': [{'to': to_number, 'status': '1', 'error-text': 'Throttled'}]}
+
+        dispatcher = AlertDispatcher('+100', backend=ThrottledBackend())
+        dispatcher.submit('+200', 'alert')
+
+        # Assert that the rejected message is not counted as sent but retried and dropped
+        self.assertEqual(dispatcher.flush(), 0)
+        self.assertEqual(dispatcher.get_statistics()['sent_messages'], 0)
+        self.assertEqual(dispatcher.get_statistics()['retried_messages'], 3)
+        self.assertEqual(dispatcher.get_statistics()['failed_messages'], 1)
+
+    def test_nexmo_response_status(self):
+        response = {'message-count': '1', 'messages': [{'to': '+200', 'status': '0'}]}
+        self.assertIs(check_sms_response(response), response)
+        with self.assertRaises(SmsRejectedError):
+            check_sms_response({'messages': [{'to': '+200', 'status': '0'}, {'to': '+200', 'status': 4}]})
+
+    def test_failed_message_is_retried(self):
+        backend = FakeSmsBackend(fail_recipients=['+200'])
+        clock = FakeClock()
+        dispatcher = AlertDispatcher('+100', backend=backend, coalesce_seconds=0, retry_seconds=30, clock=clock)
+        dispatcher.submit('+200', 'alert a')
+        dispatcher._add_pending(*dispatcher._queue.get_nowait())
+        self.assertEqual(dispatcher._send_pending(), 0)
+
+        # Assert that the retry waits for the retry delay and includes the alerts of the meantime
+        backend.fail_recipients.clear()
+        dispatcher.submit('+200', 'alert b')
+        dispatcher._add_pending(*dispatcher._queue.get_nowait())
+        self.assertEqual(dispatcher._get_next_deadline(), 30)
+        self.assertEqual(dispatcher._send_pending(), 0)
+
+        clock.now += 30
+        self.assertEqual(dispatcher._send_pending(), 1)
+        self.assertEqual(backend.messages, [('+100', '+200', '2 alerts:\nalert a\nalert b')])
+        self.assertFalse(dispatcher.submit('+200', 'alert a'))
+
+    def test_dispatcher_thread_coalesces_and_rate_limits(self):
+        rate_limiter = TokenBucket(rate=20, capacity=1)
+        dispatcher = AlertDispatcher('+100', backend=self.backend, rate_limiter=rate_limiter, coalesce_seconds=0.1)
+        dispatcher.start()
+
+        # Alerts of 5 recipients within the coalescing window, 2 of them for the first recipient
+        dispatcher.submit('+200', 'alert a')
+        for i in range(4):
+            dispatcher.submit(f"+30{i}", 'alert')
+        dispatcher.submit('+200', 'alert b')
+        dispatcher.stop(timeout=5)
+
+        # Assert that the 5 messages were sent at no more than 20 per second after the first token
+        self.assertEqual(len(self.backend.messages), 5)
+        self.assertEqual(self.backend.messages[0][2], '2 alerts:\nalert a\nalert b')
+        self.assertGreaterEqual(self.backend.send_times[-1] - self.backend.send_times[0], 4 / 20 * 0.9)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_and_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        # The burst is available immediately, then one token every half second
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        self.assertEqual(bucket.get_wait_time(), 0.5)
+        bucket.acquire()
+        self.assertEqual(clock.now, 0.5)
+
+        # The bucket never holds more than its capacity
+        clock.now += 100
+        self.assertEqual(sum(bucket.try_acquire() for _ in range(10)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
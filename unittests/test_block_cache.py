@@ -0,0 +1,120 @@
+#############################################################
+# @file     test_block_cache.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import os
+import tempfile
+import unittest
+from functools import partial
+
+from block_cache import BlockCache
+from btc_api_client import BtcApiClient
+from btc_parser import BtcBlockMonitoring
+from chain_fixtures import create_block
+from stub_api_server import StubApiServer
+
+# Creates a block with an incompressible payload of roughly 2 kB, so its size in the cache is predictable
+create_cache_block = partial(create_block, payload_size=2000)
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_and_put(self):
+        cache = BlockCache(self.cache_dir, min_confirmations=0)
+        block = create_cache_block(1)
+
+        # Assert that a miss is counted before the block is stored and a hit afterwards
+        self.assertIsNone(cache.get(1))
+        cache.put(1, block)
+        self.assertEqual(cache.get(1), block)
+        self.assertEqual(cache.get('hash_1'), block)
+        self.assertEqual(cache.get_statistics()['hits'], 2)
+        self.assertEqual(cache.get_statistics()['misses'], 1)
+
+    def test_cache_survives_restart(self):
+        BlockCache(self.cache_dir, min_confirmations=0).put(1, create_cache_block(1))
+
+        # Assert that a new cache object finds the block on disk
+        cache = BlockCache(self.cache_dir)
+        self.assertEqual(cache.get(1)['hash'], 'hash_1')
+        self.assertEqual(cache.get_statistics()['blocks'], 1)
+
+    def test_lru_eviction(self):
+        cache = BlockCache(self.cache_dir, min_confirmations=0)
+        cache.put(1, create_cache_block(1))
+        cache.put(2, create_cache_block(2))
+
+        # Use block 1 so that block 2 becomes the least recently used block
+        cache.get(1)
+        cache.max_bytes = cache.size_bytes + 100
+        cache.put(3, create_cache_block(3))
+
+        # Assert that block 2 was evicted and the cache is within its limit
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNotNone(cache.get(3))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_blocks_near_the_tip_are_not_cached(self):
+        cache = BlockCache(self.cache_dir, min_confirmations=6)
+        cache.set_tip_height(10)
+
+        # Assert that block 5 (6 confirmations) is stored but block 6 (5 confirmations) is not
+        self.assertTrue(cache.put(5, create_cache_block(5)))
+        self.assertFalse(cache.put(6, create_cache_block(6)))
+        self.assertIsNone(cache.get(6))
+
+        # Assert that a block is stored once the tip has grown
+        cache.set_tip_height(11)
+        self.assertTrue(cache.put(6, create_cache_block(6)))
+
+    def test_unknown_tip_is_the_highest_stored_block(self):
+        cache = BlockCache(self.cache_dir, min_confirmations=3)
+        self.assertFalse(cache.put(1, create_cache_block(1)))
+        self.assertFalse(cache.put(3, create_cache_block(3)))
+
+        # Assert that block 1 has 3 confirmations once block 3 was seen
+        self.assertEqual(cache.tip_height, 3)
+        self.assertTrue(cache.put(1, create_cache_block(1)))
+
+    def test_replaced_block_is_a_miss(self):
+        cache = BlockCache(self.cache_dir, min_confirmations=0)
+        cache.put(1, create_cache_block(1))
+
+        # Assert that a block of another hash at the height is removed when the expected hash is known
+        self.assertIsNotNone(cache.get(1, expected_hash='hash_1'))
+        self.assertIsNone(cache.get(1, expected_hash='hash_of_the_new_block'))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.get_statistics()['blocks'], 0)
+
+    def test_block_monitoring_uses_cache(self):
+        routes = {f"/rawblock/{block_num}": create_cache_block(block_num) for block_num in range(1, 4)}
+        routes['/latestblock'] = {'height': 100}
+        cache = BlockCache(self.cache_dir)
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url)
+
+            # Scan the range twice
+            first_scan = list(BtcBlockMonitoring(1, 3, api_client=client, block_cache=cache).iter_btc_blocks())
+            second_scan = list(BtcBlockMonitoring(1, 3, api_client=client, block_cache=cache).iter_btc_blocks())
+            client.close()
+
+        # Assert that the second scan was answered from the cache only, the tip is requested per scan
+        self.assertEqual(first_scan, second_scan)
+        self.assertEqual(len([path for path in server.requests if path.startswith('/rawblock/')]), 3)
+        self.assertEqual(cache.get_statistics()['hits'], 3)
+        self.assertEqual(cache.get_statistics()['misses'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
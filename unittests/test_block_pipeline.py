@@ -0,0 +1,69 @@
+#############################################################
+# @file     test_block_pipeline.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import tempfile
+import unittest
+
+from block_cache import BlockCache
+from block_pipeline import BlockPipeline
+from btc_api_client import BtcApiClient
+from btc_parser import BtcBlockMonitoring
+from chain_fixtures import create_block
+from stub_api_server import StubApiServer
+
+
+class TestBlockPipeline(unittest.TestCase):
+
+    def test_results_are_merged_in_block_order(self):
+        routes = {f"/rawblock/{block_num}": create_block(block_num, payment=True) for block_num in range(10, 30)}
+        with StubApiServer(routes, delay=0.01) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            block_monitor = BtcBlockMonitoring(10, 29, api_client=client, max_workers=3)
+            results = list(block_monitor.iter_btc_block_analyses(process_workers=2))
+            client.close()
+
+        # Assert that every block was analyzed once and the results keep the block order
+        self.assertEqual([block_num for block_num, _ in results], list(range(10, 30)))
+        for block_num, analysis in results:
+            self.assertEqual(analysis.block_hash, f"hash_{block_num}")
+            self.assertEqual(analysis.tx_count, 2)
+            self.assertEqual([candidate.tx_hash for candidate in analysis.candidates], [f"mix_{block_num}"])
+            self.assertEqual([record.tx_hash for record in analysis.mix_records], [f"mix_{block_num}"])
+        self.assertEqual(sorted(server.requests), sorted(routes))
+
+    def test_failed_and_invalid_blocks_are_skipped(self):
+        routes = {'/rawblock/1': create_block(1, payment=True), '/rawblock/2': (404, {'error': 'not found'}),
+                  '/rawblock/3': b'{not json', '/rawblock/4': create_block(4, payment=True)}
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url, max_retries=0)
+            results = list(BlockPipeline(client, process_workers=2).iter_block_analyses([1, 2, 3, 4]))
+            client.close()
+
+        self.assertEqual([block_num for block_num, _ in results], [1, 2, 3, 4])
+        self.assertEqual([analysis is None for _, analysis in results], [False, True, True, False])
+
+    def test_downloaded_blocks_are_cached(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = BlockCache(cache_dir)
+            routes = {'/rawblock/5': create_block(5, payment=True), '/latestblock': {'height': 100}}
+            with StubApiServer(routes) as server:
+                client = BtcApiClient(base_url=server.base_url)
+                first = list(BlockPipeline(client, process_workers=1, block_cache=cache).iter_block_analyses([5]))
+                second = list(BlockPipeline(client, process_workers=1, block_cache=cache).iter_block_analyses([5]))
+                client.close()
+
+            # Assert that the second run is served from the cache under the hash of the block
+            self.assertEqual(first, second)
+            self.assertEqual(server.requests, ['/latestblock', '/rawblock/5', '/latestblock'])
+            self.assertEqual(cache.get('hash_5'), create_block(5, payment=True))
+
+    def test_unknown_json_backend(self):
+        with self.assertRaises(ValueError):
+            BlockPipeline(BtcApiClient(), json_backend='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
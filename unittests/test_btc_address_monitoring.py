@@ -4,6 +4,7 @@
 # @date     23.12.2022
 #############################################################
 
+import json
 import unittest
 from unittest.mock import patch
 
@@ -16,11 +17,11 @@ test_monitor = BtcAddressMonitoring('watch_address')
 
 class TestBtcAddressMonitoring(unittest.TestCase):
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_is_tx_transaction_from_btc_address(self, mock_get):
         # Set up the mock response to return a JSON dictionary with a transaction
         # where the watchAddress sends BTC
-        mock_get.return_value.json.return_value = {
+        mock_get.return_value.content = json.dumps({
             'txs': [{
                 'inputs': [{
                     'prev_out': {
@@ -28,7 +29,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
                     }
                 }]
             }]
-        }
+        }).encode()
 
         # Call the function with the watchAddress
         result = test_monitor.is_tx_transaction_from_btc_address()
@@ -36,17 +37,17 @@ class TestBtcAddressMonitoring(unittest.TestCase):
         # Assert that the function returns True
         self.assertTrue(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_is_rx_transaction_to_btc_address(self, mock_get):
         # Set up the mock response to return a JSON dictionary with a transaction
         # where the watchAddress receives BTC
-        mock_get.return_value.json.return_value = {
+        mock_get.return_value.content = json.dumps({
             'txs': [{
                 'out': [{
                     'addr': 'watch_address'
                 }]
             }]
-        }
+        }).encode()
 
         # Call the function with the watchAddress
         result = test_monitor.is_rx_transaction_to_btc_address()
@@ -54,11 +55,11 @@ class TestBtcAddressMonitoring(unittest.TestCase):
         # Assert that the function returns True
         self.assertTrue(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_does_not_send_or_receive_btc(self, mock_get):
         # Set up the mock response to return a JSON dictionary with a transaction
         # where the watchAddress does not send or receive BTC
-        mock_get.return_value.json.return_value = {
+        mock_get.return_value.content = json.dumps({
             'txs': [{
                 'inputs': [{
                     'prev_out': {
@@ -69,7 +70,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
                     'addr': 'other_address'
                 }]
             }]
-        }
+        }).encode()
 
         # Call the functions with the watchAddress
         tx_result = test_monitor.is_tx_transaction_from_btc_address()
@@ -79,7 +80,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
         self.assertFalse(tx_result)
         self.assertFalse(rx_result)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_api_error(self, mock_get):
         # Set up the mock to raise an exception when called
         mock_get.side_effect = Exception
@@ -138,10 +139,10 @@ class TestBtcAddressMonitoring(unittest.TestCase):
             "n_tx": 2
         }
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_transactions_success(self, mock_get):
         # Test the function when the API request is successful
-        mock_get.return_value.json.return_value = self.mock_response
+        mock_get.return_value.content = json.dumps(self.mock_response).encode()
         mock_get.return_value.raise_for_status.return_value = None
         expected_result = [
             ("1F1tAaz5x1HUXrCNLbtMDqcw6o5GNn4xqX", "1F1tAaz5x1HUXrCNLbtMDqcw6o5GNn4xqX", 1000000),
@@ -154,7 +155,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
         # Assert that the function returns the expected result
         self.assertEqual(result, expected_result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_transactions_api_error(self, mock_get):
         # Test the function when the API request returns an error
         mock_get.return_value.raise_for_status.side_effect = requests.exceptions.RequestException
@@ -166,7 +167,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
         # Assert that the function returns an empty list when the API request fails
         self.assertEqual(result, expected_result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_transactions_invalid_data(self, mock_get):
         # Test the function when the API response contains transactions without input or output addresses or amounts
         mock_response = {
@@ -206,7 +207,7 @@ class TestBtcAddressMonitoring(unittest.TestCase):
                 }
             ]
         }
-        mock_get.return_value.json.return_value = mock_response
+        mock_get.return_value.content = json.dumps(mock_response).encode()
         mock_get.return_value.raise_for_status.return_value = None
         expected_result = []
 
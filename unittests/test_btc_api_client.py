@@ -0,0 +1,120 @@
+#############################################################
+# @file     test_btc_api_client.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import asyncio
+import unittest
+
+import requests
+
+from btc_api_client import BtcApiClient
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring
+from stub_api_server import StubApiServer
+
+UNCONFIRMED_TRANSACTIONS = {
+    'txs': [{
+        'hash': 'hash_1',
+        'inputs': [{'prev_out': {'addr': 'watch_address', 'value': 3000}}],
+        'out': [{'addr': 'receiver_address', 'value': 2000}, {'addr': 'watch_address', 'value': 900}]
+    }]
+}
+
+
+class TestBtcApiClient(unittest.TestCase):
+
+    def test_get_json(self):
+        with StubApiServer({'/rawblock/1': {'tx': []}}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+
+            # Assert that the canned JSON response is returned
+            self.assertEqual(client.get_json('/rawblock/1'), {'tx': []})
+            client.close()
+
+    def test_http_error(self):
+        with StubApiServer({'/rawblock/1': (429, {'error': 'rate limit'})}) as server:
+            client = BtcApiClient(base_url=server.base_url, max_retries=0)
+
+            # Assert that HTTP errors are raised as RequestException
+            with self.assertRaises(requests.exceptions.RequestException):
+                client.get_json('/rawblock/1')
+            client.close()
+
+    def test_timeout(self):
+        with StubApiServer({'/rawblock/1': {'tx': []}}, delay=0.5) as server:
+            client = BtcApiClient(base_url=server.base_url, timeout=0.1, max_retries=0)
+
+            # Assert that a stalled request does not block forever
+            with self.assertRaises(requests.exceptions.Timeout):
+                asyncio.run(client.fetch_json('/rawblock/1'))
+            client.close()
+
+    def test_rate_limit_is_retried(self):
+        responses = iter([(429, {'error': 'rate limit'}), (503, {'error': 'unavailable'}), {'tx': []}])
+        with StubApiServer({'/rawblock/1': lambda: next(responses)}) as server:
+            client = BtcApiClient(base_url=server.base_url, backoff=0.01)
+
+            # Assert that the request succeeds after two retries
+            self.assertEqual(client.get_json('/rawblock/1'), {'tx': []})
+            self.assertEqual(len(server.requests), 3)
+            client.close()
+
+    def test_long_retry_after_fails_the_request(self):
+        client = BtcApiClient(backoff=1.0, max_retries=3)
+        for retry_after, expected_delay in (('30', 30.0), ('60', 60.0), ('3600', None)):
+            response = requests.Response()
+            response.status_code = 429
+            response.headers['Retry-After'] = retry_after
+            error = requests.exceptions.HTTPError(response=response)
+
+            # Assert that the API may ask for the backoff of all retries or a minute, not more
+            self.assertEqual(client._get_retry_delay(0, error), expected_delay)
+        client.close()
+
+    def test_client_errors_are_not_retried(self):
+        with StubApiServer() as server:
+            client = BtcApiClient(base_url=server.base_url, backoff=0.01)
+
+            # Assert that a 404 fails immediately
+            with self.assertRaises(requests.exceptions.HTTPError):
+                asyncio.run(client.fetch_json('/rawblock/1'))
+            self.assertEqual(len(server.requests), 1)
+            client.close()
+
+    def test_fetch_many_is_bounded_and_ordered(self):
+        routes = {f"/rawblock/{block_num}": {'height': block_num} for block_num in range(10)}
+        with StubApiServer(routes, delay=0.05) as server:
+            client = BtcApiClient(base_url=server.base_url, max_in_flight=3)
+            results = asyncio.run(client.fetch_many_json([f"/rawblock/{block_num}" for block_num in range(10)]))
+            client.close()
+
+        # Assert that the results keep the order of the paths and the concurrency limit was respected
+        self.assertEqual([result['height'] for result in results], list(range(10)))
+        self.assertLessEqual(server.max_concurrent_requests, 3)
+        self.assertGreater(server.max_concurrent_requests, 1)
+
+    def test_monitoring_against_stub_server(self):
+        routes = {
+            '/unconfirmed-transactions?format=json': UNCONFIRMED_TRANSACTIONS,
+            '/rawblock/5': {'tx': []}
+        }
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            monitor = BtcAddressMonitoring('watch_address', api_client=client)
+
+            # Assert that the synchronous wrappers and the asyncio variants give the same results
+            self.assertTrue(monitor.is_tx_transaction_from_btc_address())
+            self.assertTrue(monitor.is_rx_transaction_to_btc_address())
+            self.assertTrue(asyncio.run(monitor.is_tx_transaction_from_btc_address_async()))
+            self.assertTrue(asyncio.run(monitor.is_rx_transaction_to_btc_address_async()))
+
+            # Assert that the block monitoring uses the same client
+            block_monitor = BtcBlockMonitoring(5, 5, api_client=client)
+            self.assertEqual(block_monitor.get_btc_block(5), {'tx': []})
+            self.assertIsNone(block_monitor.get_btc_block(6))
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#############################################################
+# @file     test_btc_block_monitoring.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import unittest
+
+from btc_api_client import BtcApiClient
+from btc_parser import BtcBlockMonitoring
+from chain_fixtures import create_block, create_transaction
+from stub_api_server import StubApiServer
+from transaction_table import TX_DIRECTION_CODE
+
+
+# Creates a block with one CoinJoin-like transaction whose addresses contain the block number
+def create_scan_block(block_num):
+    return create_block(block_num, [create_transaction(
+        f"hash_{block_num}", [(f"sender_{block_num}_a", 1000), (f"sender_{block_num}_b", 2000)],
+        [(f"receiver_{block_num}_a", 1500), (f"receiver_{block_num}_b", 1500)])])
+
+
+class TestBtcBlockMonitoring(unittest.TestCase):
+
+    def test_range_scan_is_concurrent_and_ordered(self):
+        routes = {f"/rawblock/{block_num}": create_scan_block(block_num) for block_num in range(100, 120)}
+        with StubApiServer(routes, delay=0.02) as server:
+            client = BtcApiClient(base_url=server.base_url, max_in_flight=3)
+            block_monitor = BtcBlockMonitoring(100, 119, api_client=client, max_workers=5)
+            blocks = list(block_monitor.iter_btc_blocks())
+            client.close()
+
+        # Assert that the blocks are merged in block order and the in-flight cap was respected
+        self.assertEqual([block_num for block_num, _ in blocks], list(range(100, 120)))
+        self.assertEqual([block_data['height'] for _, block_data in blocks], list(range(100, 120)))
+        self.assertLessEqual(server.max_concurrent_requests, 3)
+        self.assertGreater(server.max_concurrent_requests, 1)
+
+    def test_range_scan_keeps_a_sliding_window(self):
+        routes = {f"/rawblock/{block_num}": create_scan_block(block_num) for block_num in range(100, 140)}
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            blocks = BtcBlockMonitoring(100, 139, api_client=client, max_workers=2).iter_btc_blocks()
+
+            # Assert that only the window after the yielded block is requested and a closed scan stops
+            self.assertEqual(next(blocks)[0], 100)
+            self.assertEqual(next(blocks)[0], 101)
+            blocks.close()
+            self.assertLessEqual(len(server.requests), 6)
+            client.close()
+
+    def test_get_mixed_btc_transactions_from_btc_blocks(self):
+        routes = {f"/rawblock/{block_num}": create_scan_block(block_num) for block_num in (1, 3)}
+        routes['/rawblock/2'] = (429, {'error': 'rate limit'})
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url, max_retries=1, backoff=0.01)
+            matrix = BtcBlockMonitoring(1, 3, api_client=client).get_mixed_btc_transactions_from_btc_blocks()
+            client.close()
+
+        # Assert that the failing block is skipped after its retry and the others are kept in order
+        self.assertEqual(matrix, [
+            ['sender_1_a', 'receiver_1_a', 1000],
+            ['sender_1_b', 'receiver_1_b', 2000],
+            ['sender_3_a', 'receiver_3_a', 1000],
+            ['sender_3_b', 'receiver_3_b', 2000]
+        ])
+        self.assertEqual(server.requests.count('/rawblock/2'), 2)
+
+    def test_get_mixed_btc_transactions_pairs_within_transaction(self):
+        block = create_scan_block(5)
+
+        # A transaction with more inputs than outputs must not take the outputs of the next transaction
+        block['tx'][0]['inputs'].append({'prev_out': {'addr': 'sender_5_c', 'value': 3000}})
+        block['tx'].append({'hash': 'second', 'inputs': [{'prev_out': {'addr': addr, 'value': 1}} for addr in 'xyz'],
+                            'out': [{'addr': 'u', 'value': 1}, {'addr': 'v', 'value': 2}]})
+
+        with StubApiServer({'/rawblock/5': block}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            matrix = BtcBlockMonitoring(5, 5, api_client=client).get_mixed_btc_transactions_from_btc_blocks()
+            client.close()
+
+        self.assertEqual(matrix, [
+            ['sender_5_a', 'receiver_5_a', 1000],
+            ['sender_5_b', 'receiver_5_b', 2000],
+            ['sender_5_c', None, 3000],
+            ['x', 'u', 1],
+            ['y', 'v', 1],
+            ['z', None, 1]
+        ])
+
+    def test_iter_coinjoin_records_from_btc_blocks(self):
+        block = create_scan_block(9)
+
+        # Add a transaction with four equal outputs from four distinct senders
+        block['tx'].append({
+            'hash': 'mix',
+            'inputs': [{'prev_out': {'addr': f"participant_{i}", 'value': 10500}} for i in range(4)],
+            'out': [{'addr': f"fresh_{i}", 'value': 10000} for i in range(4)]
+        })
+
+        with StubApiServer({'/rawblock/9': block}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            records = list(BtcBlockMonitoring(9, 9, api_client=client).iter_coinjoin_records_from_btc_blocks())
+            client.close()
+
+        # Assert that only the four-party mix reaches the default score
+        self.assertEqual([record.tx_hash for record in records], ['mix'])
+        self.assertEqual(records[0].participant_count, 4)
+        self.assertEqual(records[0].equal_output_value, 10000)
+
+    def test_iter_mixed_btc_transactions_from_btc_blocks(self):
+        block = create_scan_block(7)
+
+        # Add a simple payment that is not a CoinJoin candidate and an output without address
+        block['tx'].append({'hash': 'payment', 'inputs': [{'prev_out': {'addr': 'a', 'value': 5}}],
+                            'out': [{'addr': 'b', 'value': 4}]})
+        block['tx'][0]['out'].append({'value': 0})
+
+        with StubApiServer({'/rawblock/7': block, '/rawblock/8': create_scan_block(8)}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            candidates = BtcBlockMonitoring(7, 8, api_client=client).iter_mixed_btc_transactions_from_btc_blocks()
+
+            # Assert that the first candidate is available before the range is consumed
+            candidate = next(candidates)
+            self.assertEqual(candidate.block_num, 7)
+            self.assertEqual(candidate.tx_hash, 'hash_7')
+            self.assertEqual(candidate.inputs, [('sender_7_a', 1000), ('sender_7_b', 2000)])
+            self.assertEqual(candidate.outputs, [('receiver_7_a', 1500), ('receiver_7_b', 1500), (None, 0)])
+
+            # Assert that the payment is skipped
+            self.assertEqual([candidate.tx_hash for candidate in candidates], ['hash_8'])
+            client.close()
+
+    def test_get_mixed_transaction_table_from_btc_blocks(self):
+        with StubApiServer({'/rawblock/1': create_scan_block(1), '/rawblock/2': create_scan_block(2)}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            table = BtcBlockMonitoring(1, 2, api_client=client).get_mixed_transaction_table_from_btc_blocks()
+            client.close()
+
+        # Assert that every input and output is a row and the block heights are kept
+        self.assertEqual(len(table), 8)
+        self.assertEqual(table.block_height.tolist(), [1, 1, 1, 1, 2, 2, 2, 2])
+        self.assertEqual(table.sum_by_address(TX_DIRECTION_CODE).sum(), 6000)
+        self.assertEqual(len(table.top_receivers(10)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+#############################################################
+# @file     test_chain_data_source.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring
+from chain_data_source import (BitcoinCoreRpcDataSource, BlockchainInfoDataSource, DataSourceError, RecordingDataSource,
+                               ReplayDataSource, RpcError, UnsupportedQueryError, map_rpc_transaction)
+from chain_fixtures import create_block
+from mempool_monitoring import BtcWatchlistMonitoring
+
+
+# Writes a JSON file of a replay directory
+def write_replay_file(replay_dir, sub_dir, file_name, data, compress=False):
+    os.makedirs(os.path.join(replay_dir, sub_dir), exist_ok=True)
+    payload = json.dumps(data).encode()
+    with (gzip.open if compress else open)(os.path.join(replay_dir, sub_dir, file_name), 'wb') as replay_file:
+        replay_file.write(payload)
+
+
+# Creates a transaction of getrawtransaction verbosity 2 with the previous outputs
+def create_rpc_transaction(txid, sender, receiver):
+    return {
+        'txid': txid,
+        'vin': [{'txid': 'prev', 'vout': 0,
+                 'prevout': {'value': 0.0001, 'scriptPubKey': {'address': sender}}}],
+        'vout': [{'n': 0, 'value': 0.00009, 'scriptPubKey': {'address': receiver}},
+                 {'n': 1, 'value': 0.0, 'scriptPubKey': {'type': 'nulldata'}}]
+    }
+
+
+# Creates a mocked HTTP response of bitcoind
+def create_rpc_response(body):
+    response = MagicMock()
+    response.content = json.dumps(body).encode()
+    return response
+
+
+class TestReplayDataSource(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.replay_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_blocks_are_read_plain_and_compressed(self):
+        write_replay_file(self.replay_dir, 'blocks', '10.json', create_block(10))
+        write_replay_file(self.replay_dir, 'blocks', '11.json.gz', create_block(11), compress=True)
+        write_replay_file(self.replay_dir, 'blocks', '12_hash_12.json.gz', create_block(12), compress=True)
+        data_source = ReplayDataSource(self.replay_dir)
+
+        # The recorded blocks are analyzed without any network access
+        block_monitor = BtcBlockMonitoring(10, 12, data_source=data_source)
+        records = list(block_monitor.iter_coinjoin_records_from_btc_blocks())
+        self.assertEqual([record.block_num for record in records], [10, 11, 12])
+
+        with self.assertRaises(DataSourceError):
+            data_source.get_block(13)
+
+    def test_mempool_snapshots_are_replayed_in_order(self):
+        write_replay_file(self.replay_dir, 'mempool', '00000000.json', {'txs': [
+            {'hash': 'tx_1', 'inputs': [{'prev_out': {'addr': 'sender', 'value': 1000}}],
+             'out': [{'addr': 'receiver', 'value': 900}]}]})
+        write_replay_file(self.replay_dir, 'mempool', '00000001.json', {'txs': [
+            {'hash': 'tx_2', 'inputs': [{'prev_out': {'addr': 'other', 'value': 1000}}],
+             'out': [{'addr': 'sender', 'value': 900}]},
+            {'hash': 'tx_1', 'inputs': [{'prev_out': {'addr': 'sender', 'value': 1000}}],
+             'out': [{'addr': 'receiver', 'value': 900}]}]})
+        data_source = ReplayDataSource(self.replay_dir)
+        watchlist = BtcWatchlistMonitoring(['sender'], data_source=data_source)
+
+        # Every poll replays the next snapshot, only the new transactions are reported
+        self.assertEqual([tx_hash for tx_hash, _, _ in watchlist.get_new_transaction_events()], ['tx_1'])
+        self.assertFalse(data_source.is_mempool_exhausted())
+        self.assertEqual([tx_hash for tx_hash, _, _ in watchlist.get_new_transaction_events()], ['tx_2'])
+        self.assertTrue(data_source.is_mempool_exhausted())
+
+        # The last snapshot is repeated afterwards
+        self.assertEqual(watchlist.get_new_transaction_events(), [])
+
+    def test_missing_mempool_is_reported(self):
+        watchlist = BtcWatchlistMonitoring(['sender'], data_source=ReplayDataSource(self.replay_dir))
+        self.assertFalse(watchlist.update_mempool_snapshot())
+
+    def test_address_history_is_paged(self):
+        transactions = [{'hash': f"tx_{i}", 'inputs': [], 'out': []} for i in range(5)]
+        write_replay_file(self.replay_dir, 'addresses', 'watched.json',
+                          {'address': 'watched', 'n_tx': 5, 'final_balance': 4200, 'txs': transactions})
+        data_source = ReplayDataSource(self.replay_dir)
+
+        page = data_source.get_address_transactions('watched', limit=2, offset=2)
+        self.assertEqual([tx['hash'] for tx in page['txs']], ['tx_2', 'tx_3'])
+        self.assertEqual(page['n_tx'], 5)
+
+        address_monitor = BtcAddressMonitoring('watched', data_source=data_source)
+        self.assertEqual(address_monitor.get_balance_of_btc_address(), 4200)
+
+
+class TestRecordingDataSource(unittest.TestCase):
+
+    def test_recorded_queries_can_be_replayed(self):
+        live_source = MagicMock()
+        live_source.get_block.return_value = create_block(7)
+        live_source.get_unconfirmed_transactions.return_value = {'txs': [{'hash': 'tx_1'}]}
+        live_source.get_address_transactions.return_value = {'n_tx': 1, 'final_balance': 5, 'txs': [{'hash': 'tx_1'}]}
+
+        with tempfile.TemporaryDirectory() as replay_dir:
+            recorder = RecordingDataSource(live_source, replay_dir)
+            recorder.get_block(7)
+            recorder.get_unconfirmed_transactions()
+            recorder.get_address_transactions('watched', limit=50)
+
+            replay = ReplayDataSource(replay_dir)
+            self.assertEqual(replay.get_block(7), create_block(7))
+            self.assertEqual(replay.get_unconfirmed_transactions(), {'txs': [{'hash': 'tx_1'}]})
+            self.assertEqual(replay.get_address_balance('watched'), 5)
+
+
+class TestBitcoinCoreRpcDataSource(unittest.TestCase):
+
+    def test_transaction_is_mapped_to_blockchain_info_format(self):
+        transaction = map_rpc_transaction(create_rpc_transaction('tx_1', 'sender', 'receiver'), tx_time=1700000000)
+
+        self.assertEqual(transaction['hash'], 'tx_1')
+        self.assertEqual(transaction['inputs'][0]['prev_out'],
+                         {'tx_hash': 'prev', 'n': 0, 'value': 10000, 'addr': 'sender'})
+        self.assertEqual(transaction['out'][0], {'n': 0, 'value': 9000, 'addr': 'receiver'})
+        self.assertNotIn('addr', transaction['out'][1])
+        self.assertEqual(transaction['time'], 1700000000)
+
+    @patch('requests.Session.post')
+    def test_mempool_is_requested_in_batches(self, mock_post):
+        def respond(url, json=None, timeout=None):
+            if isinstance(json, dict):
+                # getrawmempool with the entry time of every transaction
+                return create_rpc_response({'id': json['id'], 'error': None,
+                                            'result': {'tx_1': {'time': 10}, 'tx_2': {'time': 20},
+                                                       'tx_gone': {'time': 30}}})
+
+            responses = []
+            for request in json:
+                txid = request['params'][0]
+                if txid == 'tx_gone':
+                    # The transaction left the memory pool after getrawmempool
+                    responses.append({'id': request['id'], 'result': None,
+                                      'error': {'code': -5, 'message': 'No such mempool transaction'}})
+                else:
+                    responses.append({'id': request['id'], 'error': None,
+                                      'result': create_rpc_transaction(txid, f"sender_{txid}", 'receiver')})
+            return create_rpc_response(responses)
+
+        mock_post.side_effect = respond
+        data_source = BitcoinCoreRpcDataSource(batch_size=2)
+
+        unconfirmed_transactions = data_source.get_unconfirmed_transactions()
+        self.assertEqual([tx['hash'] for tx in unconfirmed_transactions['txs']], ['tx_2', 'tx_1'])
+        self.assertEqual(mock_post.call_count, 3)
+
+        # The monitors work unchanged on top of the node
+        watchlist = BtcWatchlistMonitoring(['sender_tx_1'], data_source=data_source)
+        self.assertTrue(watchlist.update_mempool_snapshot())
+        self.assertTrue(watchlist.is_tx_transaction_from_btc_address('sender_tx_1'))
+
+    @patch('requests.Session.post')
+    def test_known_mempool_transactions_are_not_requested(self, mock_post):
+        mempool_entries = {'tx_1': {'time': 10}}
+        requested_txids = []
+
+        def respond(url, json=None, timeout=None):
+            if isinstance(json, dict):
+                return create_rpc_response({'id': json['id'], 'error': None, 'result': dict(mempool_entries)})
+            requested_txids.extend(request['params'][0] for request in json)
+            return create_rpc_response([{'id': request['id'], 'error': None,
+                                         'result': create_rpc_transaction(request['params'][0], 'watched', 'receiver')}
+                                        for request in json])
+
+        mock_post.side_effect = respond
+        watchlist = BtcWatchlistMonitoring(['watched'], data_source=BitcoinCoreRpcDataSource())
+        self.assertEqual([tx['hash'] for tx in watchlist.poll_new_transactions()], ['tx_1'])
+
+        # Assert that the second poll requests the new transaction only and keeps the order of the memory pool
+        mempool_entries['tx_2'] = {'time': 20}
+        self.assertEqual([tx['hash'] for tx in watchlist.poll_new_transactions()], ['tx_2'])
+        self.assertEqual(requested_txids, ['tx_1', 'tx_2'])
+
+        unconfirmed_transactions = BitcoinCoreRpcDataSource().get_unconfirmed_transactions(known_txids={'tx_1'})
+        self.assertEqual(unconfirmed_transactions['txs'][1], {'hash': 'tx_1', 'time': 10})
+
+    def test_selective_json_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BitcoinCoreRpcDataSource(json_backend='selective')
+
+    @patch('requests.Session.post')
+    def test_block_is_requested_by_height(self, mock_post):
+        rpc_block = {'hash': 'hash_5', 'height': 5, 'time': 1700000000, 'previousblockhash': 'hash_4', 'nTx': 1,
+                     'tx': [create_rpc_transaction('tx_1', 'sender', 'receiver')]}
+        results = {'getblockhash': 'hash_5', 'getblock': rpc_block}
+        mock_post.side_effect = lambda url, json=None, timeout=None: create_rpc_response(
+            {'id': json['id'], 'error': None, 'result': results[json['method']]})
+
+        block = BitcoinCoreRpcDataSource().get_block(5)
+        self.assertEqual(block['hash'], 'hash_5')
+        self.assertEqual(block['tx'][0]['block_height'], 5)
+        self.assertEqual(block['tx'][0]['out'][0]['value'], 9000)
+
+    @patch('requests.Session.post')
+    def test_rpc_error_is_raised(self, mock_post):
+        mock_post.return_value = create_rpc_response(
+            {'id': 1, 'result': None, 'error': {'code': -8, 'message': 'Block height out of range'}})
+
+        with self.assertRaises(RpcError) as context:
+            BitcoinCoreRpcDataSource().get_block(10 ** 9)
+        self.assertEqual(context.exception.code, -8)
+
+        # A failed block is skipped by the block monitor
+        block_monitor = BtcBlockMonitoring(1, 1, data_source=BitcoinCoreRpcDataSource())
+        self.assertIsNone(block_monitor.get_btc_block(1))
+
+    def test_address_history_is_not_supported(self):
+        with self.assertRaises(UnsupportedQueryError):
+            BitcoinCoreRpcDataSource().get_address_transactions('watched', limit=50)
+
+
+class TestBlockchainInfoDataSource(unittest.TestCase):
+
+    def test_address_path(self):
+        self.assertEqual(BlockchainInfoDataSource.get_address_path('watched', 50), '/rawaddr/watched?limit=50')
+        self.assertEqual(BlockchainInfoDataSource.get_address_path('watched', 50, 100),
+                         '/rawaddr/watched?limit=50&offset=100')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#############################################################
+# @file     test_cli.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import cli
+from chain_data_source import UNCONFIRMED_TRANSACTIONS_PATH
+from chain_fixtures import BLOCK_1, BLOCK_2, AddressHistory, create_spend
+from stub_api_server import StubApiServer
+
+# Modules a check of an address must not import
+HEAVY_MODULES = ('asyncio', 'numpy', 'http.server', 'concurrent.futures', 'sqlite3', 'pyarrow')
+
+MEMPOOL = {'txs': [
+    create_spend('tx_1', ['watch_address'], [('receiver', 600), ('watch_address', 300)]),
+    create_spend('tx_2', ['other_address'], [('receiver', 900)])
+]}
+
+
+# Runs the command line and returns the exit code, stdout and stderr
+def run_cli(argv):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        exit_code = cli.main(argv)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+class TestCli(unittest.TestCase):
+
+    def test_check_address(self):
+        with StubApiServer({UNCONFIRMED_TRANSACTIONS_PATH: MEMPOOL}) as server:
+            exit_code, output, _ = run_cli(['--api-url', server.base_url, 'check-address', 'watch_address'])
+            self.assertEqual(exit_code, cli.EXIT_FOUND)
+            self.assertEqual(output.splitlines(), ['tx_1\twatch_address\t0.00001000\t0.00000300\t-0.00000700'])
+
+            exit_code, output, _ = run_cli(['--api-url', server.base_url, 'check-address', 'a_1', 'a_2'])
+            self.assertEqual((exit_code, output), (cli.EXIT_NOTHING_FOUND, ''))
+
+        # Assert that a failed request of the memory pool is reported by the exit code
+        with StubApiServer() as server:
+            exit_code, _, _ = run_cli(['--api-url', server.base_url, 'check-address', 'watch_address'])
+            self.assertEqual(exit_code, cli.EXIT_API_ERROR)
+
+    def test_scan_blocks(self):
+        with StubApiServer({'/rawblock/1': BLOCK_1, '/rawblock/2': BLOCK_2}) as server:
+            exit_code, output, _ = run_cli(['--api-url', server.base_url, 'scan-blocks', '1', '2'])
+            self.assertEqual(exit_code, 0)
+            self.assertEqual([line.split('\t')[:4] for line in output.splitlines()], [['2', 'mix', '5', '5']])
+
+            # Assert that the rows of the candidates (tx_2 and the mix) are exported
+            with tempfile.TemporaryDirectory() as temp_dir:
+                export_path = os.path.join(temp_dir, 'scan.csv')
+                exit_code, _, errors = run_cli(['--api-url', server.base_url, 'scan-blocks', '1', '2', '--mixed-only',
+                                                '--export', export_path])
+                self.assertEqual(exit_code, 0)
+                self.assertIn('15 rows written', errors)
+                with open(export_path) as export_file:
+                    self.assertEqual(len(export_file.readlines()), 16)
+
+    def test_address_history(self):
+        address_history = AddressHistory(120)
+        with StubApiServer(fallback=address_history.handle) as server:
+            exit_code, output, _ = run_cli(['--api-url', server.base_url, 'address-history', 'receiver_address'])
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(output.splitlines()[0], 'hash_119\treceiver_address\t0.00000000\t0.00000120\t0.00000120')
+
+            exit_code, output, _ = run_cli(['--api-url', server.base_url, 'address-history', 'receiver_address',
+                                            '--all'])
+            self.assertEqual(len(output.splitlines()), 120)
+
+    def test_timing_is_reported(self):
+        with StubApiServer({UNCONFIRMED_TRANSACTIONS_PATH: MEMPOOL}) as server:
+            _, _, errors = run_cli(['--api-url', server.base_url, '--timing', 'check-address', 'watch_address'])
+        self.assertIn('startup (cpu):', errors)
+        self.assertIn('command (including imports):', errors)
+
+    def test_check_address_does_not_import_heavy_modules(self):
+        # A fresh interpreter runs the check, the imports of this test process do not count
+        code = ("import sys, cli\n"
+                "exit_code = cli.main(sys.argv[1:])\n"
+                f"print([module for module in {HEAVY_MODULES!r} if module in sys.modules])\n"
+                "sys.exit(exit_code)")
+        with StubApiServer({UNCONFIRMED_TRANSACTIONS_PATH: MEMPOOL}) as server:
+            result = subprocess.run([sys.executable, '-c', code, '--api-url', server.base_url, 'check-address',
+                                     'watch_address'], cwd=os.path.dirname(os.path.abspath(cli.__file__)),
+                                    capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(result.returncode, cli.EXIT_FOUND, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#############################################################
+# @file     test_coinjoin_analysis.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import unittest
+
+from coinjoin_analysis import CoinJoinAnalyzer
+
+
+class TestCoinJoinAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = CoinJoinAnalyzer()
+
+    def test_equal_outputs_are_detected(self):
+        inputs = [(f"in_{i}", 10100 + i) for i in range(5)]
+        outputs = [(f"out_{i}", 10000) for i in range(5)] + [('change', 500)]
+        record = self.analyzer.analyze(100, 'mix', inputs, outputs)
+
+        # Assert that five participants with five of six equal outputs give a score of 5/6
+        self.assertEqual(record.block_num, 100)
+        self.assertEqual(record.equal_output_count, 5)
+        self.assertEqual(record.participant_count, 5)
+        self.assertEqual(record.score, round(5 / 6, 4))
+        self.assertEqual(record.input_addresses, [f"in_{i}" for i in range(5)])
+
+    def test_payment_is_not_a_mix(self):
+        record = self.analyzer.analyze(1, 'payment', [('a', 5000), ('b', 4000)], [('c', 8000), ('a', 900)])
+        self.assertIsNone(record)
+
+    def test_single_sender_is_not_a_mix(self):
+        # A batch payout of one wallet has equal outputs but only one input address
+        inputs = [('wallet', 50000), ('wallet', 50000)]
+        outputs = [(f"customer_{i}", 10000) for i in range(8)]
+        self.assertIsNone(self.analyzer.analyze(1, 'batch', inputs, outputs))
+
+    def test_address_reuse_lowers_score(self):
+        inputs = [(f"in_{i}", 10100) for i in range(5)]
+        outputs = [(f"out_{i}", 10000) for i in range(4)] + [('in_0', 10000)]
+        record = CoinJoinAnalyzer(min_score=0).analyze(1, 'reuse', inputs, outputs)
+        self.assertEqual(record.score, 0.5)
+
+    def test_analyze_block(self):
+        block = {'tx': [
+            {'hash': 'coinbase', 'inputs': [{}], 'out': [{'addr': 'miner', 'value': 625000000}]},
+            {'hash': 'mix',
+             'inputs': [{'prev_out': {'addr': f"in_{i}", 'value': 20000}} for i in range(3)],
+             'out': [{'addr': f"out_{i}", 'value': 19000} for i in range(3)]}
+        ]}
+        records = self.analyzer.analyze_block(7, block)
+        self.assertEqual([(record.block_num, record.tx_hash) for record in records], [(7, 'mix')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#############################################################
+# @file     test_json_decoding.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import unittest
+
+from btc_api_client import BtcApiClient
+from chain_data_source import BlockchainInfoDataSource
+from json_decoding import get_default_json_backend, get_json_decoder, loads_selected_fields, orjson
+from stub_api_server import StubApiServer
+
+RAW_BLOCK = {
+    'hash': 'block_hash',
+    'height': 100,
+    'bits': 386089497,
+    'tx': [{
+        'hash': 'tx_hash',
+        'fee': 1000,
+        'inputs': [{'witness': 'ab' * 50, 'prev_out': {'addr': 'sender', 'value': 5000, 'script': '00' * 22}}],
+        'out': [{'addr': 'receiver', 'value': 4000, 'spending_outpoints': [], 'script': '00' * 22}]
+    }]
+}
+
+
+class TestJsonDecoding(unittest.TestCase):
+
+    def test_backends_decode_the_same_document(self):
+        payload = json.dumps(RAW_BLOCK).encode()
+        backends = ['json'] + (['orjson'] if orjson is not None else [])
+
+        # Assert that every backend returns the complete document
+        for backend in backends:
+            self.assertEqual(get_json_decoder(backend)(payload), RAW_BLOCK)
+        self.assertEqual(get_default_json_backend(), 'orjson' if orjson is not None else 'json')
+
+    def test_selective_decoder_keeps_only_needed_fields(self):
+        decoded = loads_selected_fields(json.dumps(RAW_BLOCK).encode())
+
+        # Assert that the fields needed by the parser are kept and all others are dropped
+        self.assertEqual(decoded, {
+            'hash': 'block_hash',
+            'height': 100,
+            'tx': [{
+                'hash': 'tx_hash',
+                'inputs': [{'prev_out': {'addr': 'sender', 'value': 5000}}],
+                'out': [{'addr': 'receiver', 'value': 4000}]
+            }]
+        })
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_json_decoder('simdjson')
+
+    def test_client_with_selective_backend(self):
+        with StubApiServer({'/rawblock/100': RAW_BLOCK}) as server:
+            client = BtcApiClient(base_url=server.base_url, json_backend='selective')
+
+            # Assert that the client decodes with the configured backend
+            self.assertNotIn('fee', client.get_json('/rawblock/100')['tx'][0])
+            client.close()
+
+    def test_selective_backend_keeps_address_summaries(self):
+        routes = {'/rawaddr/address_a?limit=0': {'n_tx': 1, 'final_balance': 5, 'total_received': 5, 'txs': []}}
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url, json_backend='selective')
+
+            # Assert that the address summary is decoded completely, the balance is not dropped
+            self.assertEqual(BlockchainInfoDataSource(client).get_address_balance('address_a'), 5)
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
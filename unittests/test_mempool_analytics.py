@@ -0,0 +1,131 @@
+#############################################################
+# @file     test_mempool_analytics.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import os
+import random
+import tempfile
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+from chain_fixtures import FakeClock, create_payment
+from mempool_analytics import MempoolAnalytics
+from metrics import MEMPOOL_WINDOW_TRANSACTIONS, MetricsRegistry, start_metrics_server
+from watcher_service import WatcherService
+
+
+class TestMempoolAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.analytics = MempoolAnalytics(window_seconds=(60, 300), clock=self.clock)
+
+    def test_windows_slide(self):
+        self.clock.now = 1000.0
+        self.analytics.add_transactions([create_payment('tx_1', 'a', 'b', 5000),
+                                         create_payment('tx_2', 'a', 'c', 1000)])
+        self.clock.now = 1100.0
+        self.analytics.add_transactions([create_payment('tx_3', 'd', 'b', 2000)])
+
+        # Assert that the 1 minute window only holds the last poll while the 5 minute window holds both
+        short_window = self.analytics.get_window(60)
+        self.assertEqual(short_window['transaction_count'], 1)
+        self.assertEqual(short_window['total_value'], 2000)
+        self.assertEqual(short_window['top_senders'], [('d', 2100)])
+
+        long_window = self.analytics.get_window(300)
+        self.assertEqual(long_window['total_value'], 8000)
+        self.assertEqual(long_window['top_senders'], [('a', 6200), ('d', 2100)])
+        self.assertEqual(long_window['top_receivers'], [('b', 7000), ('c', 1000)])
+        self.assertAlmostEqual(long_window['arrival_rate'], 3 / 100)
+
+        # Assert that a query evicts the expired transactions without a poll
+        self.clock.now = 1500.0
+        self.assertEqual(self.analytics.get_statistics()['windows'][1]['transaction_count'], 0)
+        self.assertEqual(self.analytics.windows[1].sent_by_address, {})
+        with self.assertRaises(KeyError):
+            self.analytics.get_window(3600)
+
+    def test_incremental_sums_match_a_recomputation(self):
+        rng = random.Random(1)
+        transactions = []
+        for poll in range(200):
+            self.clock.now = poll * 5.0
+            poll_transactions = [create_payment(f"tx_{poll}_{i}", f"s_{rng.randrange(20)}",
+                                                    f"r_{rng.randrange(20)}", rng.randrange(1, 10 ** 6))
+                                 for i in range(rng.randrange(5))]
+            transactions.extend((self.clock.now, transaction) for transaction in poll_transactions)
+            self.analytics.add_transactions(poll_transactions)
+
+        # Recompute the window of the last 60 seconds from scratch
+        window_transactions = [transaction for arrival_time, transaction in transactions
+                               if arrival_time >= self.clock.now - 60]
+        received_by_address = {}
+        for transaction in window_transactions:
+            address, value = transaction['out'][0]['addr'], transaction['out'][0]['value']
+            received_by_address[address] = received_by_address.get(address, 0) + value
+
+        window = self.analytics.get_window(60)
+        self.assertEqual(window['transaction_count'], len(window_transactions))
+        self.assertEqual(window['total_value'], sum(transaction['out'][0]['value']
+                                                    for transaction in window_transactions))
+        self.assertEqual(dict(window['top_receivers']),
+                         dict(sorted(received_by_address.items(), key=lambda item: -item[1])[:10]))
+
+    def test_large_values_are_outliers(self):
+        self.clock.now = 10.0
+        self.analytics.add_transactions([create_payment(f"tx_{i}", 'a', 'b', 10000 + i * 100) for i in range(50)])
+        self.analytics.add_transactions([create_payment('whale', 'w', 'x', 10 ** 11)])
+
+        outliers = self.analytics.get_window(60)['outliers']
+        self.assertEqual([outlier['tx_hash'] for outlier in outliers], ['whale'])
+        self.assertGreater(outliers[0]['score'], 3)
+
+    def test_ring_buffer_is_bounded(self):
+        analytics = MempoolAnalytics(window_seconds=(60,), max_transactions=10, clock=self.clock)
+        analytics.add_transactions([create_payment(f"tx_{i}", f"s_{i}", 'r', 100) for i in range(25)])
+
+        window = analytics.windows[0]
+        self.assertEqual(len(window), 10)
+        self.assertEqual(window.dropped_transactions, 15)
+        self.assertEqual(window.total_value, 1000)
+        self.assertEqual(len(window.sent_by_address), 10)
+        self.assertEqual(MEMPOOL_WINDOW_TRANSACTIONS.get('1m'), 10)
+
+    def test_statistics_endpoint(self):
+        self.analytics.add_transactions([create_payment('tx_1', 'a', 'b', 5000)])
+        server = start_metrics_server(port=0, registry=MetricsRegistry(),
+                                      json_endpoints={'/mempool': self.analytics.get_statistics})
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/mempool"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                statistics = json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([window['transaction_count'] for window in statistics['windows']], [1, 1])
+
+    @patch('requests.Session.get')
+    def test_watcher_feeds_the_new_transactions(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [create_payment('tx_1', 'a', 'b', 5000)]}).encode()
+        analytics = MempoolAnalytics()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.txt')
+            with open(watchlist_path, 'w') as watchlist_file:
+                watchlist_file.write('unrelated\n')
+
+            watcher = WatcherService(watchlist_path, report_interval=None, mempool_analytics=analytics)
+            watcher.run_cycle()
+            watcher.run_cycle()
+
+        # Assert that a transaction that is still in the memory pool is counted once
+        self.assertEqual(analytics.get_window(60)['transaction_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#############################################################
+# @file     test_mempool_monitoring.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import unittest
+from unittest.mock import patch
+
+from btc_parser import BtcAddressMonitoring
+from mempool_monitoring import BtcWatchlistMonitoring, MempoolSnapshot, MempoolTracker, TX_DIRECTION, RX_DIRECTION
+
+
+class TestBtcWatchlistMonitoring(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a memory pool with a multi-input transaction and an OP_RETURN output without address
+        self.mock_response = {
+            'txs': [{
+                'inputs': [
+                    {'prev_out': {'addr': 'sender_a', 'value': 1000}},
+                    {'prev_out': {'addr': 'sender_b', 'value': 2000}}
+                ],
+                'out': [
+                    {'addr': 'receiver_a', 'value': 2500},
+                    {'value': 0}
+                ]
+            }]
+        }
+
+    @patch('requests.Session.get')
+    def test_mempool_is_fetched_once_per_cycle(self, mock_get):
+        mock_get.return_value.content = json.dumps(self.mock_response).encode()
+        watchlist = BtcWatchlistMonitoring(['sender_a', 'sender_b', 'receiver_a', 'other_address'])
+
+        # Update the snapshot once and check every watched address in both directions
+        self.assertTrue(watchlist.update_mempool_snapshot())
+        for address in watchlist.watch_addresses:
+            watchlist.is_tx_transaction_from_btc_address(address)
+            watchlist.is_rx_transaction_to_btc_address(address)
+
+        # Assert that the memory pool was only downloaded once
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.get')
+    def test_get_tx_and_rx_transaction_addresses(self, mock_get):
+        mock_get.return_value.content = json.dumps(self.mock_response).encode()
+        watchlist = BtcWatchlistMonitoring(['sender_b', 'receiver_a', 'other_address'])
+        watchlist.update_mempool_snapshot()
+
+        # Assert that inputs other than the first one are indexed as well
+        self.assertEqual(watchlist.get_tx_transaction_addresses(), {'sender_b'})
+        self.assertEqual(watchlist.get_rx_transaction_addresses(), {'receiver_a'})
+        self.assertFalse(watchlist.is_tx_transaction_from_btc_address('other_address'))
+        self.assertFalse(watchlist.is_rx_transaction_to_btc_address('other_address'))
+
+    @patch('requests.Session.get')
+    def test_update_api_error(self, mock_get):
+        # Set up the mock response to fail on raise_for_status
+        mock_get.return_value.raise_for_status.side_effect = ValueError
+        watchlist = BtcWatchlistMonitoring(['sender_a'])
+
+        # Assert that a failed update leaves no snapshot and all checks return False
+        self.assertFalse(watchlist.update_mempool_snapshot())
+        self.assertFalse(watchlist.is_tx_transaction_from_btc_address('sender_a'))
+        self.assertEqual(watchlist.get_tx_transaction_addresses(), set())
+
+    @patch('requests.Session.get')
+    def test_address_monitoring_with_shared_snapshot(self, mock_get):
+        # Build one snapshot and share it between several BtcAddressMonitoring objects
+        mempool_snapshot = MempoolSnapshot(self.mock_response)
+        sender = BtcAddressMonitoring('sender_a', mempool_snapshot)
+        receiver = BtcAddressMonitoring('receiver_a', mempool_snapshot)
+
+        self.assertTrue(sender.is_tx_transaction_from_btc_address())
+        self.assertFalse(sender.is_rx_transaction_to_btc_address())
+        self.assertTrue(receiver.is_rx_transaction_to_btc_address())
+
+        # Assert that no API request was made
+        mock_get.assert_not_called()
+
+
+class TestMempoolTracker(unittest.TestCase):
+
+    def test_only_new_transactions_are_returned(self):
+        tracker = MempoolTracker()
+
+        # Assert that a transaction is only reported in the poll in which it appeared
+        self.assertEqual(tracker.get_new_transactions([{'hash': 'a'}, {'hash': 'b'}]), [{'hash': 'a'}, {'hash': 'b'}])
+        self.assertEqual(tracker.get_new_transactions([{'hash': 'a'}, {'hash': 'b'}, {'hash': 'c'}]), [{'hash': 'c'}])
+
+    def test_aged_out_transactions_are_evicted(self):
+        tracker = MempoolTracker(max_missed_polls=2)
+        tracker.get_new_transactions([{'hash': 'a'}, {'hash': 'b'}])
+
+        # Transaction 'a' is confirmed and disappears from the memory pool, 'b' stays
+        tracker.get_new_transactions([{'hash': 'b'}])
+        self.assertTrue(tracker.is_known_transaction('a'))
+        tracker.get_new_transactions([{'hash': 'b'}])
+
+        # Assert that 'a' was evicted after two polls without a sighting
+        self.assertFalse(tracker.is_known_transaction('a'))
+        self.assertTrue(tracker.is_known_transaction('b'))
+
+    def test_size_limit(self):
+        tracker = MempoolTracker(max_seen_transactions=2)
+        tracker.get_new_transactions([{'hash': 'a'}, {'hash': 'b'}])
+        tracker.get_new_transactions([{'hash': 'b'}, {'hash': 'c'}])
+
+        # Assert that the least recently seen transaction was evicted
+        self.assertEqual(list(tracker.seen_transactions), ['b', 'c'])
+
+    def test_feed_larger_than_the_size_limit(self):
+        tracker = MempoolTracker(max_seen_transactions=3)
+        feed = [{'hash': str(i)} for i in range(5)]
+        self.assertEqual(len(tracker.get_new_transactions(feed)), 5)
+
+        # Assert that the transactions of the current poll are kept, so nothing is reported twice
+        for _ in range(3):
+            self.assertEqual(tracker.get_new_transactions(feed), [])
+        self.assertEqual(len(tracker.seen_transactions), 5)
+
+    @patch('requests.Session.get')
+    def test_events_fire_once_per_new_transaction(self, mock_get):
+        watchlist = BtcWatchlistMonitoring(['sender_a', 'receiver_a'])
+        first_transaction = {
+            'hash': 'hash_1',
+            'inputs': [{'prev_out': {'addr': 'sender_a'}}, {'prev_out': {'addr': 'sender_a'}}],
+            'out': [{'addr': 'receiver_a'}]
+        }
+        second_transaction = {
+            'hash': 'hash_2',
+            'inputs': [{'prev_out': {'addr': 'other_address'}}],
+            'out': [{'addr': 'receiver_a'}]
+        }
+
+        # First poll: one transaction with a Tx and an Rx event
+        mock_get.return_value.content = json.dumps({'txs': [first_transaction]}).encode()
+        self.assertEqual(sorted(watchlist.get_new_transaction_events()),
+                         [('hash_1', 'receiver_a', RX_DIRECTION), ('hash_1', 'sender_a', TX_DIRECTION)])
+
+        # Second poll: the first transaction is still unconfirmed and must not fire again
+        mock_get.return_value.content = json.dumps({'txs': [second_transaction, first_transaction]}).encode()
+        self.assertEqual(watchlist.get_new_transaction_events(), [('hash_2', 'receiver_a', RX_DIRECTION)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#############################################################
+# @file     test_metrics.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import io
+import json
+import logging
+import unittest
+import urllib.request
+
+from btc_api_client import BtcApiClient
+from logging_config import configure_logging
+from metrics import API_ERRORS, API_REQUEST_SECONDS, API_RESPONSE_BYTES, API_RETRIES, MetricsRegistry, \
+    get_endpoint_label, start_metrics_server
+from stub_api_server import StubApiServer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        requests_total = registry.counter('requests_total', 'Requests', ('endpoint',))
+        latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        requests_total.inc('/rawblock')
+        requests_total.inc('/rawblock', amount=2)
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        # Assert that the buckets are cumulative and the labels are rendered
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE requests_total counter', lines)
+        self.assertIn('requests_total{endpoint="/rawblock"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_count 3', lines)
+        self.assertIn('latency_seconds_sum 5.55', lines)
+
+    def test_metric_is_registered_once(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter('a_total', 'A'), registry.counter('a_total', 'A'))
+
+    def test_endpoint_label(self):
+        self.assertEqual(get_endpoint_label('/rawaddr/1A1z?limit=50'), '/rawaddr')
+        self.assertEqual(get_endpoint_label('/unconfirmed-transactions?format=json'), '/unconfirmed-transactions')
+
+    def test_metrics_endpoint(self):
+        registry = MetricsRegistry()
+        registry.gauge('watched_addresses', 'Watched addresses').set(3)
+        server = start_metrics_server(port=0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('watched_addresses 3', body)
+
+
+class TestApiClientInstrumentation(unittest.TestCase):
+
+    def test_requests_errors_and_retries_are_recorded(self):
+        payload = {'height': 1, 'tx': []}
+        routes = {'/rawblock/1': payload, '/rawblock/2': (503, {'error': 'unavailable'})}
+        count_before = API_REQUEST_SECONDS.get('/rawblock')[0]
+        bytes_before = API_RESPONSE_BYTES.get('/rawblock')
+        errors_before = API_ERRORS.get('/rawblock', 'HTTPError')
+        retries_before = API_RETRIES.get('/rawblock')
+
+        with StubApiServer(routes) as server:
+            client = BtcApiClient(base_url=server.base_url, max_retries=1, backoff=0.01)
+            self.assertEqual(client.get_json('/rawblock/1'), payload)
+            with self.assertRaises(Exception):
+                client.get_json('/rawblock/2')
+            client.close()
+
+        # One successful request and a failed request with one retry
+        self.assertEqual(API_REQUEST_SECONDS.get('/rawblock')[0] - count_before, 3)
+        self.assertEqual(API_RESPONSE_BYTES.get('/rawblock') - bytes_before, len(json.dumps(payload)))
+        self.assertEqual(API_ERRORS.get('/rawblock', 'HTTPError') - errors_before, 2)
+        self.assertEqual(API_RETRIES.get('/rawblock') - retries_before, 1)
+
+
+class TestLoggingConfig(unittest.TestCase):
+
+    def setUp(self):
+        root_logger = logging.getLogger()
+        self.root_handlers = root_logger.handlers[:]
+        self.root_level = root_logger.level
+
+    def tearDown(self):
+        root_logger = logging.getLogger()
+        root_logger.handlers[:] = self.root_handlers
+        root_logger.setLevel(self.root_level)
+
+    def test_json_log_lines(self):
+        stream = io.StringIO()
+        configure_logging(json_format=True, stream=stream)
+        logging.getLogger('btc_parser').warning("Block %d failed", 7, extra={'block_num': 7})
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['logger'], 'btc_parser')
+        self.assertEqual(entry['message'], 'Block 7 failed')
+        self.assertEqual(entry['block_num'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#############################################################
+# @file     test_scan_export.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from btc_api_client import BtcApiClient
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring
+from scan_export import ScanSink, get_default_export_format, get_export_format, iter_scan_batches, open_scan_sink, \
+    pyarrow, read_scan_columns, read_scan_table
+from stub_api_server import StubApiServer
+from transaction_table import RX_DIRECTION_CODE, TX_DIRECTION_CODE
+
+# One CoinJoin candidate, one payment with a single output and a coinbase transaction
+BLOCK_7 = {'height': 7, 'tx': [
+    {'hash': 'coinbase', 'inputs': [{}], 'out': [{'addr': 'miner', 'value': 5000}]},
+    {'hash': 'tx_1', 'inputs': [{'prev_out': {'addr': 'a', 'value': 3000}}, {'prev_out': {'addr': 'b', 'value': 1000}}],
+     'out': [{'addr': 'c', 'value': 2000}, {'value': 0}]},
+    {'hash': 'tx_2', 'inputs': [{'prev_out': {'addr': 'c', 'value': 2000}}], 'out': [{'addr': 'd', 'value': 1900}]}
+]}
+
+
+class TestScanExport(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    # Exports BLOCK_7 and returns the columns read back
+    def export_block(self, file_name, export_format=None, row_group_size=3):
+        export_path = os.path.join(self.temp_dir.name, file_name)
+        with open_scan_sink(export_path, export_format, row_group_size) as sink:
+            sink.add_block(7, BLOCK_7)
+            self.assertEqual(sink.row_count, 7)
+        return export_path, read_scan_columns(export_path)
+
+    def assert_block_columns(self, columns):
+        self.assertEqual(columns['tx_hash'].tolist(), ['coinbase', 'tx_1', 'tx_1', 'tx_1', 'tx_1', 'tx_2', 'tx_2'])
+        self.assertEqual(columns['address'].tolist(), ['miner', 'a', 'b', 'c', None, 'c', 'd'])
+        self.assertEqual(columns['direction'].tolist(), [RX_DIRECTION_CODE, TX_DIRECTION_CODE, TX_DIRECTION_CODE,
+                                                         RX_DIRECTION_CODE, RX_DIRECTION_CODE, TX_DIRECTION_CODE,
+                                                         RX_DIRECTION_CODE])
+        self.assertEqual(columns['value'].tolist(), [5000, 3000, 1000, 2000, 0, 2000, 1900])
+        self.assertEqual(set(columns['block_height'].tolist()), {7})
+
+    def test_csv_export_in_chunks(self):
+        export_path, columns = self.export_block('scan.csv')
+        self.assertEqual(get_export_format(export_path), 'csv')
+        self.assert_block_columns(columns)
+
+    def test_unavailable_formats(self):
+        with self.assertRaises(ValueError):
+            open_scan_sink(os.path.join(self.temp_dir.name, 'scan.xlsx'), 'xlsx')
+        if pyarrow is None:
+            self.assertEqual(get_default_export_format(), 'csv')
+            with self.assertRaises(ValueError):
+                open_scan_sink(os.path.join(self.temp_dir.name, 'scan.parquet'))
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_parquet_export_has_one_row_group_per_chunk(self):
+        export_path, columns = self.export_block('scan.parquet')
+        self.assert_block_columns(columns)
+        self.assertEqual(pyarrow.parquet.ParquetFile(export_path).num_row_groups, 3)
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_arrow_export_is_read_memory_mapped(self):
+        export_path, columns = self.export_block('scan.arrow')
+        self.assert_block_columns(columns)
+        self.assertEqual(read_scan_table(export_path).column('value').num_chunks, 3)
+
+        # Assert that the batches are views of the memory-mapped file and hold all rows
+        batches = list(iter_scan_batches(export_path))
+        self.assertEqual([len(batch['value']) for batch in batches], [3, 3, 1])
+        self.assertFalse(batches[0]['value'].flags.owndata)
+        self.assertFalse(batches[0]['value'].flags.writeable)
+        self.assertEqual(batches[2]['address'].tolist(), ['d'])
+
+    def test_scan_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ScanSink(os.path.join(self.temp_dir.name, 'scan.bin'))
+
+    def test_block_scan_streams_to_the_sink(self):
+        export_path = os.path.join(self.temp_dir.name, 'blocks.csv')
+        with StubApiServer({'/rawblock/7': BLOCK_7}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            with open_scan_sink(export_path) as sink:
+                self.assertEqual(BtcBlockMonitoring(7, 7, api_client=client).export_btc_blocks(sink), 7)
+                self.assertEqual(BtcBlockMonitoring(7, 7, api_client=client).export_btc_blocks(sink, mixed_only=True),
+                                 11)
+            client.close()
+
+        # Assert that the mixed-only scan wrote the candidate tx_1 a second time
+        self.assertEqual(read_scan_columns(export_path)['tx_hash'].tolist().count('tx_1'), 8)
+
+    @patch('requests.Session.get')
+    def test_address_history_streams_to_the_sink(self, mock_get):
+        transaction = dict(BLOCK_7['tx'][2], block_height=7)
+        mock_get.return_value.content = json.dumps({'n_tx': 1, 'txs': [transaction]}).encode()
+
+        export_path = os.path.join(self.temp_dir.name, 'history.csv')
+        with open_scan_sink(export_path) as sink:
+            self.assertEqual(BtcAddressMonitoring('c').export_transactions_of_btc_address(sink), 2)
+
+        columns = read_scan_columns(export_path)
+        self.assertEqual(columns['address'].tolist(), ['c', 'd'])
+        self.assertEqual(columns['block_height'].tolist(), [7, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
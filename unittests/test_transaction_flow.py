@@ -0,0 +1,111 @@
+#############################################################
+# @file     test_transaction_flow.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from address_index import AddressIndex
+from btc_parser import BtcAddressMonitoring
+from mempool_monitoring import RX_DIRECTION, TX_DIRECTION
+from transaction_flow import AddressFlow, get_address_flow, get_address_flows
+from watcher_service import WatcherService
+
+# The watched address pays with its second and third input and gets change on the last output
+PAYMENT = {
+    'hash': 'tx_1',
+    'tx_index': 11,
+    'inputs': [
+        {'prev_out': {'addr': 'other_sender', 'value': 1000, 'tx_index': 1, 'n': 0}},
+        {'prev_out': {'addr': 'watched', 'value': 5000, 'tx_index': 2, 'n': 0}},
+        {'prev_out': {'addr': 'watched', 'value': 2000, 'tx_index': 3, 'n': 0}}
+    ],
+    'out': [
+        {'addr': 'receiver', 'value': 6000, 'n': 0},
+        {'value': 0, 'n': 1},
+        {'addr': 'watched', 'value': 1500, 'n': 2}
+    ]
+}
+
+# The watched address receives on the second output
+RECEIPT = {
+    'hash': 'tx_2',
+    'tx_index': 12,
+    'inputs': [{'prev_out': {'addr': 'payer', 'value': 9000, 'tx_index': 4, 'n': 0}}],
+    'out': [{'addr': 'payer_change', 'value': 4000, 'n': 0}, {'addr': 'watched', 'value': 4800, 'n': 1}]
+}
+
+
+class TestAddressFlows(unittest.TestCase):
+
+    def test_all_inputs_and_outputs_are_attributed(self):
+        flows = {flow.address: flow for flow in get_address_flows(PAYMENT)}
+
+        self.assertEqual(flows['watched'], AddressFlow('tx_1', 'watched', 7000, 1500, -5500, 2, 1))
+        self.assertEqual(flows['other_sender'].net_flow, -1000)
+        self.assertEqual(flows['receiver'].received, 6000)
+        self.assertEqual(set(flows), {'watched', 'other_sender', 'receiver'})
+
+    def test_flows_of_selected_addresses(self):
+        self.assertEqual([flow.address for flow in get_address_flows(PAYMENT, {'receiver', 'unknown'})], ['receiver'])
+        self.assertEqual(get_address_flow(RECEIPT, 'watched').received, 4800)
+        self.assertIsNone(get_address_flow(RECEIPT, 'unknown'))
+
+    def test_coinbase_and_missing_amounts(self):
+        coinbase = {'hash': 'tx_0', 'inputs': [{}], 'out': [{'addr': 'miner'}]}
+        self.assertEqual(get_address_flows(coinbase), [AddressFlow('tx_0', 'miner', 0, 0, 0, 0, 1)])
+
+
+class TestAddressMonitoringFlows(unittest.TestCase):
+
+    @patch('requests.Session.get')
+    def test_send_from_second_input_is_detected(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [PAYMENT]}).encode()
+        monitor = BtcAddressMonitoring('watched')
+
+        self.assertTrue(monitor.is_tx_transaction_from_btc_address())
+        self.assertEqual(monitor.get_unconfirmed_flows_of_btc_address(),
+                         [AddressFlow('tx_1', 'watched', 7000, 1500, -5500, 2, 1)])
+
+    @patch('requests.Session.get')
+    def test_transactions_are_recorded_per_output(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [PAYMENT, RECEIPT]}).encode()
+
+        # The payment is recorded with all outputs, the receipt only with the output to the watched address
+        self.assertEqual(BtcAddressMonitoring('watched').get_transactions_from_btc_address(),
+                         [('watched', 'receiver', 6000), ('watched', 'watched', 1500), ('payer', 'watched', 4800)])
+        self.assertEqual([flow.net_flow for flow in BtcAddressMonitoring('watched').get_flows_from_btc_address()],
+                         [-5500, 4800])
+
+    def test_index_records_transactions_per_output(self):
+        address_index = AddressIndex()
+        address_index.ingest_block(100, {'hash': 'block_100', 'tx': [PAYMENT, RECEIPT]})
+
+        self.assertEqual(address_index.get_transactions('watched'),
+                         [('payer', 'watched', 4800), ('watched', 'receiver', 6000), ('watched', 'watched', 1500)])
+        address_index.close()
+
+
+class TestWatcherEventAmounts(unittest.TestCase):
+
+    @patch('requests.Session.get')
+    def test_events_carry_amounts(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [PAYMENT, RECEIPT]}).encode()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.txt')
+            with open(watchlist_path, 'w') as watchlist_file:
+                watchlist_file.write('watched\n')
+
+            events = WatcherService(watchlist_path, report_interval=None).run_cycle()
+
+        self.assertEqual(sorted((event.tx_hash, event.direction, event.amount) for event in events),
+                         [('tx_1', RX_DIRECTION, 1500), ('tx_1', TX_DIRECTION, 7000), ('tx_2', RX_DIRECTION, 4800)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#############################################################
+# @file     test_transaction_graph.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import unittest
+from unittest.mock import patch
+
+from btc_api_client import BtcApiClient
+from btc_parser import BtcAddressMonitoring, BtcBlockMonitoring
+from chain_fixtures import create_transaction
+from stub_api_server import StubApiServer
+from transaction_graph import BACKWARD_DIRECTION, TracedAddress, TransactionGraphBuilder
+
+
+# source -> hop_1 -> hop_2 -> hop_3, with a small side payment from hop_1 to dust
+CHAIN = [
+    create_transaction('tx_1', [('source', 10000)], [('hop_1', 9000), ('source', 900)]),
+    create_transaction('tx_2', [('hop_1', 9000)], [('hop_2', 8000), ('dust', 500)]),
+    create_transaction('tx_3', [('hop_2', 8000)], [('hop_3', 7900)])
+]
+
+
+class TestTransactionGraph(unittest.TestCase):
+
+    def setUp(self):
+        builder = TransactionGraphBuilder()
+        builder.add_transactions(CHAIN)
+        self.graph = builder.build()
+
+    def test_transactions_are_split_by_input_share(self):
+        builder = TransactionGraphBuilder()
+        builder.add_transaction(create_transaction('tx', [('a', 3000), ('b', 1000)], [('c', 2000), ('a', 1900)]))
+        graph = builder.build()
+
+        # Assert that the change back to a is no edge and the payment is split 3:1
+        self.assertEqual(graph.get_neighbors('c', BACKWARD_DIRECTION), [('a', 1500), ('b', 500)])
+        self.assertEqual(graph.get_neighbors('a'), [('c', 1500)])
+        self.assertEqual(graph.get_edge_count(), 2)
+
+    def test_duplicate_edges_are_summed(self):
+        builder = TransactionGraphBuilder()
+        builder.add_transaction_list([('a', 'b', 100), ('a', 'b', 50), ('b', 'a', 10), ('a', None, 5)])
+        graph = builder.build()
+        self.assertEqual(graph.get_neighbors('a'), [('b', 150)])
+        self.assertEqual(graph.get_edge_count(), 2)
+
+    def test_sums_are_exact_beyond_float_precision(self):
+        large_amount = 2 ** 53 + 1
+        builder = TransactionGraphBuilder()
+        builder.add_transaction_list([('a', 'b', large_amount), ('a', 'b', large_amount),
+                                      ('a', 'c', 1), ('b', 'd', large_amount), ('c', 'd', large_amount)])
+        graph = builder.build()
+
+        # Assert that the duplicate edges and the amounts of a hop are summed as integers
+        self.assertEqual(graph.get_neighbors('a'), [('b', 2 * large_amount), ('c', 1)])
+        self.assertEqual(graph.trace('a')[-1], TracedAddress('d', 2, 2 * large_amount))
+
+    def test_forward_and_backward_trace(self):
+        self.assertEqual(self.graph.trace('source'), [
+            TracedAddress('hop_1', 1, 9000), TracedAddress('hop_2', 2, 8000), TracedAddress('dust', 2, 500),
+            TracedAddress('hop_3', 3, 7900)
+        ])
+        self.assertEqual([traced.address for traced in self.graph.trace('hop_3', direction=BACKWARD_DIRECTION)],
+                         ['hop_2', 'hop_1', 'source'])
+        self.assertEqual(self.graph.trace('unknown'), [])
+
+    def test_trace_limits(self):
+        self.assertEqual([traced.address for traced in self.graph.trace('source', max_hops=2)],
+                         ['hop_1', 'hop_2', 'dust'])
+        self.assertNotIn('dust', [traced.address for traced in self.graph.trace('source', min_amount=1000)])
+
+    def test_deeper_trace_continues_the_cached_frontier(self):
+        shallow_trace = self.graph.trace('source', max_hops=1)
+        self.assertEqual(len(self.graph._trace_cache), 1)
+
+        # Assert that the deeper trace starts from the cached hop and gives the same result as a new trace
+        deep_trace = self.graph.trace('source', max_hops=5)
+        self.assertEqual(deep_trace[:1], shallow_trace)
+        self.assertEqual(len(self.graph._trace_cache), 1)
+        self.assertTrue(self.graph._trace_cache[(0, 'forward', 0)].is_exhausted)
+        self.assertEqual(self.graph.trace('source', max_hops=2), deep_trace[:3])
+
+    def test_large_graph_trace(self):
+        # A binary tree of 2^16 addresses, every address pays both children
+        builder = TransactionGraphBuilder()
+        builder.add_transaction_list((f"n_{parent}", f"n_{child}", 1000) for parent in range(1, 2 ** 15)
+                                     for child in (2 * parent, 2 * parent + 1))
+        traced_addresses = builder.build().trace('n_1', max_hops=10)
+
+        self.assertEqual(len(traced_addresses), 2 ** 11 - 2)
+        self.assertEqual(traced_addresses[-1].hops, 10)
+
+    def test_graph_of_blocks_and_address_history(self):
+        block = {'height': 1, 'tx': CHAIN[:2]}
+        with StubApiServer({'/rawblock/1': block}) as server:
+            client = BtcApiClient(base_url=server.base_url)
+            builder = BtcBlockMonitoring(1, 1, api_client=client).add_transaction_graph_of_btc_blocks()
+            client.close()
+
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value.content = json.dumps({'n_tx': 1, 'txs': CHAIN[2:]}).encode()
+            BtcAddressMonitoring('hop_2').add_transaction_graph_of_btc_address(builder)
+
+        self.assertEqual([traced.address for traced in builder.build().trace('source')],
+                         ['hop_1', 'hop_2', 'dust', 'hop_3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#############################################################
+# @file     test_transaction_table.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from btc_parser import BtcAddressMonitoring
+from transaction_table import TransactionTable, TransactionTableBuilder, TX_DIRECTION_CODE, RX_DIRECTION_CODE
+
+
+class TestTransactionTable(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a table with three transactions between three addresses
+        self.table = TransactionTable.from_transaction_list([
+            ('address_a', 'address_b', 1000),
+            ('address_a', 'address_c', 3000),
+            ('address_b', 'address_c', 500)
+        ])
+
+    def test_columns(self):
+        # Assert that every transaction is stored as a sent and a received row
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(self.table.amount.dtype, np.int64)
+        self.assertEqual(len(self.table.address_codes), 3)
+        self.assertEqual(self.table.to_rows()[:2], [('address_a', 1000, TX_DIRECTION_CODE, -1, -1),
+                                                    ('address_b', 1000, RX_DIRECTION_CODE, -1, -1)])
+
+    def test_sum_by_address(self):
+        codes = self.table.address_codes
+        sent = self.table.sum_by_address(TX_DIRECTION_CODE)
+        received = self.table.sum_by_address(RX_DIRECTION_CODE)
+
+        # Assert the sums per address
+        self.assertEqual(sent[codes.get_code('address_a')], 4000)
+        self.assertEqual(received[codes.get_code('address_c')], 3500)
+        self.assertEqual(self.table.net_flow_by_address()[codes.get_code('address_b')], 500)
+
+    def test_sum_by_address_is_exact_beyond_float_precision(self):
+        table = TransactionTable.from_transaction_list([('a', 'b', 2 ** 53 + 1), ('a', 'b', 2 ** 53 + 1)])
+
+        # Assert that the sums are accumulated as integers, float64 would round them
+        self.assertEqual(table.top_receivers(1), [('b', 2 ** 54 + 2)])
+
+    def test_top_senders_and_receivers(self):
+        self.assertEqual(self.table.top_senders(1), [('address_a', 4000)])
+        self.assertEqual(self.table.top_receivers(5), [('address_c', 3500), ('address_b', 1000)])
+
+    def test_amount_histogram(self):
+        counts, bin_edges = self.table.amount_histogram(direction=TX_DIRECTION_CODE)
+
+        # Assert that 500 falls into [100, 1000) and 1000, 3000 into [1000, 10000)
+        self.assertEqual(counts[2], 1)
+        self.assertEqual(counts[3], 2)
+        self.assertEqual(counts.sum(), 3)
+
+    def test_missing_addresses_and_empty_table(self):
+        builder = TransactionTableBuilder()
+        builder.add_flow(None, 0, RX_DIRECTION_CODE)
+        table = builder.build()
+
+        # Assert that rows without address are ignored by the aggregations
+        self.assertEqual(table.top_receivers(), [])
+        self.assertEqual(len(TransactionTableBuilder().build()), 0)
+
+    @patch('requests.Session.get')
+    def test_get_transaction_table_from_btc_address(self, mock_get):
+        mock_get.return_value.content = json.dumps({
+            'txs': [{
+                'block_height': 100,
+                'tx_index': 7,
+                'inputs': [{'prev_out': {'addr': 'address_a'}}],
+                'out': [{'addr': 'address_b', 'value': 1000}]
+            }]
+        }).encode()
+        table = BtcAddressMonitoring('address_a').get_transaction_table_from_btc_address()
+
+        # Assert that block height and transaction index are kept
+        self.assertEqual(table.to_rows(), [('address_a', 1000, TX_DIRECTION_CODE, 100, 7),
+                                           ('address_b', 1000, RX_DIRECTION_CODE, 100, 7)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+#############################################################
+# @file     test_watcher_service.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from chain_fixtures import create_payment
+from mempool_monitoring import RX_DIRECTION, TX_DIRECTION
+from watcher_service import PollScheduler, WatcherService, load_watchlist
+from watcher_state import WatcherStateStore
+
+
+class TestWatcherService(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.watchlist_path = os.path.join(self.temp_dir.name, 'watchlist.txt')
+        self.write_watchlist('# comment\nwatched_a\n\nwatched_b  # inline comment\nwatched_a\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    # Writes the watchlist file with a new modification time
+    def write_watchlist(self, content, mtime=None):
+        with open(self.watchlist_path, 'w') as watchlist_file:
+            watchlist_file.write(content)
+        if mtime is not None:
+            os.utime(self.watchlist_path, (mtime, mtime))
+
+    def test_load_watchlist(self):
+        self.assertEqual(load_watchlist(self.watchlist_path), ['watched_a', 'watched_b'])
+
+    @patch('requests.Session.get')
+    def test_events_are_queued_once_and_the_watcher_keeps_running(self, mock_get):
+        tx_time = int(time.time()) - 5
+        polls = [
+            {'txs': [create_payment('hash_1', 'watched_a', 'other', 900, tx_time=tx_time)]},
+            {'txs': [create_payment('hash_1', 'watched_a', 'other', 900, tx_time=tx_time)]},
+            {'txs': [create_payment('hash_2', 'other', 'watched_b', 900),
+                     create_payment('hash_1', 'watched_a', 'other', 900, tx_time=tx_time)]}
+        ]
+        mock_get.side_effect = lambda *args, **kwargs: self.create_response(polls.pop(0))
+
+        watcher = WatcherService(self.watchlist_path, scheduler=PollScheduler(interval=0, min_interval=0, jitter=0),
+                                 report_interval=None)
+        watcher.run(max_cycles=3)
+
+        # Assert that both events were queued exactly once and the latency was measured for the timed one
+        events = [watcher.event_queue.get_nowait() for _ in range(watcher.event_queue.qsize())]
+        self.assertEqual([(event.tx_hash, event.address, event.direction) for event in events],
+                         [('hash_1', 'watched_a', TX_DIRECTION), ('hash_2', 'watched_b', RX_DIRECTION)])
+        report = watcher.statistics.get_report()
+        self.assertEqual(report['cycles'], 3)
+        self.assertEqual(report['events'], 2)
+        self.assertGreaterEqual(report['detection_latency_seconds']['max'], 5)
+        self.assertIsNotNone(report['cycle_duration_seconds']['p90'])
+
+    @patch('requests.Session.get')
+    def test_only_transactions_without_events_are_recorded_as_seen(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [create_payment('hash_1', 'watched_a', 'other', 900),
+                                                            create_payment('hash_2', 'other', 'other', 900)]}).encode()
+        state_store = WatcherStateStore()
+        watcher = WatcherService(self.watchlist_path, report_interval=None, state_store=state_store)
+        self.assertEqual(len(watcher.run_cycle()), 1)
+
+        # The transaction of the event is recorded by the AlertDispatcher once its alert was delivered
+        self.assertEqual(state_store.get_known_transactions(['hash_1', 'hash_2']), {'hash_2'})
+        state_store.close()
+
+    @patch('requests.Session.get')
+    def test_watchlist_is_reloaded_when_changed(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': []}).encode()
+        watcher = WatcherService(self.watchlist_path, report_interval=None)
+        self.assertEqual(watcher.watchlist_monitor.watch_addresses, {'watched_a', 'watched_b'})
+
+        self.write_watchlist('watched_c\n', mtime=time.time() + 10)
+        watcher.run_cycle()
+        self.assertEqual(watcher.watchlist_monitor.watch_addresses, {'watched_c'})
+
+    def test_failed_poll_backs_off(self):
+        watcher = WatcherService(self.watchlist_path, scheduler=PollScheduler(interval=10), report_interval=None)
+        with patch('btc_api_client.BtcApiClient.get_json', side_effect=requests.exceptions.ConnectionError('offline')):
+            self.assertEqual(watcher.run_cycle(), [])
+
+        self.assertEqual(watcher.statistics.failed_cycles, 1)
+        self.assertEqual(watcher.scheduler.interval, 15)
+
+    @patch('requests.Session.get')
+    def test_stop_interrupts_the_wait(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': []}).encode()
+        watcher = WatcherService(self.watchlist_path, scheduler=PollScheduler(interval=60), report_interval=None)
+        thread = watcher.start()
+        time.sleep(0.1)
+        watcher.stop()
+        thread.join(timeout=2)
+        self.assertFalse(thread.is_alive())
+
+    # Creates a mocked response of the memory pool API
+    @staticmethod
+    def create_response(payload):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(payload).encode()
+        return response
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    def test_interval_adapts_to_churn(self):
+        scheduler = PollScheduler(interval=40, min_interval=5, max_interval=120, jitter=0)
+
+        # Busy memory pool: most transactions of the feed are new
+        self.assertEqual(scheduler.update(80, 100), 20)
+        self.assertEqual(scheduler.update(100, 100), 10)
+
+        # Medium churn keeps the interval, a quiet memory pool and failures back off up to the maximum
+        self.assertEqual(scheduler.update(30, 100), 10)
+        self.assertEqual(scheduler.update(5, 100), 15)
+        for _ in range(20):
+            scheduler.update(None, 0)
+        self.assertEqual(scheduler.interval, 120)
+
+    def test_jitter_stays_within_bounds(self):
+        scheduler = PollScheduler(interval=30, jitter=0.1, rng=random.Random(1))
+        delays = [scheduler.get_next_delay() for _ in range(100)]
+        self.assertTrue(all(27 <= delay <= 33 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
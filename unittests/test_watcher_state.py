@@ -0,0 +1,127 @@
+#############################################################
+# @file     test_watcher_state.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import os
+import tempfile
+import unittest
+
+from alert_dispatcher import AlertDispatcher
+from chain_fixtures import FakeClock, FakeSmsBackend
+from mempool_monitoring import MempoolTracker
+from watcher_state import WatcherStateStore
+
+
+# Returns unconfirmed transactions with the given hashes
+def create_transactions(tx_hashes):
+    return [{'hash': tx_hash, 'inputs': [], 'out': []} for tx_hash in tx_hashes]
+
+
+class TestWatcherStateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.temp_dir.name, 'watcher_state.sqlite')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_seen_transactions_survive_a_restart(self):
+        state_store = WatcherStateStore(self.state_path)
+        tracker = MempoolTracker(state_store=state_store)
+        self.assertEqual(len(tracker.get_new_transactions(create_transactions(['tx_1', 'tx_2']))), 2)
+        tracker.record_seen_transactions(['tx_1', 'tx_2'])
+        state_store.close()
+
+        # Assert that a restarted tracker only reports the transactions that appeared in the meantime
+        state_store = WatcherStateStore(self.state_path)
+        tracker = MempoolTracker(state_store=state_store)
+        new_transactions = tracker.get_new_transactions(create_transactions(['tx_1', 'tx_2', 'tx_3']))
+        self.assertEqual([transaction['hash'] for transaction in new_transactions], ['tx_3'])
+        self.assertTrue(tracker.is_known_transaction('tx_1'))
+        self.assertEqual(state_store.get_seen_transaction_count(), 2)
+        tracker.record_seen_transactions(transaction['hash'] for transaction in new_transactions)
+        self.assertEqual(state_store.get_seen_transaction_count(), 3)
+        state_store.close()
+
+    def test_undelivered_alerts_are_repeated_after_a_restart(self):
+        state_store = WatcherStateStore(self.state_path)
+        tracker = MempoolTracker(state_store=state_store)
+        dispatcher = AlertDispatcher('+100', backend=FakeSmsBackend(fail_recipients=['+200']), state_store=state_store)
+        tracker.get_new_transactions(create_transactions(['tx_1', 'tx_2']))
+        dispatcher.submit('+200', 'alert_1', tx_hash='tx_1')
+        dispatcher.submit('+300', 'alert_2', tx_hash='tx_2')
+        dispatcher.flush()
+        state_store.close()
+
+        # Assert that the transaction of the failed alert is reported again, the delivered one is not
+        state_store = WatcherStateStore(self.state_path)
+        tracker = MempoolTracker(state_store=state_store)
+        new_transactions = tracker.get_new_transactions(create_transactions(['tx_1', 'tx_2']))
+        self.assertEqual([transaction['hash'] for transaction in new_transactions], ['tx_1'])
+        state_store.close()
+
+    def test_address_checkpoint_survives_a_restart(self):
+        state_store = WatcherStateStore(self.state_path)
+        checkpoint = state_store.get_address_checkpoint()
+        checkpoint.add_synced_range('address_a', 0, 50)
+        checkpoint.add_synced_range('address_a', 50, 80)
+        checkpoint.save()
+        state_store.close()
+
+        state_store = WatcherStateStore(self.state_path)
+        checkpoint = state_store.get_address_checkpoint()
+        self.assertEqual(checkpoint.get_synced_ranges('address_a'), [(0, 80)])
+        self.assertEqual(checkpoint.get_synced_count('address_b'), 0)
+        state_store.close()
+
+    def test_sent_alerts_are_not_repeated_after_a_restart(self):
+        backend = FakeSmsBackend()
+        state_store = WatcherStateStore(self.state_path)
+        dispatcher = AlertDispatcher('+100', backend=backend, state_store=state_store)
+        dispatcher.submit('+200', 'alert', dedup_key=('tx_1', 'address_a', 'tx'))
+        self.assertEqual(dispatcher.flush(), 1)
+        state_store.close()
+
+        # Assert that the restarted dispatcher drops the alert but sends a new one
+        state_store = WatcherStateStore(self.state_path)
+        dispatcher = AlertDispatcher('+100', backend=backend, state_store=state_store)
+        self.assertFalse(dispatcher.submit('+200', 'alert', dedup_key=('tx_1', 'address_a', 'tx')))
+        self.assertTrue(dispatcher.submit('+200', 'alert', dedup_key=('tx_2', 'address_a', 'tx')))
+        self.assertEqual(dispatcher.flush(), 1)
+        self.assertEqual(len(backend.messages), 2)
+        state_store.close()
+
+    def test_failed_alerts_are_not_recorded(self):
+        state_store = WatcherStateStore()
+        dispatcher = AlertDispatcher('+100', backend=FakeSmsBackend(fail_recipients=['+200']),
+                                     state_store=state_store)
+        dispatcher.submit('+200', 'alert')
+        dispatcher.flush()
+
+        self.assertFalse(state_store.is_alert_sent(('+200', 'alert'), 3600))
+
+    def test_compaction_keeps_the_state_bounded(self):
+        clock = FakeClock()
+        state_store = WatcherStateStore(self.state_path, max_seen_transactions=100, seen_retention_seconds=1000,
+                                        compact_interval=float('inf'), clock=clock)
+        for poll in range(10):
+            clock.now = poll * 100.0
+            state_store.add_seen_transactions(f"tx_{poll}_{i}" for i in range(20))
+        self.assertEqual(state_store.get_seen_transaction_count(), 200)
+
+        # Assert that the oldest transactions beyond the maximum count are deleted
+        self.assertEqual(state_store.compact(), 100)
+        self.assertEqual(state_store.get_known_transactions(['tx_4_0', 'tx_5_0']), {'tx_5_0'})
+
+        # Assert that transactions older than the retention are deleted
+        clock.now = 1850.0
+        state_store.compact()
+        self.assertEqual(state_store.get_seen_transaction_count(), 20)
+        state_store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
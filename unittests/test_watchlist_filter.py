@@ -0,0 +1,130 @@
+#############################################################
+# @file     test_watchlist_filter.py
+# @author   criticalEntropy
+# @date     18.10.2026
+#############################################################
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from mempool_monitoring import BtcWatchlistMonitoring
+from watcher_service import WatcherService
+from watchlist_filter import BloomFilter, CompactWatchlist
+
+
+# Returns distinct addresses of different lengths
+def create_addresses(count, prefix='bc1q'):
+    return [f"{prefix}{index:0{index % 30 + 8}d}" for index in range(count)]
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_added_addresses_are_contained(self):
+        bloom_filter = BloomFilter.create(1000, 0.01)
+        addresses = create_addresses(1000)
+        for address in addresses:
+            bloom_filter.add(address)
+
+        self.assertTrue(all(address in bloom_filter for address in addresses))
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter.create(5000, 0.01)
+        for address in create_addresses(5000):
+            bloom_filter.add(address)
+
+        false_positives = sum(address in bloom_filter for address in create_addresses(20000, prefix='1A'))
+        self.assertLess(false_positives / 20000, 0.02)
+
+
+class TestCompactWatchlist(unittest.TestCase):
+
+    def setUp(self):
+        self.addresses = create_addresses(2000)
+
+    def test_lookups_are_exact(self):
+        watchlist = CompactWatchlist.from_addresses(self.addresses)
+
+        self.assertEqual(len(watchlist), 2000)
+        self.assertTrue(all(address in watchlist for address in self.addresses))
+
+        # Unwatched addresses never match, even if they pass the Bloom filter
+        unwatched_addresses = create_addresses(5000, prefix='1A') + ['bc1q', 'x' * 200, '']
+        self.assertFalse(any(address in watchlist for address in unwatched_addresses))
+        self.assertGreater(watchlist.filtered_lookups, 4800)
+        self.assertNotIn(None, watchlist)
+
+    def test_iteration_and_intersection(self):
+        watchlist = CompactWatchlist.from_addresses(self.addresses + self.addresses[:10])
+
+        self.assertEqual(sorted(watchlist), sorted(self.addresses))
+        self.assertEqual(watchlist.intersection(['1Aother', self.addresses[5]]), {self.addresses[5]})
+
+    def test_empty_watchlist(self):
+        watchlist = CompactWatchlist.from_addresses([])
+        self.assertEqual(len(watchlist), 0)
+        self.assertNotIn('bc1q', watchlist)
+
+    def test_file_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.bwl')
+            CompactWatchlist.build(self.addresses, watchlist_path).close()
+
+            self.assertTrue(CompactWatchlist.is_watchlist_file(watchlist_path))
+            with CompactWatchlist.open(watchlist_path) as watchlist:
+                self.assertIn(self.addresses[-1], watchlist)
+                self.assertNotIn('1Aother', watchlist)
+                self.assertEqual(watchlist.get_size(), os.path.getsize(watchlist_path))
+
+    def test_invalid_file_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CompactWatchlist(b'\x00' * 64)
+        with self.assertRaises(ValueError):
+            CompactWatchlist(b'BTCWL')
+
+
+class TestCompactWatchlistMonitoring(unittest.TestCase):
+
+    @patch('requests.Session.get')
+    def test_mempool_checks_use_compact_watchlist(self, mock_get):
+        mock_get.return_value.content = json.dumps({'txs': [{
+            'hash': 'tx_1',
+            'inputs': [{'prev_out': {'addr': 'sender', 'value': 1000}}],
+            'out': [{'addr': 'receiver', 'value': 900}, {'value': 0}]
+        }]}).encode()
+        watchlist = BtcWatchlistMonitoring(CompactWatchlist.from_addresses(['sender', 'receiver', 'other']))
+
+        self.assertTrue(watchlist.update_mempool_snapshot())
+        self.assertEqual(watchlist.get_tx_transaction_addresses(), {'sender'})
+        self.assertEqual(watchlist.get_rx_transaction_addresses(), {'receiver'})
+
+        self.assertEqual(sorted(watchlist.get_new_transaction_events()),
+                         [('tx_1', 'receiver', 'rx'), ('tx_1', 'sender', 'tx')])
+
+    def test_watcher_loads_compact_watchlist_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.bwl')
+            CompactWatchlist.build(['sender', 'receiver'], watchlist_path).close()
+
+            watcher = WatcherService(watchlist_path, report_interval=None)
+            watch_addresses = watcher.watchlist_monitor.watch_addresses
+            self.assertIsInstance(watch_addresses, CompactWatchlist)
+            self.assertIn('sender', watch_addresses)
+            watch_addresses.close()
+
+    def test_watcher_compacts_large_text_watchlist(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watchlist_path = os.path.join(temp_dir, 'watchlist.txt')
+            with open(watchlist_path, 'w') as watchlist_file:
+                watchlist_file.write('\n'.join(create_addresses(100)))
+
+            with patch('watcher_service.COMPACT_WATCHLIST_SIZE', 50):
+                watcher = WatcherService(watchlist_path, report_interval=None)
+            self.assertIsInstance(watcher.watchlist_monitor.watch_addresses, CompactWatchlist)
+            self.assertEqual(len(watcher.watchlist_monitor.watch_addresses), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()